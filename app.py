@@ -1,19 +1,41 @@
 import streamlit as st
-from groq import Groq
 import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from chanakya_wisdom import (
-    SYSTEM_PROMPT, BRIEF_SYSTEM_PROMPT, get_corpus_df, 
-    get_all_domains, MCDA_CRITERIA, calculate_policy_score
+from chanakya_wisdom import get_corpus, get_doctrine_page, get_all_domains, MCDA_CRITERIA
+from mcda import ARGUMENT_NAMES, MCDA_ENGINE, non_dominated_sort, weight_sensitivity
+from llm_cache import get_completion_cache, make_cache_key
+from llm_client import CircuitOpenError, get_llm_client, get_llm_stats
+from pipeline import PARAMETER_DEFAULTS, build_analysis_prompt, build_completion_params, format_full_report
+from response_parser import (
+    OptionScoreParser, options_from_records, options_to_records, parse_policy_options, rank_policy_options
 )
+from config import DOCTRINE_PAGE_SIZE, PROMPT_CONTEXT_CANDIDATES, RAG_ENGINE, STREAM_RESPONSES
+from charts import (
+    OPTION_COLUMNS, generate_heatmap, generate_mcda_breakdown, generate_pareto_chart, generate_radar_chart,
+    generate_reversal_heatmap, generate_saptanga_analysis, generate_trace_waterfall
+)
+from saptanga import saptanga_impact
+from tracing import Trace, get_trace_log, stage_percentiles
 import os
-from datetime import datetime
+import re
+import time
+from contextlib import nullcontext
 from datetime import datetime
 
+# --- RETRIEVAL ENGINE LABELS ---
+# Per rag_engine.ENGINES name: sidebar description, Tab 1 index step, and the
+# name of the score shown in Tab 1 and on the relevance heatmap
+RAG_ENGINE_LABELS = {
+    'tfidf': ("TF-IDF + Cosine Similarity", "Building TF-IDF vectors...", "TF-IDF Cosine Similarity"),
+    'inverted': ("TF-IDF Inverted Index + Cosine Similarity", "Building TF-IDF postings...",
+                 "TF-IDF Cosine Similarity"),
+    'hybrid': ("BM25 + TF-IDF, Reciprocal-Rank Fusion", "Building BM25 and TF-IDF indexes...",
+               "Reciprocal-Rank Fusion Score"),
+    'lsa': ("LSA Dense Embeddings + Cosine Similarity", "Loading LSA embeddings...", "LSA Cosine Similarity"),
+    'incremental': ("Incremental BM25 (LSM Segments)", "Updating the incremental BM25 index...", "BM25 Score"),
+}
+engine_description, engine_build_step, engine_score_name = RAG_ENGINE_LABELS.get(
+    RAG_ENGINE, (RAG_ENGINE, "Building the retrieval index...", "Relevance Score"))
+
 # --- API KEY LOADING FOR STREAMLIT CLOUD ---
 api_key = None
 try:
@@ -348,155 +370,183 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- HELPER FUNCTIONS (Core ML & RAG Implementation) ---
+# Chart builders live in charts.py
 
-def rag_retrieval(query, top_k=2):
+def render_streaming_markdown(chunks, container, refresh_interval=0.05):
     """
-    Implements TF-IDF Vectorization with Cosine Similarity for semantic retrieval.
-    
-    This is the core RAG (Retrieval-Augmented Generation) component.
-    Research Significance: Demonstrates hybrid neuro-symbolic architecture.
-    
+    Render a stream of markdown text as it arrives.
+
+    The text is split at '### ' headings; finished sections are written once
+    into their own placeholder and only the section still being generated is
+    re-rendered, at most once per refresh_interval seconds.
+
     Args:
-        query (str): User's governance problem statement
-        top_k (int): Number of top matches to return
-    
+        chunks (iterable): Text fragments in arrival order
+        container: Streamlit container to render into
+        refresh_interval (float): Minimum seconds between re-renders
+
     Returns:
-        tuple: (top_match_dataframe, confidence_score, all_scores)
+        str: The complete text
     """
-    df = get_corpus_df()
-    
-    # Create document corpus
-    documents = df['keywords'].tolist()
-    documents.append(query)
-    
-    # TF-IDF Vectorization
-    tfidf_vectorizer = TfidfVectorizer(
-        max_features=100,
-        stop_words='english',
-        ngram_range=(1, 2)
-    )
-    tfidf_matrix = tfidf_vectorizer.fit_transform(documents)
-    
-    # Cosine Similarity Calculation
-    cosine_sim = cosine_similarity(tfidf_matrix[-1], tfidf_matrix[:-1])
-    
-    # Get top matches
-    top_indices = np.argsort(cosine_sim[0])[-top_k:][::-1]
-    scores = cosine_sim[0][top_indices]
-    
-    return df.iloc[top_indices[0]], scores[0], cosine_sim[0]
+    parts = []
+    placeholders = []
+    last_render = 0.0
 
-def generate_radar_chart(welfare, economic, law_order, political, implementation):
-    """
-    Generates Multi-Criteria Decision Analysis (MCDA) Radar Chart.
-    
-    Research Context: Visualization of policy trade-offs across Chanakyan dimensions.
-    """
-    categories = [
-        'Welfare<br>(Prajasukhe)', 
-        'Economic<br>(Kosha)', 
-        'Law & Order<br>(Danda)', 
-        'Political<br>(Mitra)',
-        'Implementation<br>Feasibility'
-    ]
-    
-    values = [welfare, economic, law_order, political, implementation]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=values,
-        theta=categories,
-        fill='toself',
-        name='Policy Profile',
-        line_color='#667eea',
-        fillcolor='rgba(102, 126, 234, 0.3)'
-    ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 10],
-                tickfont=dict(size=10)
-            )
-        ),
-        showlegend=False,
-        title={
-            'text': "Multi-Criteria Policy Impact Matrix",
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 16, 'family': 'Merriweather'}
-        },
-        height=400
-    )
-    
-    return fig
-
-def generate_heatmap(df_corpus, similarity_scores):
+    def render(final=False):
+        sections = re.split(r'(?m)^(?=### )', "".join(parts))
+        while len(placeholders) < len(sections):
+            # A new section started: the previous one is complete
+            if placeholders:
+                placeholders[-1].markdown(sections[len(placeholders) - 1])
+            placeholders.append(container.empty())
+        placeholders[-1].markdown(sections[-1] if final else sections[-1] + " ▌")
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        parts.append(chunk)
+        now = time.perf_counter()
+        if now - last_render >= refresh_interval:
+            render()
+            last_render = now
+
+    render(final=True)
+    return "".join(parts)
+
+def stream_completion_text(stream):
+    """Yield the text deltas of a streamed chat completion."""
+    for chunk in stream:
+        if chunk.choices:
+            yield chunk.choices[0].delta.content
+
+def traced_figures():
+    """Time chart building on the first render of an analysis (no-op afterwards)."""
+    trace = st.session_state.get('trace')
+    if trace is None or trace.finished:
+        return nullcontext()
+    return trace.span("figure_generation")
+
+def calculate_governance_index(scores):
     """
-    Generate heatmap showing relevance scores across all doctrines.
+    Calculate composite Governance Effectiveness Index (GEI).
+    Research metric for quantitative evaluation.
     """
-    # Create dataframe with doctrine names and scores
-    doctrine_names = [doc.split('(')[0].strip()[:20] for doc in df_corpus['doctrine'].tolist()]
-    
-    fig = go.Figure(data=go.Heatmap(
-        z=[similarity_scores],
-        x=doctrine_names,
-        y=['Relevance'],
-        colorscale='YlOrRd',
-        text=[[f'{score:.3f}' for score in similarity_scores]],
-        texttemplate='%{text}',
-        textfont={"size": 10},
-        colorbar=dict(title="Similarity<br>Score")
-    ))
-    
-    fig.update_layout(
-        title="Doctrinal Relevance Heatmap (TF-IDF Cosine Similarity)",
-        xaxis_title="Arthashastra Doctrines",
-        height=250,
-        margin=dict(l=50, r=50, t=50, b=100)
-    )
-    
-    fig.update_xaxes(tickangle=-45)
-    
-    return fig
-
-def generate_saptanga_analysis(policy_scores):
+    return MCDA_ENGINE.score_one(scores)
+
+def policy_options_frame(scores, *catalogues):
+    """Table of policy options: the analysed parameter profile plus any catalogue rows."""
+    options = pd.DataFrame([["Analysed Policy", *scores]], columns=OPTION_COLUMNS)
+    extra = [catalogue[OPTION_COLUMNS] for catalogue in catalogues if catalogue is not None and len(catalogue)]
+    if extra:
+        options = pd.concat([options, *extra], ignore_index=True)
+    return options
+
+def read_option_catalogue(uploaded_file):
     """
-    Generate bar chart for Saptanga (Seven Limbs) impact analysis.
+    Load an uploaded CSV of policy options.
+    
+    Criterion columns may be named as in OPTION_COLUMNS, as the
+    calculate_policy_score arguments, or as the MCDA_CRITERIA keys.
+    An 'Option' column supplies names.
     """
-    limbs = ['Swami\n(Leadership)', 'Amatya\n(Ministers)', 'Janapada\n(Territory)', 
-             'Durga\n(Fortification)', 'Kosha\n(Treasury)', 'Danda\n(Force)', 'Mitra\n(Allies)']
+    df = pd.read_csv(uploaded_file)
+    for columns in (OPTION_COLUMNS[1:], list(ARGUMENT_NAMES), list(MCDA_CRITERIA)):
+        if all(c in df.columns for c in columns):
+            break
+    else:
+        raise ValueError("Catalogue needs the columns: " + ", ".join(OPTION_COLUMNS[1:]))
     
-    # Simulate impact scores based on policy parameters
-    scores = policy_scores + [np.random.uniform(5, 9) for _ in range(7 - len(policy_scores))]
-    scores = scores[:7]
+    names = df['Option'].astype(str) if 'Option' in df.columns else [f"Option {i + 1}" for i in range(len(df))]
+    catalogue = pd.DataFrame({"Option": names})
+    for target, source in zip(OPTION_COLUMNS[1:], columns):
+        catalogue[target] = pd.to_numeric(df[source], errors='coerce')
+    return catalogue.dropna().reset_index(drop=True)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def dominance_layers(options):
+    """
+    Dominance layers of an options frame (see mcda.non_dominated_sort).
     
-    colors = ['#667eea' if s >= 7 else '#ffc107' if s >= 5 else '#dc3545' for s in scores]
+    Cached on the frame contents, so a catalogue is sorted once and reruns
+    that leave the options unchanged reuse the layers.
+    """
+    return non_dominated_sort(options[OPTION_COLUMNS[1:]])
+
+def sensitivity_seed_options(catalogue, limit=15):
+    """Pareto-frontier catalogue options (at most `limit`) for the sensitivity table."""
+    if catalogue is None or not len(catalogue):
+        return None
+    frontier = catalogue[dominance_layers(catalogue) == 0]
+    return frontier.head(limit)
+
+# --- FRAGMENTS ---
+# Widgets inside an st.fragment rerun only that fragment. Values the rest of
+# the script needs are read back from st.session_state by widget key.
+
+# Slider widget key per MCDA parameter (calculate_policy_score order)
+PARAMETER_KEYS = {name: f"param_{name}" for name in PARAMETER_DEFAULTS}
+
+def parameter_scores():
+    """Current slider values in calculate_policy_score order."""
+    return [st.session_state.get(key, PARAMETER_DEFAULTS[name]) for name, key in PARAMETER_KEYS.items()]
+
+@st.fragment
+def policy_parameters_panel():
+    """
+    MCDA parameter sliders with a live GEI and parameter radar.
     
-    fig = go.Figure(data=[
-        go.Bar(x=limbs, y=scores, marker_color=colors, text=[f'{s:.1f}' for s in scores], textposition='auto')
-    ])
+    A slider move reruns only this panel: the GEI and the radar chart are
+    the only things recomputed.
+    """
+    col1, col2 = st.columns(2)
     
-    fig.update_layout(
-        title="Saptanga Impact Assessment (Seven Limbs of State)",
-        yaxis_title="Impact Score",
-        yaxis_range=[0, 10],
-        height=350,
-        showlegend=False
-    )
+    with col1:
+        st.slider("Welfare Impact Target", 1, 10, PARAMETER_DEFAULTS['welfare'], key=PARAMETER_KEYS['welfare'],
+                  help="How much should this policy benefit public welfare?")
+        st.slider("Economic Viability", 1, 10, PARAMETER_DEFAULTS['economic'], key=PARAMETER_KEYS['economic'],
+                  help="Budget constraints and ROI considerations")
+        st.slider("Implementation Speed", 1, 10, PARAMETER_DEFAULTS['implementation'],
+                  key=PARAMETER_KEYS['implementation'], help="How quickly can this be executed?")
     
-    return fig
+    with col2:
+        st.slider("Enforcement Capability", 1, 10, PARAMETER_DEFAULTS['law_order'], key=PARAMETER_KEYS['law_order'],
+                  help="Strength needed to implement and enforce")
+        st.slider("Political Stability", 1, 10, PARAMETER_DEFAULTS['political'], key=PARAMETER_KEYS['political'],
+                  help="Stakeholder support and diplomatic factors")
+    
+    scores = parameter_scores()
+    st.metric("Governance Effectiveness Index (GEI)", f"{calculate_governance_index(scores)}/10")
+    st.plotly_chart(generate_radar_chart(*scores), use_container_width=True, key="parameter_radar")
 
-def calculate_governance_index(scores):
-    """
-    Calculate composite Governance Effectiveness Index (GEI).
-    Research metric for quantitative evaluation.
-    """
-    weights = [w['weight'] for w in MCDA_CRITERIA.values()]
-    gei = sum([s * w for s, w in zip(scores, weights)])
-    return round(gei, 2)
+@st.fragment
+def doctrine_browser():
+    """Knowledge Base domain filter and doctrine list; a filter or page change reruns only this list."""
+    domains = ["All Domains"] + get_all_domains()
+    selected_domain = st.selectbox("Filter by Domain", domains)
+    domain = None if selected_domain == "All Domains" else selected_domain
+    
+    # One page at a time, so only the listed doctrines are loaded
+    n_doctrines = len(get_corpus().domain_positions(domain))
+    n_pages = max(1, -(-n_doctrines // DOCTRINE_PAGE_SIZE))
+    page = 1
+    if n_pages > 1:
+        page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, key=f"doctrine_page_{selected_domain}")
+    df_corpus = get_doctrine_page(domain, page - 1)
+    if n_pages > 1:
+        first = (page - 1) * DOCTRINE_PAGE_SIZE
+        st.caption(f"Doctrines {first + 1}–{first + len(df_corpus)} of {n_doctrines}")
+    
+    # Display doctrines
+    for idx, row in df_corpus.iterrows():
+        with st.expander(f"📜 {row['doctrine']} | Domain: {row['domain']}"):
+            st.markdown(f"**Doctrine Text:**")
+            st.info(row['text'])
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(f"**Keywords:** {row['keywords']}")
+            with col2:
+                st.metric("Policy Weight", f"{row['policy_weight']:.2f}")
 
 # --- SIDEBAR: RESEARCH METADATA & CONTROLS ---
 with st.sidebar:
@@ -522,11 +572,29 @@ with st.sidebar:
     st.markdown("### System Status")
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Corpus Size", f"{len(get_corpus_df())} doctrines")
+        st.metric("Corpus Size", f"{len(get_corpus())} doctrines")
     with col2:
-        st.metric("Domains", len(get_all_domains()))
+        st.metric("Domains", len(get_corpus().domains))
     
-    st.info("**Architecture:** Neuro-Symbolic AI\n\n**Kernel:** Python 3.9+\n\n**RAG Engine:** TF-IDF + Cosine Similarity")
+    completion_cache = get_completion_cache()
+    if completion_cache is not None:
+        cache_stats = completion_cache.stats()
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Cache Hits", cache_stats['hits'])
+        with col2:
+            st.metric("Cache Misses", cache_stats['misses'])
+        st.caption(f"LLM cache: {cache_stats['entries']} responses, {cache_stats['bytes'] / 1024:.0f} KB")
+    
+    llm_stats = get_llm_stats()
+    if llm_stats['requests']:
+        st.caption(
+            f"LLM: {llm_stats['requests']} requests, {llm_stats['retries']} retries "
+            f"({llm_stats['retry_seconds']:.1f}s backoff) | Circuit {llm_stats['breaker_state']} "
+            f"({llm_stats['open_seconds']:.0f}s open, {llm_stats['rejected']} fast-failed)"
+        )
+    
+    st.info("**Architecture:** Neuro-Symbolic AI\n\n**Kernel:** Python 3.9+\n\n**RAG Engine:** " + engine_description)
     
     st.markdown("---")
     st.caption(f"Session: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
@@ -571,24 +639,25 @@ with tab1:
         
         st.caption("Adjust these sliders to set policy priorities and constraints:")
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            welfare = st.slider("Welfare Impact Target", 1, 10, 7, 
-                               help="How much should this policy benefit public welfare?")
-            economic = st.slider("Economic Viability", 1, 10, 6,
-                               help="Budget constraints and ROI considerations")
-            implementation = st.slider("Implementation Speed", 1, 10, 7,
-                                      help="How quickly can this be executed?")
+        policy_parameters_panel()
         
-        with col2:
-            law_order = st.slider("Enforcement Capability", 1, 10, 6,
-                                 help="Strength needed to implement and enforce")
-            political = st.slider("Political Stability", 1, 10, 5,
-                                help="Stakeholder support and diplomatic factors")
+        # Parameter values are read by widget key: the panel reruns on its own
+        scores = parameter_scores()
+        welfare, economic, law_order, political, implementation = scores
+        gei = calculate_governance_index(scores)
         
-        # Calculate composite score
-        gei = calculate_governance_index([welfare, economic, law_order, political, implementation])
+        uploaded_catalogue = st.file_uploader(
+            "Policy Option Catalogue (optional CSV)",
+            type=["csv"],
+            help="One row per candidate policy: Option, Welfare, Economic, Law & Order, Political, Implementation"
+        )
+        option_catalogue = None
+        if uploaded_catalogue is not None:
+            try:
+                option_catalogue = read_option_catalogue(uploaded_catalogue)
+                st.caption(f"Loaded {len(option_catalogue)} catalogue options")
+            except ValueError as e:
+                st.error(f"Catalogue Error: {str(e)}")
         
         st.markdown("---")
         
@@ -603,14 +672,28 @@ with tab1:
             if not problem.strip():
                 st.error("Error: Problem statement cannot be empty.")
             else:
+                # Stage timings of this analysis (shown in the Analytics Dashboard)
+                trace = Trace(cached=False)
+                
                 # --- STEP 1: RAG PIPELINE ---
                 with st.status("Initializing RAG Pipeline...", expanded=True) as status:
-                    st.write("Tokenizing input text...")
-                    st.write("Building TF-IDF vectors...")
-                    st.write("Calculating Cosine Similarity with Arthashastra Corpus...")
+                    st.write("Loading Arthashastra Corpus...")
+                    with trace.span("corpus_load"):
+                        get_corpus()
                     
-                    # Execute RAG
-                    retrieved_doc, conf_score, all_scores = rag_retrieval(problem)
+                    st.write(engine_build_step)
+                    # Imported here: scikit-learn is the slowest import of the app and is
+                    # only needed once an analysis runs, not for the first page render
+                    with trace.span("vectorization"):
+                        from rag_engine import get_retrieval_engine
+                        rag_index = get_retrieval_engine()
+                    
+                    # Execute RAG (candidates for the prompt context; top 5 kept for the Analytics Dashboard)
+                    st.write(f"Calculating {engine_score_name} with Arthashastra Corpus...")
+                    with trace.span("similarity"):
+                        all_scores = rag_index.similarity(problem)
+                        top_matches = rag_index.rank(all_scores, top_k=PROMPT_CONTEXT_CANDIDATES)
+                    retrieved_doc, conf_score = top_matches[0]
                     
                     st.write(f"**Retrieval Complete**")
                     st.write(f"**Confidence Score:** {conf_score:.4f}")
@@ -618,59 +701,88 @@ with tab1:
                     
                     status.update(label="RAG Preprocessing Complete", state="complete", expanded=False)
                 
-                # Display retrieved context
-                st.markdown('<div class="doctrine-box">', unsafe_allow_html=True)
-                st.markdown(f"**Retrieved Arthashastra Context:**")
-                st.markdown(f"*{retrieved_doc['text']}*")
-                st.markdown(f"**Domain:** {retrieved_doc['domain']} | **Policy Weight:** {retrieved_doc['policy_weight']}")
-                st.markdown('</div>', unsafe_allow_html=True)
-                
                 # --- STEP 2: LLM INFERENCE ---
                 try:
-                    client = Groq(api_key=api_key)
+                    # Construct prompt (packs the top candidates into the context budget)
+                    with trace.span("prompt"):
+                        final_prompt = build_analysis_prompt(problem, top_matches, scores, gei)
+                        completion_params = build_completion_params(final_prompt)
+                        
+                        completion_cache = get_completion_cache()
+                        cache_key = make_cache_key(**completion_params)
+                        cached = completion_cache.get_with_records(cache_key) if completion_cache is not None else None
+                    trace.attributes['input_tokens'] = final_prompt.input_tokens
+                    citations = [(entry.citation, entry.doctrine.to_dict()) for entry in final_prompt.context.entries]
                     
-                    # Construct prompt
-                    final_prompt = SYSTEM_PROMPT.format(
-                        retrieved_context=retrieved_doc['text'],
-                        domain=retrieved_doc['domain'],
-                        weight=retrieved_doc['policy_weight']
-                    )
+                    # Display retrieved context
+                    st.markdown('<div class="doctrine-box">', unsafe_allow_html=True)
+                    st.markdown(f"**Retrieved Arthashastra Context:**")
+                    for citation, doctrine in citations:
+                        st.markdown(f"**[{citation}] {doctrine['doctrine']}**: *{doctrine['text']}*")
+                        st.caption(f"Domain: {doctrine['domain']} | Policy Weight: {doctrine['policy_weight']}")
+                    st.markdown('</div>', unsafe_allow_html=True)
+                    st.caption(f"Prompt: ~{final_prompt.input_tokens:,} input tokens "
+                               f"({final_prompt.context.tokens:,} of context)")
+                    if final_prompt.truncated:
+                        st.warning(f"Shortened to fit the prompt token budget: {', '.join(final_prompt.truncated)}")
                     
-                    final_prompt += f"\n\n**USER PROBLEM:**\n{problem}\n\n"
-                    final_prompt += f"**POLICY PARAMETERS:**\n"
-                    final_prompt += f"- Welfare Priority: {welfare}/10\n"
-                    final_prompt += f"- Economic Constraint: {economic}/10\n"
-                    final_prompt += f"- Enforcement Capability: {law_order}/10\n"
-                    final_prompt += f"- Political Stability: {political}/10\n"
-                    final_prompt += f"- Implementation Speed: {implementation}/10\n"
-                    final_prompt += f"- Governance Effectiveness Index (GEI): {gei}/10\n"
+                    if cached is None:
+                        client = get_llm_client(api_key)
+                        option_parser = OptionScoreParser()
+                        if STREAM_RESPONSES:
+                            # Render sections as tokens arrive instead of blocking on the full response
+                            st.markdown("#### Generated Policy Analysis")
+                            request_started = time.perf_counter()
+                            stream = client.create(stream=True, **completion_params)
+                            chunks = option_parser.tap(trace.stream(stream_completion_text(stream), request_started))
+                            result_text = render_streaming_markdown(chunks, st.container())
+                        else:
+                            with st.spinner("Neural Inference in Progress... (may take 10-20 seconds)"):
+                                with trace.span("llm_total"):
+                                    chat_completion = client.create(**completion_params)
+                                result_text = chat_completion.choices[0].message.content
+                                option_parser.feed(result_text)
+                        with trace.span("response_parsing"):
+                            llm_options = option_parser.options()
+                        if completion_cache is not None:
+                            completion_cache.put(cache_key, result_text, completion_params['model'],
+                                                 records=options_to_records(llm_options))
+                    else:
+                        trace.attributes['cached'] = True
+                        result_text, records = cached
+                        with trace.span("response_parsing"):
+                            if records is None:
+                                # Entry cached before option parsing existed: parse once and store
+                                llm_options = parse_policy_options(result_text)
+                                completion_cache.put(cache_key, result_text, completion_params['model'],
+                                                     records=options_to_records(llm_options))
+                            else:
+                                llm_options = options_from_records(records)
+                    with trace.span("response_parsing"):
+                        ranked_options = rank_policy_options(llm_options, law_order, political)
                     
-                    with st.spinner("Neural Inference in Progress... (may take 10-20 seconds)"):
-                        chat_completion = client.chat.completions.create(
-                            messages=[
-                                {
-                                    "role": "user",
-                                    "content": final_prompt,
-                                }
-                            ],
-                            model="llama-3.3-70b-versatile",
-                            temperature=0.4,
-                            max_tokens=2048,
-                            top_p=0.8,
-                        )
-                        
-                        # Store in session state
-                        st.session_state['result'] = chat_completion.choices[0].message.content
-                        st.session_state['rag_doc'] = retrieved_doc.to_dict()
-                        st.session_state['scores'] = [welfare, economic, law_order, political, implementation]
-                        st.session_state['problem'] = problem
-                        st.session_state['gei'] = gei
-                        st.session_state['all_similarity_scores'] = all_scores
-                        st.session_state['timestamp'] = datetime.now()
+                    # Store in session state
+                    st.session_state['result'] = result_text
+                    st.session_state['rag_doc'] = retrieved_doc.to_dict()
+                    st.session_state['scores'] = scores
+                    st.session_state['problem'] = problem
+                    st.session_state['gei'] = gei
+                    st.session_state['all_similarity_scores'] = all_scores
+                    # Corpus snapshot the scores belong to (doctrines may be added meanwhile)
+                    st.session_state['corpus'] = rag_index.corpus
+                    st.session_state['top_matches'] = top_matches[:5]
+                    st.session_state['citations'] = citations
+                    st.session_state['llm_options'] = ranked_options
+                    st.session_state['timestamp'] = datetime.now()
+                    # Finished after the figures of the next rerun are built
+                    st.session_state['trace'] = trace
                     
                     st.success("Analysis Complete")
                     st.rerun()
                 
+                except CircuitOpenError as e:
+                    st.error(f"Runtime Error: {str(e)}")
+                    st.info("Tip: The LLM service failed repeatedly; requests are paused to fail fast.")
                 except Exception as e:
                     st.error(f"Runtime Error: {str(e)}")
                     st.info("Tip: Check your API key and internet connection.")
@@ -690,13 +802,37 @@ with tab1:
             
             st.markdown("#### Visualizations")
             
-            # Radar Chart
+            # Radar Chart, with the Pareto frontier alongside when there are options to compare
             scores = st.session_state['scores']
-            fig_radar = generate_radar_chart(scores[0], scores[1], scores[2], scores[3], scores[4])
-            st.plotly_chart(fig_radar, use_container_width=True)
+            llm_options = st.session_state.get('llm_options')
+            options_df = policy_options_frame(scores, llm_options, option_catalogue)
+            layers = dominance_layers(options_df) if len(options_df) > 1 else None
+            limb_scores = saptanga_impact(scores, st.session_state['all_similarity_scores'])
+            with traced_figures():
+                fig_radar = generate_radar_chart(scores[0], scores[1], scores[2], scores[3], scores[4])
+                fig_pareto = generate_pareto_chart(options_df, layers) if layers is not None else None
+                fig_saptanga = generate_saptanga_analysis(limb_scores)
+            if fig_pareto is not None:
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.plotly_chart(fig_radar, use_container_width=True)
+                with col2:
+                    st.plotly_chart(fig_pareto, use_container_width=True)
+                st.caption(f"{int((layers == 0).sum())} of {len(options_df)} options are non-dominated "
+                           f"({int(layers.max()) + 1} dominance layers)")
+                with st.expander("Pareto Frontier Options"):
+                    st.dataframe(options_df[layers == 0], hide_index=True, use_container_width=True)
+            else:
+                st.plotly_chart(fig_radar, use_container_width=True)
+            
+            # Options proposed by the LLM, ranked by GEI
+            if llm_options is not None and len(llm_options):
+                st.markdown("#### Evaluated Options")
+                st.caption("Welfare, economic and feasibility scores as assigned in the analysis; "
+                           "law & order and political stability from the policy parameters.")
+                st.dataframe(llm_options, hide_index=True, use_container_width=True)
             
             # Saptanga Analysis
-            fig_saptanga = generate_saptanga_analysis(scores)
             st.plotly_chart(fig_saptanga, use_container_width=True)
             
             st.markdown("---")
@@ -720,36 +856,16 @@ with tab1:
             
             with col2:
                 # Create comprehensive report
-                full_report = f"""# Chanakyan Policy Analysis Report
-                
-**Generated:** {st.session_state['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}
-
-## Problem Statement
-{st.session_state['problem']}
-
-## Retrieved Doctrine
-**{st.session_state['rag_doc']['doctrine']}**
-
-{st.session_state['rag_doc']['text']}
-
-**Domain:** {st.session_state['rag_doc']['domain']}
-
-## Policy Parameters
-- Welfare Impact: {scores[0]}/10
-- Economic Viability: {scores[1]}/10
-- Law & Order: {scores[2]}/10
-- Political Stability: {scores[3]}/10
-- Implementation Feasibility: {scores[4]}/10
-
-**Governance Effectiveness Index:** {st.session_state['gei']}/10
-
-## Analysis
-
-{st.session_state['result']}
-
----
-*Generated by Chanakya DSS | RV College of Engineering*
-"""
+                full_report = format_full_report(
+                    st.session_state['problem'],
+                    st.session_state['rag_doc'],
+                    scores,
+                    st.session_state['gei'],
+                    st.session_state['result'],
+                    st.session_state['timestamp'],
+                    limb_scores,
+                    st.session_state.get('citations')
+                )
                 st.download_button(
                     label="📥 Download Full Report",
                     data=full_report,
@@ -767,38 +883,21 @@ with tab2:
     st.markdown("## Arthashastra Knowledge Corpus")
     st.caption("Explore the 15 core doctrines used in the RAG system")
     
-    df_corpus = get_corpus_df()
-    
-    # Domain filter
-    domains = ["All Domains"] + get_all_domains()
-    selected_domain = st.selectbox("Filter by Domain", domains)
+    corpus = get_corpus()
     
-    if selected_domain != "All Domains":
-        df_corpus = df_corpus[df_corpus['domain'] == selected_domain]
-    
-    # Display doctrines
-    for idx, row in df_corpus.iterrows():
-        with st.expander(f"📜 {row['doctrine']} | Domain: {row['domain']}"):
-            st.markdown(f"**Doctrine Text:**")
-            st.info(row['text'])
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown(f"**Keywords:** {row['keywords']}")
-            with col2:
-                st.metric("Policy Weight", f"{row['policy_weight']:.2f}")
+    # Domain filter and doctrine list (reruns on its own when the filter changes)
+    doctrine_browser()
     
     st.markdown("---")
     st.markdown("### Corpus Statistics")
     
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total Doctrines", len(get_corpus_df()))
+        st.metric("Total Doctrines", len(corpus))
     with col2:
-        st.metric("Governance Domains", len(get_all_domains()))
+        st.metric("Governance Domains", len(corpus.domains))
     with col3:
-        avg_weight = get_corpus_df()['policy_weight'].mean()
-        st.metric("Avg Policy Weight", f"{avg_weight:.2f}")
+        st.metric("Avg Policy Weight", f"{corpus.avg_policy_weight:.2f}")
 
 # ============================================================================
 # TAB 3: ANALYTICS DASHBOARD
@@ -810,18 +909,15 @@ with tab3:
         st.markdown("### RAG Retrieval Analysis")
         
         # Heatmap
-        fig_heatmap = generate_heatmap(get_corpus_df(), st.session_state['all_similarity_scores'])
+        with traced_figures():
+            df_scored = st.session_state['corpus'].df
+            fig_heatmap = generate_heatmap(df_scored, st.session_state['all_similarity_scores'][df_scored.index],
+                                          engine_score_name)
         st.plotly_chart(fig_heatmap, use_container_width=True)
         
         st.markdown("### Top 5 Relevant Doctrines")
         
-        df_corpus = get_corpus_df()
-        top_5_indices = np.argsort(st.session_state['all_similarity_scores'])[-5:][::-1]
-        
-        for idx in top_5_indices:
-            score = st.session_state['all_similarity_scores'][idx]
-            doc = df_corpus.iloc[idx]
-            
+        for doc, score in st.session_state['top_matches']:
             col1, col2 = st.columns([3, 1])
             with col1:
                 st.markdown(f"**{doc['doctrine']}**")
@@ -834,24 +930,70 @@ with tab3:
         # MCDA Breakdown
         st.markdown("### MCDA Criteria Breakdown")
         
-        criteria_names = [v['name'] for v in MCDA_CRITERIA.values()]
-        criteria_weights = [v['weight'] for v in MCDA_CRITERIA.values()]
-        scores = st.session_state['scores']
-        weighted_scores = [s * w for s, w in zip(scores, criteria_weights)]
+        with traced_figures():
+            fig_mcda = generate_mcda_breakdown(st.session_state['scores'])
+        st.plotly_chart(fig_mcda, use_container_width=True)
+        
+        st.markdown("---")
         
-        fig_mcda = go.Figure(data=[
-            go.Bar(name='Raw Score', x=criteria_names, y=scores, marker_color='lightblue'),
-            go.Bar(name='Weighted Score', x=criteria_names, y=weighted_scores, marker_color='darkblue')
-        ])
+        # Weight Sensitivity (Monte Carlo)
+        st.markdown("### Weight Sensitivity Analysis (Monte Carlo)")
+        st.caption("Weight vectors are sampled from a Dirichlet distribution centred on the configured MCDA weights, "
+                   "and every option is re-scored under every sample. Options from the analysis and Pareto-frontier "
+                   "catalogue options are included; add rows to compare alternative policies.")
         
-        fig_mcda.update_layout(
-            title="Multi-Criteria Decision Analysis (MCDA) Breakdown",
-            yaxis_title="Score",
-            barmode='group',
-            height=400
-        )
+        options_df = st.data_editor(
+            policy_options_frame(st.session_state['scores'], st.session_state.get('llm_options'),
+                                 sensitivity_seed_options(option_catalogue)),
+            num_rows="dynamic",
+            key="policy_options",
+            use_container_width=True
+        ).dropna()
         
-        st.plotly_chart(fig_mcda, use_container_width=True)
+        col1, col2 = st.columns(2)
+        with col1:
+            n_samples = st.select_slider("Weight Samples", options=[10_000, 50_000, 100_000, 200_000, 500_000], value=200_000)
+        with col2:
+            concentration = st.slider("Dirichlet Concentration", 10, 500, 100,
+                                      help="Higher values keep sampled weights closer to the configured weights")
+        
+        if len(options_df):
+            sensitivity = weight_sensitivity(options_df[OPTION_COLUMNS[1:]], n_samples=n_samples, concentration=concentration)
+            option_names = options_df['Option'].astype(str).tolist()
+            
+            st.dataframe(pd.DataFrame({
+                "Option": option_names,
+                "GEI": sensitivity.base_scores,
+                "Mean GEI": sensitivity.mean_scores.round(2),
+                "95% CI Low": sensitivity.ci_low.round(2),
+                "95% CI High": sensitivity.ci_high.round(2),
+                "P(Rank 1)": sensitivity.rank_probabilities[:, 0].round(3),
+            }), hide_index=True, use_container_width=True)
+            
+            if len(options_df) > 1:
+                st.metric("Probability the Ranking Changes", f"{sensitivity.ranking_change_probability:.1%}")
+                st.plotly_chart(generate_reversal_heatmap(option_names, sensitivity.reversal_probabilities),
+                                use_container_width=True)
+            
+            st.caption(f"{sensitivity.n_samples:,} weight samples scored in {sensitivity.elapsed_ms:.0f} ms")
+        
+        # Stage timings of the latest analysis, and percentiles across the trace log
+        if 'trace' in st.session_state:
+            st.markdown("---")
+            st.markdown("### Pipeline Timing")
+            
+            trace = st.session_state['trace']
+            trace_log = get_trace_log()
+            # All figures of the analysis have been built by now: log it once
+            trace.finish(trace_log)
+            st.plotly_chart(generate_trace_waterfall(trace.spans), use_container_width=True)
+            
+            if trace_log is not None:
+                percentiles = stage_percentiles(trace_log.records())
+                if len(percentiles):
+                    st.caption(f"Stage latency across the last {int(percentiles['Traces'].max()):,} logged analyses "
+                               f"(`{trace_log.path.name}`)")
+                    st.dataframe(percentiles, hide_index=True, use_container_width=True)
         
     else:
         st.info("Run a policy analysis first to see analytics data here.")
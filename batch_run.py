@@ -0,0 +1,68 @@
+"""
+Headless Batch Analysis for Chanakya DSS
+========================================
+
+Runs the Policy Analysis pipeline over a file of problem statements without
+the Streamlit UI, writing one "Full Report" markdown file per case.
+
+Input: CSV or JSONL with a 'problem' column and optional 'id', 'welfare',
+'economic', 'law_order', 'political' and 'implementation' columns.
+
+Usage:
+    python batch_run.py cases.csv --output reports/ --concurrency 16
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from llm_client import get_llm_client
+from pipeline import read_cases, run_batch
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run Chanakya policy analyses in batch.")
+    parser.add_argument("input", help="CSV or JSONL file of problem statements")
+    parser.add_argument("--output", default="reports", help="Directory for reports (default: reports)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum simultaneous LLM requests (default: 8)")
+    parser.add_argument("--api-key", default=os.environ.get("GROQ_API_KEY"), help="Groq API key (default: $GROQ_API_KEY)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main execution flow."""
+    args = parse_args(argv)
+    if not args.api_key:
+        print("❌ Error: Groq API key required (--api-key or GROQ_API_KEY)")
+        return 1
+
+    cases = read_cases(args.input)
+    print(f"📋 Loaded {len(cases)} cases from {args.input}")
+
+    client = get_llm_client(args.api_key)
+
+    done = 0
+    started = time.perf_counter()
+
+    def progress(summary):
+        nonlocal done
+        done += 1
+        marker = "✅" if summary["status"] == "ok" else "❌"
+        detail = summary.get("report") or summary.get("error")
+        print(f"{marker} [{done}/{len(cases)}] {summary['id']}: {detail}")
+
+    totals = asyncio.run(run_batch(cases, args.output, client, concurrency=args.concurrency, progress=progress))
+    elapsed = time.perf_counter() - started
+    print("=" * 60)
+    stats = client.stats()
+    print(f"Completed: {totals['completed']} ({totals['cached']} from cache) | "
+          f"Failed: {totals['failed']} | {elapsed:.1f}s")
+    print(f"Retries: {stats['retries']} ({stats['retry_seconds']:.1f}s backoff) | "
+          f"Circuit open: {stats['open_seconds']:.1f}s, {stats['rejected']} calls fast-failed")
+    return 0 if totals["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""
+Chanakya DSS Benchmarks
+=======================
+Timing suites for the hot paths of the app, written as JSON so runs can be
+compared across commits.
+
+Suites:
+- retrieval: rag_retrieval and every retrieval engine over synthetic
+  corpora from 15 to 100k doctrines
+- scoring: calculate_policy_score, calculate_governance_index and the
+  vectorized MCDA engine at batch sizes up to 1e6
+- figures: every chart builder, cold (uncached) and through the figure cache
+- end_to_end: the Tab 1 Policy Analysis pipeline against a local stub LLM
+
+Checks (parity, exit status 1 on any mismatch):
+- InvertedIndexEngine top-k results and scores against the TF-IDF reference
+- MCDAEngine scores against calculate_policy_score, bit for bit
+- non_dominated_sort layers against naive layer peeling
+- IncrementalIndex BM25 scores against BM25Index after appends, updates,
+  deletes and segment merges
+
+Usage:
+    python -m benchmarks                          # all suites
+    python -m benchmarks --suite retrieval --quick
+    python -m benchmarks --compare benchmarks/results/<old>.json [<new>.json]
+    python -m benchmarks.parity [--quick]
+"""
+
+SUITES = ("retrieval", "scoring", "figures", "end_to_end")
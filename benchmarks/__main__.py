@@ -0,0 +1,56 @@
+"""
+Command-line entry point: python -m benchmarks --help
+"""
+
+import argparse
+import importlib
+import sys
+from pathlib import Path
+
+# Benchmarks import the app modules from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks import SUITES  # noqa: E402
+from benchmarks.harness import compare, latest_result, write_results  # noqa: E402
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run Chanakya DSS benchmarks.")
+    parser.add_argument("--suite", action="append", choices=SUITES,
+                        help="Suite to run (repeatable; default: all)")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes for a fast smoke run")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0,
+                        help="Stub LLM time to first token for the end_to_end suite (default: 0)")
+    parser.add_argument("--compare", nargs="+", metavar="RESULT",
+                        help="Compare BASELINE [CURRENT] result files instead of running "
+                             "(CURRENT defaults to the newest result)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main execution flow."""
+    args = parse_args(argv)
+    if args.compare:
+        baseline = args.compare[0]
+        current = args.compare[1] if len(args.compare) > 1 else latest_result(exclude=baseline)
+        if current is None:
+            print("❌ No result file to compare against the baseline")
+            return 1
+        return 1 if compare(baseline, current) else 0
+
+    results = []
+    for suite in args.suite or SUITES:
+        print(f"\n▶ {suite}")
+        module = importlib.import_module(f"benchmarks.bench_{suite}")
+        if suite == "end_to_end":
+            results.extend(module.run(quick=args.quick, llm_latency_ms=args.llm_latency_ms))
+        else:
+            results.extend(module.run(quick=args.quick))
+    path = write_results(results, args.output)
+    print(f"\n✅ {len(results)} results written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+End-to-end benchmark of the Tab 1 Policy Analysis pipeline against a local
+stub LLM: retrieval, GEI, prompt construction, streamed completion through
+the shared client manager, option parsing and ranking, Saptanga scores,
+figure building and serialization, and the full report.
+
+The stub streams a canned response shaped like SYSTEM_PROMPT's output
+structure; LLM latency is zero unless --llm-latency-ms is given, so the
+numbers measure the app's own CPU time.
+"""
+
+import time
+import types
+from datetime import datetime
+
+import plotly.io as pio
+
+from benchmarks.harness import measure
+from benchmarks.synthetic import SAMPLE_QUERIES
+from charts import (
+    OPTION_COLUMNS, generate_heatmap, generate_mcda_breakdown, generate_pareto_chart, generate_radar_chart,
+    generate_saptanga_analysis
+)
+from chanakya_wisdom import get_corpus_df
+from config import PROMPT_CONTEXT_CANDIDATES
+from figure_cache import get_figure_cache
+from llm_client import LLMClientManager
+from mcda import MCDA_ENGINE, non_dominated_sort
+from pipeline import build_analysis_prompt, build_completion_params, format_full_report
+from rag_engine import get_retrieval_engine
+from response_parser import OptionScoreParser, rank_policy_options
+from saptanga import saptanga_impact
+
+STUB_RESPONSE = """### 1. Strategic Diagnosis (समस्या निदान)
+- **Root Cause (Anvikshiki):** Revenue leakage and weak enforcement erode the treasury (Kosha).
+- **Affected Saptanga Elements:** Kosha, Janapada, Danda
+- **Classification:** Strategic
+
+### 2. Doctrinal Framework Application
+- **Primary doctrine:** Kosha Mula Danda - the treasury is the root of power.
+- **Secondary principles:** Prajasukhe Sukham Rajnah; Matsyanyaya.
+
+### 3. Multi-Criteria Policy Evaluation
+
+**Option A: Smart Metering & Loss Reduction**
+- Welfare Impact (Prajasukhe): 7
+- Economic Viability (Kosha): 8
+- Implementation Feasibility: 6
+- Risk Level: Medium
+- Rationale: Metering closes leakage at the source while protecting honest consumers.
+
+**Option B: Targeted Amnesty with Subsidy Reform**
+- Welfare Impact (Prajasukhe): 8
+- Economic Viability (Kosha): 6
+- Implementation Feasibility: 8
+- Risk Level: Low
+- Rationale: Sama and Dana before Danda: settle arrears and retarget subsidies.
+
+**Option C: Enforcement Drive**
+- Welfare Impact (Prajasukhe): 4
+- Economic Viability (Kosha): 7
+- Implementation Feasibility: 5
+- Risk Level: High
+- Rationale: Danda restores order quickly but risks political backlash.
+
+### 4. Recommended Strategy (अनुशंसित नीति)
+- **Primary Action:** Combine metering with a time-bound amnesty.
+- **Timeline:** Medium-term (6-18 months)
+- **Resource Allocation:** Capital budget for meters; field staff for collection.
+- **Success Metrics:** AT&C losses, collection efficiency, hours of supply.
+
+### 5. Risk Mitigation (Vyasana Nivaran)
+- **Sama (Conciliation):** Village-level consultations.
+- **Dana (Incentives):** Rebates for prompt payment.
+- **Bheda (Strategic division):** Separate habitual defaulters from distressed consumers.
+- **Danda (Enforcement):** Penalties for organised theft only.
+
+### 6. Ethical & Long-term Considerations
+- Dharma-Artha balance: protect lifeline consumption while restoring solvency.
+- Sustainability (Yogakshema): reinvest recovered revenue in the grid.
+"""
+
+
+class StubCompletions:
+    """chat.completions stand-in that streams STUB_RESPONSE in ~4-character tokens."""
+
+    def __init__(self, latency_s=0.0, token_chars=4):
+        self.latency_s = latency_s
+        self.token_chars = token_chars
+
+    def create(self, stream=False, **params):
+        if not stream:
+            time.sleep(self.latency_s)
+            message = types.SimpleNamespace(content=STUB_RESPONSE)
+            return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+        return self._stream()
+
+    def _stream(self):
+        time.sleep(self.latency_s)
+        for start in range(0, len(STUB_RESPONSE), self.token_chars):
+            delta = types.SimpleNamespace(content=STUB_RESPONSE[start:start + self.token_chars])
+            yield types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta)])
+
+
+def stub_llm_client(latency_s=0.0):
+    """LLMClientManager wired to the stub instead of the Groq SDK."""
+    stub = types.SimpleNamespace(chat=types.SimpleNamespace(completions=StubCompletions(latency_s)))
+    return LLMClientManager("stub", client=stub)
+
+
+def analyze(problem, scores, client):
+    """
+    One Tab 1 analysis, following the app's steps.
+
+    Returns:
+        str: The full markdown report
+    """
+    engine = get_retrieval_engine()
+    similarity = engine.similarity(problem)
+    top_matches = engine.rank(similarity, top_k=PROMPT_CONTEXT_CANDIDATES)
+    doctrine, _ = top_matches[0]
+    gei = MCDA_ENGINE.score_one(scores)
+
+    prompt = build_analysis_prompt(problem, top_matches, scores, gei)
+    params = build_completion_params(prompt)
+    parser = OptionScoreParser()
+    stream = client.create(stream=True, **params)
+    result = "".join(parser.tap(chunk.choices[0].delta.content for chunk in stream if chunk.choices))
+    options = rank_policy_options(parser.options(), scores[2], scores[3])
+
+    limb_scores = saptanga_impact(scores, similarity)
+    options_df = options[OPTION_COLUMNS]
+    figures = [
+        generate_radar_chart(*scores),
+        generate_pareto_chart(options_df, non_dominated_sort(options_df[OPTION_COLUMNS[1:]])),
+        generate_saptanga_analysis(limb_scores),
+        generate_heatmap(get_corpus_df(), similarity),
+        generate_mcda_breakdown(list(scores)),
+    ]
+    for fig in figures:
+        pio.to_json(fig, validate=False)  # what st.plotly_chart sends to the browser
+    citations = [(entry.citation, entry.doctrine) for entry in prompt.context.entries]
+    return format_full_report(problem, doctrine, scores, gei, result, datetime.now(), limb_scores, citations)
+
+
+def run(quick=False, llm_latency_ms=0.0):
+    """Run the suite; returns a list of result dicts."""
+    results = []
+    client = stub_llm_client(llm_latency_ms / 1000.0)
+    problem = SAMPLE_QUERIES[0]
+    scores = [7, 6, 6, 5, 7]
+    analyze(problem, scores, client)  # build the retrieval index outside the timing
+
+    def cold():
+        get_figure_cache().clear()
+        analyze(problem, scores, client)
+
+    results.append(measure("tab1_analysis", cold, repeat=5, figure_cache="cold", llm_latency_ms=llm_latency_ms))
+    results.append(measure("tab1_analysis", lambda: analyze(problem, scores, client), repeat=5,
+                           figure_cache="warm", llm_latency_ms=llm_latency_ms))
+    return results
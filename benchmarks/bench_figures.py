@@ -0,0 +1,49 @@
+"""
+Figure benchmarks: every chart builder cold (the undecorated builder) and
+through the figure cache with a warm entry.
+"""
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import measure
+from charts import (
+    OPTION_COLUMNS, generate_heatmap, generate_mcda_breakdown, generate_pareto_chart, generate_radar_chart,
+    generate_reversal_heatmap, generate_saptanga_analysis
+)
+from chanakya_wisdom import get_corpus_df
+from mcda import non_dominated_sort, weight_sensitivity
+from rag_engine import get_retrieval_engine
+from saptanga import saptanga_impact
+
+SCORES = (7, 6, 6, 5, 7)
+
+
+def figure_inputs():
+    """Representative arguments for each builder, as the app passes them."""
+    similarity = get_retrieval_engine().similarity(
+        "Farmers are protesting due to falling crop prices and rising input costs."
+    )
+    rng = np.random.default_rng(0)
+    options = pd.DataFrame(rng.integers(1, 11, size=(50, 5)), columns=OPTION_COLUMNS[1:])
+    options.insert(0, "Option", [f"Option {i + 1}" for i in range(len(options))])
+    sensitivity = weight_sensitivity(options[OPTION_COLUMNS[1:]].head(10))
+    return {
+        generate_radar_chart: SCORES,
+        generate_heatmap: (get_corpus_df(), similarity),
+        generate_saptanga_analysis: (saptanga_impact(SCORES, similarity),),
+        generate_mcda_breakdown: (list(SCORES),),
+        generate_pareto_chart: (options, non_dominated_sort(options[OPTION_COLUMNS[1:]])),
+        generate_reversal_heatmap: (options["Option"].head(10).tolist(), sensitivity.reversal_probabilities),
+    }
+
+
+def run(quick=False):
+    """Run the suite; returns a list of result dicts."""
+    results = []
+    for builder, args in figure_inputs().items():
+        name = builder.__name__
+        results.append(measure(name, lambda: builder.__wrapped__(*args), cache="cold"))
+        builder(*args)
+        results.append(measure(name, lambda: builder(*args), cache="warm"))
+    return results
@@ -0,0 +1,85 @@
+"""
+Retrieval benchmarks: rag_retrieval on the built-in corpus, recall and
+latency of every engine on labelled queries (benchmarks.relevance), every
+engine over synthetic corpora of increasing size, the time for a new
+doctrine to become searchable in the incremental engine, and prompt
+context packing of the retrieved candidates.
+"""
+
+import itertools
+import time
+
+from benchmarks.harness import measure, record
+from benchmarks.relevance import RELEVANCE_QUERIES, evaluate
+from benchmarks.synthetic import synthetic_queries, synthetic_records
+from chanakya_wisdom import DoctrineCorpus, get_corpus
+from config import PROMPT_CONTEXT_CANDIDATES
+from corpus_store import InMemoryCorpusStore, MutableCorpusStore
+from prompt_builder import pack_context
+from rag_engine import DoctrineIndex, HybridEngine, IncrementalIndex, InvertedIndexEngine, LSAEngine, rag_retrieval
+
+# Engine name -> builder over an arbitrary corpus (rag_engine.ENGINES builds
+# over the process-wide corpus only)
+ENGINE_BUILDERS = {
+    "tfidf": DoctrineIndex,
+    "inverted": lambda corpus: InvertedIndexEngine(DoctrineIndex(corpus)),
+    "hybrid": lambda corpus: HybridEngine(DoctrineIndex(corpus)),
+    "lsa": LSAEngine,
+    "incremental": lambda corpus: IncrementalIndex().snapshot(corpus),
+}
+
+CORPUS_SIZES = (15, 1_000, 10_000, 100_000)
+QUICK_CORPUS_SIZES = (15, 1_000, 10_000)
+BATCH_QUERIES = 1_000
+
+
+def run(quick=False):
+    """Run the suite; returns a list of result dicts."""
+    results = []
+    queries = synthetic_queries(BATCH_QUERIES)
+    batch = queries[:BATCH_QUERIES // 10] if quick else queries
+    query_cycle = itertools.cycle(queries)
+
+    rag_retrieval(queries[0])  # build the process-wide index outside the timing
+    results.append(measure("rag_retrieval", lambda: rag_retrieval(next(query_cycle), top_k=2), doctrines=15))
+
+    # Recall on labelled paraphrase queries, with the latency of the same searches
+    labelled = itertools.cycle(query for query, _ in RELEVANCE_QUERIES)
+    for name, build in ENGINE_BUILDERS.items():
+        engine = build(get_corpus())
+        results.append(measure("relevance_search", lambda: engine.search_positions(next(labelled), 3),
+                               metrics=evaluate(engine), engine=name, doctrines=len(engine)))
+
+    for size in QUICK_CORPUS_SIZES if quick else CORPUS_SIZES:
+        records = synthetic_records(size)
+        corpus = DoctrineCorpus(InMemoryCorpusStore(records))
+        for name, build in ENGINE_BUILDERS.items():
+            started = time.perf_counter()
+            engine = build(corpus)
+            results.append(record("engine_build", [time.perf_counter() - started], engine=name, doctrines=size))
+            results.append(measure("search", lambda: engine.search(next(query_cycle), top_k=2),
+                                   engine=name, doctrines=size))
+            results.append(measure("search_batch_per_query", lambda: list(engine.search_batch(batch, 2)),
+                                   repeat=3, number=1, items=len(batch),
+                                   engine=name, doctrines=size, queries=len(batch)))
+
+        # Append one doctrine, publish the snapshot and search it (merges
+        # included, amortized); compare with engine_build for a full rebuild
+        store = MutableCorpusStore(InMemoryCorpusStore(records))
+        index = IncrementalIndex()
+        index.snapshot(DoctrineCorpus(store.snapshot()))
+        new_ids = itertools.count(size + 1)
+        new_records = itertools.cycle(records[:100])
+
+        def append_and_search():
+            store.append({**next(new_records), "id": next(new_ids)})
+            index.snapshot(DoctrineCorpus(store.snapshot())).search(next(query_cycle), top_k=2)
+
+        results.append(measure("append_to_search", append_and_search, engine="incremental", doctrines=size))
+
+        # Packing works on the retrieved candidates only, whatever the corpus size
+        candidate_lists = [engine.search(query, PROMPT_CONTEXT_CANDIDATES) for query in queries[:100]]
+        candidate_cycle = itertools.cycle(candidate_lists)
+        results.append(measure("context_packing", lambda: pack_context(next(candidate_cycle)),
+                               doctrines=size, candidates=PROMPT_CONTEXT_CANDIDATES))
+    return results
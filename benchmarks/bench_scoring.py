@@ -0,0 +1,42 @@
+"""
+Scoring benchmarks: calculate_policy_score (one call per option, as the app
+used to score), calculate_governance_index (a single option through the MCDA
+engine) and MCDAEngine.score over option batches up to 1e6.
+"""
+
+import numpy as np
+
+from benchmarks.harness import measure
+from chanakya_wisdom import calculate_policy_score
+from mcda import MCDA_ENGINE, non_dominated_sort, weight_sensitivity
+
+BATCH_SIZES = (1, 100, 10_000, 1_000_000)
+QUICK_BATCH_SIZES = (1, 100, 10_000, 100_000)
+
+
+def _options(n_options, seed=0):
+    return np.random.default_rng(seed).integers(1, 11, size=(n_options, 5)).astype(np.float64)
+
+
+def run(quick=False):
+    """Run the suite; returns a list of result dicts."""
+    results = []
+    # app.calculate_governance_index is MCDA_ENGINE.score_one (app.py is a script, not importable)
+    results.append(measure("calculate_governance_index", lambda: MCDA_ENGINE.score_one([7, 6, 6, 5, 7])))
+
+    for size in QUICK_BATCH_SIZES if quick else BATCH_SIZES:
+        options = _options(size)
+        rows = options.tolist()
+        repeat = 3 if size >= 100_000 else 5
+        results.append(measure("calculate_policy_score_loop", lambda: [calculate_policy_score(*row) for row in rows],
+                               repeat=repeat, options=size))
+        results.append(measure("mcda_engine_score", lambda: MCDA_ENGINE.score(options), repeat=repeat, options=size))
+
+    sensitivity_options = _options(10)
+    weight_sensitivity(sensitivity_options)  # weight samples are cached after the first call
+    results.append(measure("weight_sensitivity", lambda: weight_sensitivity(sensitivity_options),
+                           repeat=3, options=10, samples=200_000))
+    frontier_options = _options(10_000)
+    results.append(measure("non_dominated_sort", lambda: non_dominated_sort(frontier_options),
+                           repeat=3, options=10_000))
+    return results
@@ -0,0 +1,176 @@
+"""
+Benchmark harness: timing, environment metadata and JSON result files.
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Relative slowdown above which --compare flags a benchmark
+REGRESSION_THRESHOLD = 0.10
+
+
+def measure(name, func, repeat=5, number=None, items=1, metrics=None, **params):
+    """
+    Time a zero-argument callable.
+
+    Like timeit: `number` calls per repetition (auto-ranged to at least
+    0.2 s when None), `repeat` repetitions, per-call times reported.
+
+    Args:
+        name (str): Benchmark name
+        func (callable): Code under test
+        repeat (int): Number of repetitions
+        number (int): Calls per repetition (None to auto-range)
+        items (int): Items processed per call; times are reported per item
+        metrics (dict): Optional non-timing results (recall, ...) stored alongside
+        **params: Parameters identifying this case (size, engine, ...)
+
+    Returns:
+        dict: name, params, number, repeat and min/median/mean/max seconds per call
+    """
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    return record(name, [total / number / items for total in timer.repeat(repeat, number)],
+                  number=number, metrics=metrics, **params)
+
+
+def record(name, times, number=1, metrics=None, **params):
+    """
+    Result dict for externally measured per-call times (see measure()).
+
+    Args:
+        name (str): Benchmark name
+        times (list[float]): Seconds per call, one entry per repetition
+        number (int): Calls per repetition
+        metrics (dict): Optional non-timing results stored alongside
+        **params: Parameters identifying this case
+    """
+    result = {
+        "name": name,
+        "params": params,
+        "number": number,
+        "repeat": len(times),
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "mean_s": statistics.fmean(times),
+        "max_s": max(times),
+    }
+    line = f"  {name:<42} {_format_params(params):<36} {_format_seconds(result['median_s']):>12}"
+    if metrics:
+        result["metrics"] = metrics
+        line += "   " + _format_params(metrics)
+    print(line, flush=True)
+    return result
+
+
+def _format_params(params):
+    return ", ".join(f"{k}={v}" for k, v in params.items())
+
+
+def _format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True,
+                              cwd=Path(__file__).resolve().parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    """Commit, interpreter and library versions of this run."""
+    import numpy
+    import pandas
+    import plotly
+    import sklearn
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "packages": {
+            "numpy": numpy.__version__,
+            "pandas": pandas.__version__,
+            "plotly": plotly.__version__,
+            "scikit-learn": sklearn.__version__,
+        },
+    }
+
+
+def write_results(results, path=None):
+    """
+    Write a result file.
+
+    Args:
+        results (list[dict]): Results from measure()
+        path (str | Path): Output file (default: results/<timestamp>-<commit>.json)
+
+    Returns:
+        Path: File written
+    """
+    meta = environment()
+    if path is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = RESULTS_DIR / f"{stamp}-{(meta['commit'] or 'nogit')[:10]}.json"
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"meta": meta, "results": results}, indent=2), encoding="utf-8")
+    return path
+
+
+def _case_key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(baseline_path, current_path, threshold=REGRESSION_THRESHOLD):
+    """
+    Print median times of two result files side by side.
+
+    Returns:
+        int: Number of benchmarks slower than baseline by more than threshold
+    """
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    current = json.loads(Path(current_path).read_text(encoding="utf-8"))
+    before = {_case_key(r): r for r in baseline["results"]}
+
+    print(f"Baseline: {baseline['meta'].get('commit')}  Current: {current['meta'].get('commit')}")
+    print(f"{'Benchmark':<42} {'Params':<36} {'Baseline':>12} {'Current':>12} {'Change':>8}")
+    regressions = 0
+    for result in current["results"]:
+        old = before.get(_case_key(result))
+        if old is None:
+            continue
+        change = result["median_s"] / old["median_s"] - 1.0
+        flag = ""
+        if change > threshold:
+            flag = "  ▲ slower"
+            regressions += 1
+        elif change < -threshold:
+            flag = "  ▼ faster"
+        print(f"{result['name']:<42} {_format_params(result['params']):<36} "
+              f"{_format_seconds(old['median_s']):>12} {_format_seconds(result['median_s']):>12} "
+              f"{change:>+7.1%}{flag}")
+    return regressions
+
+
+def latest_result(exclude=None):
+    """Most recent file in RESULTS_DIR (other than `exclude`), or None."""
+    files = sorted(p for p in RESULTS_DIR.glob("*.json") if exclude is None or p.resolve() != Path(exclude).resolve())
+    return files[-1] if files else None
@@ -0,0 +1,308 @@
+"""
+Equivalence checks for the optimized code paths.
+
+Each check runs an optimized implementation against a simple reference on
+the same inputs and counts the disagreements:
+- inverted: InvertedIndexEngine prunes with MaxScore but must return the
+  same top-k as DoctrineIndex: for every query the k scores must match the
+  reference top-k scores, and every returned position must carry its
+  reference score (ties at the k-th score may pick different positions)
+- mcda: MCDAEngine.score must be bit-identical to calculate_policy_score
+- pareto: non_dominated_sort (ENS-BS) must assign every option the layer
+  found by peeling off the non-dominated options one layer at a time
+- incremental: after every append, update and delete (and the segment
+  merges they trigger), IncrementalIndex BM25 scores must equal those of a
+  BM25Index rebuilt from scratch over the same snapshot, and an engine for
+  an older snapshot must keep its results (the synthetic vocabulary has no
+  hashing collisions, so the scores agree exactly up to float rounding)
+
+Usage:
+    python -m benchmarks.parity [--quick]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Benchmarks import the app modules from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.relevance import RELEVANCE_QUERIES  # noqa: E402
+from benchmarks.synthetic import SAMPLE_QUERIES, synthetic_corpus, synthetic_queries, synthetic_records  # noqa: E402
+from chanakya_wisdom import DoctrineCorpus, calculate_policy_score, get_corpus  # noqa: E402
+from corpus_store import InMemoryCorpusStore, MutableCorpusStore  # noqa: E402
+from mcda import MCDA_ENGINE, non_dominated_sort  # noqa: E402
+from rag_engine import BM25Index, DoctrineIndex, IncrementalIndex, InvertedIndexEngine  # noqa: E402
+
+TOP_KS = (1, 2, 5, 20)
+CORPUS_SIZES = (1_000, 10_000)
+QUICK_CORPUS_SIZES = (1_000,)
+MCDA_OPTIONS = 200_000
+QUICK_MCDA_OPTIONS = 20_000
+PARETO_SIZES = (0, 1, 2, 10, 100, 1_000, 3_000)
+QUICK_PARETO_SIZES = (0, 1, 2, 10, 100, 1_000)
+# (base doctrines, random writes, merge fanout) per incremental scenario
+INCREMENTAL_SCENARIOS = ((200, 60, 2), (2_000, 60, 8))
+QUICK_INCREMENTAL_SCENARIOS = ((200, 30, 2),)
+
+
+def parity_mismatches(reference, engine, queries, top_ks=TOP_KS, rtol=1e-9, atol=1e-12):
+    """
+    Queries on which engine.search_positions disagrees with the reference.
+
+    Args:
+        reference (DoctrineIndex): Reference engine
+        engine (RetrievalEngine): Engine under test, over the same corpus
+        queries (iterable): Problem statements
+        top_ks (tuple): Cutoffs to check
+        rtol, atol (float): Score tolerance (float summation order differs)
+
+    Returns:
+        list[tuple]: (query, top_k, reason) per disagreement
+    """
+    mismatches = []
+    for query in queries:
+        similarity = reference.similarity(query)
+        for top_k in top_ks:
+            expected_positions, expected = reference.search_positions(query, top_k)
+            positions, scores = engine.search_positions(query, top_k)
+            if len(positions) != len(expected_positions):
+                mismatches.append((query, top_k, f"{len(positions)} results, expected {len(expected_positions)}"))
+            elif not np.allclose(scores, expected, rtol=rtol, atol=atol):
+                mismatches.append((query, top_k, "top-k scores differ"))
+            elif not np.allclose(scores, similarity[positions], rtol=rtol, atol=atol):
+                mismatches.append((query, top_k, "returned scores do not belong to their positions"))
+    return mismatches
+
+
+def mcda_mismatches(options):
+    """
+    Options whose vectorized GEI is not bit-identical to calculate_policy_score.
+
+    Args:
+        options (np.ndarray): (N x 5) criterion scores
+
+    Returns:
+        list[tuple]: (option, engine GEI, calculate_policy_score GEI) per disagreement
+    """
+    scores = MCDA_ENGINE.score(options)
+    expected = np.array([calculate_policy_score(*row) for row in options.tolist()])
+    differ = np.flatnonzero(scores.view(np.int64) != expected.view(np.int64))
+    return [(options[i].tolist(), float(scores[i]), float(expected[i])) for i in differ]
+
+
+def mcda_options(n_options, seed=0):
+    """
+    Criterion scores as the app produces them.
+
+    Slider integers, one- and two-decimal catalogue values (the two-decimal
+    grid puts many weighted sums on a rounding boundary) and arbitrary floats.
+
+    Returns:
+        dict: Label -> (n_options x 5) array
+    """
+    rng = np.random.default_rng(seed)
+    shape = (n_options, len(MCDA_ENGINE))
+    return {
+        "integer": rng.integers(1, 11, size=shape).astype(np.float64),
+        "1 decimal": rng.integers(10, 101, size=shape) / 10,
+        "2 decimals": rng.integers(100, 1001, size=shape) / 100,
+        "float": rng.uniform(0, 10, size=shape),
+    }
+
+
+def peeled_layers(matrix):
+    """
+    Reference dominance layers: repeatedly remove the options no remaining option dominates.
+
+    Args:
+        matrix (np.ndarray): (N x criteria) scores, all maximized
+
+    Returns:
+        np.ndarray: Layer number per option (0 = Pareto frontier)
+    """
+    layers = np.empty(len(matrix), dtype=np.intp)
+    remaining = np.arange(len(matrix))
+    layer = 0
+    while len(remaining):
+        points = matrix[remaining]
+        dominated = np.array([np.any(np.all(points >= p, axis=1) & np.any(points > p, axis=1)) for p in points])
+        layers[remaining[~dominated]] = layer
+        remaining = remaining[dominated]
+        layer += 1
+    return layers
+
+
+def pareto_options(n_options, seed=0):
+    """
+    Option sets for the dominance-layer check.
+
+    Slider integers (many ties and duplicate profiles), a 3-level grid (few
+    distinct profiles, long dominance chains), anti-correlated scores (wide
+    frontiers) and arbitrary floats.
+
+    Returns:
+        dict: Label -> (n_options x 5) array
+    """
+    rng = np.random.default_rng(seed)
+    shape = (n_options, len(MCDA_ENGINE))
+    base = rng.uniform(0, 10, size=(n_options, 1))
+    return {
+        "integer": rng.integers(1, 11, size=shape).astype(np.float64),
+        "3-level": rng.integers(1, 4, size=shape).astype(np.float64),
+        "anti-correlated": np.hstack([base, 10 - base, rng.uniform(0, 10, size=(n_options, shape[1] - 2))]),
+        "float": rng.uniform(0, 10, size=shape),
+    }
+
+
+def _random_write(store, current_ids, spare, rng):
+    """Apply one random write: a batch of appends, an update or a delete."""
+    operation = rng.choice(("append", "update", "delete"), p=(0.5, 0.3, 0.2))
+    if operation == "append" or len(current_ids) < 2:
+        batch = spare[:rng.integers(1, 21)]
+        for record in batch:
+            store.append(record)
+            current_ids.append(record["id"])
+        del spare[:len(batch)]
+    elif operation == "update":
+        donor = spare[rng.integers(len(spare))]
+        store.update(current_ids[rng.integers(len(current_ids))], text=donor["text"], keywords=donor["keywords"])
+    else:
+        store.delete(current_ids.pop(rng.integers(len(current_ids))))
+
+
+def incremental_mismatches(n_base, n_writes, queries, fanout=2, seed=0, rtol=1e-9, atol=1e-12):
+    """
+    Scores on which IncrementalIndex disagrees with BM25Index.
+
+    A MutableCorpusStore over n_base synthetic doctrines goes through
+    n_writes random writes. After each write the incremental engine for the
+    new snapshot is compared with a BM25Index built over that snapshot;
+    finally the engine of the first snapshot is checked again, after every
+    later write and merge.
+
+    Args:
+        n_base (int): Doctrines in the base store
+        n_writes (int): Random writes to apply
+        queries (list): Problem statements
+        fanout (int): IncrementalIndex merge fanout (2 merges on most writes)
+        seed (int): Random seed
+        rtol, atol (float): Score tolerance
+
+    Returns:
+        list[tuple]: (write number, query, reason) per disagreement
+    """
+    rng = np.random.default_rng(seed)
+    records = synthetic_records(n_base + 20 * n_writes, seed)
+    store = MutableCorpusStore(InMemoryCorpusStore(records[:n_base]))
+    current_ids = [record["id"] for record in records[:n_base]]
+    spare = records[n_base:]
+    index = IncrementalIndex(fanout=fanout)
+
+    def compare(write, engine, expected):
+        for query, scores in zip(queries, expected):
+            actual = engine.similarity(query)
+            if actual.shape != scores.shape:
+                mismatches.append((write, query, f"{len(actual)} scores, expected {len(scores)}"))
+            elif not np.allclose(actual, scores, rtol=rtol, atol=atol):
+                mismatches.append((write, query, f"scores differ by up to {np.max(np.abs(actual - scores)):.3g}"))
+
+    mismatches = []
+    first = None
+    for write in range(n_writes + 1):
+        if write:
+            _random_write(store, current_ids, spare, rng)
+        corpus = DoctrineCorpus(store.snapshot())
+        reference = BM25Index(corpus)
+        expected = [reference.scores(query) for query in queries]
+        engine = index.snapshot(corpus)
+        compare(write, engine, expected)
+        if first is None:
+            first = engine, expected
+    compare("first snapshot, rechecked", *first)
+    return mismatches
+
+
+def _report(label, cases, mismatches, describe):
+    """Print one check's result line and its first mismatches; returns the mismatch count."""
+    status = "✅" if not mismatches else "❌"
+    print(f"{status} {label}: {cases}, {len(mismatches)} mismatches")
+    for mismatch in mismatches[:5]:
+        print(f"    {describe(mismatch)}")
+    return len(mismatches)
+
+
+def check_inverted(quick):
+    """InvertedIndexEngine against DoctrineIndex on the built-in and synthetic corpora."""
+    cases = [("built-in", get_corpus(), list(SAMPLE_QUERIES) + [q for q, _ in RELEVANCE_QUERIES])]
+    queries = synthetic_queries(100 if quick else 300)
+    for size in QUICK_CORPUS_SIZES if quick else CORPUS_SIZES:
+        cases.append((f"synthetic {size:,}", synthetic_corpus(size), queries))
+
+    total = 0
+    for label, corpus, case_queries in cases:
+        reference = DoctrineIndex(corpus)
+        mismatches = parity_mismatches(reference, InvertedIndexEngine(reference), case_queries)
+        total += _report(f"inverted vs tfidf, {label}", f"{len(case_queries)} queries x top-k {TOP_KS}", mismatches,
+                         lambda m: f"k={m[1]}: {m[2]}: {m[0][:60]!r}")
+    return total
+
+
+def check_mcda(quick):
+    """MCDAEngine.score against calculate_policy_score, bit for bit."""
+    total = 0
+    for label, options in mcda_options(QUICK_MCDA_OPTIONS if quick else MCDA_OPTIONS).items():
+        total += _report(f"mcda engine vs calculate_policy_score, {label} scores", f"{len(options):,} options",
+                         mcda_mismatches(options), lambda m: f"{m[0]}: {m[1]!r}, expected {m[2]!r}")
+    return total
+
+
+def check_pareto(quick):
+    """non_dominated_sort against layer peeling, over several option shapes and sizes."""
+    total = 0
+    sizes = QUICK_PARETO_SIZES if quick else PARETO_SIZES
+    for label in pareto_options(0):
+        mismatches = []
+        for size in sizes:
+            options = pareto_options(size, seed=size)[label]
+            differ = np.flatnonzero(non_dominated_sort(options) != peeled_layers(options))
+            mismatches.extend((size, i) for i in differ)
+        total += _report(f"pareto layers vs layer peeling, {label} scores", f"option sets of {sizes}", mismatches,
+                         lambda m: f"{m[0]} options: option {m[1]} in the wrong layer")
+    return total
+
+
+def check_incremental(quick):
+    """IncrementalIndex against BM25Index through random appends, updates and deletes."""
+    queries = synthetic_queries(30)
+    total = 0
+    for n_base, n_writes, fanout in QUICK_INCREMENTAL_SCENARIOS if quick else INCREMENTAL_SCENARIOS:
+        mismatches = incremental_mismatches(n_base, n_writes, queries, fanout=fanout)
+        total += _report(f"incremental vs bm25, {n_base:,} doctrines, fanout {fanout}",
+                         f"{n_writes} writes x {len(queries)} queries", mismatches,
+                         lambda m: f"write {m[0]}: {m[2]}: {m[1][:60]!r}")
+    return total
+
+
+def run(quick=False):
+    """
+    Run every check.
+
+    Returns:
+        int: Number of mismatches (0 when every implementation agrees)
+    """
+    return check_inverted(quick) + check_mcda(quick) + check_pareto(quick) + check_incremental(quick)
+
+
+def main(argv=None):
+    """Command-line entry point; exit status 1 on any mismatch."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.parity", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--quick", action="store_true", help="Smaller synthetic corpora and option sets")
+    args = parser.parse_args(argv)
+    return 1 if run(quick=args.quick) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
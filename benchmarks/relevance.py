@@ -0,0 +1,61 @@
+"""
+Labelled retrieval queries for the built-in corpus, for recall comparisons
+between engines.
+
+Queries paraphrase a doctrine's subject in the words a user would type;
+most avoid that doctrine's keywords. Each query lists the doctrine ids
+that count as a correct answer.
+"""
+
+RELEVANCE_QUERIES = [
+    ("We need to figure out the underlying reasons before choosing a policy", {1}),
+    ("Evidence-based study of why the scheme failed", {1}),
+    ("Power theft and unpaid bills are draining the electricity board's revenue", {2}),
+    ("The state budget deficit leaves no money for new programmes", {2}),
+    ("Rural families cannot afford medicines and food prices keep rising", {3, 10}),
+    ("Citizens' wellbeing should come before the ruler's own comfort", {3}),
+    ("Gangs operate openly and the police do not register complaints", {4}),
+    ("Without strict punishment the powerful exploit the weak", {4}),
+    ("A neighbouring country is building military alliances against us", {5}),
+    ("How should we deal with hostile and friendly bordering nations", {5}),
+    ("Roads and bridges are crumbling and the highway project is delayed", {6}),
+    ("Protect government servers from hackers", {6, 13}),
+    ("Persuade the striking unions before using force", {7}),
+    ("Offer incentives first, then divide the opposition, and punish as a last resort", {7}),
+    ("How the institutions of the state depend on each other", {8}),
+    ("Which organs of government are weakest and need reform", {8, 11}),
+    ("Floods have displaced thousands and relief camps are overflowing", {9}),
+    ("A viral outbreak has overwhelmed district hospitals", {9, 3}),
+    ("Crop yields are falling and the soil is degrading", {10}),
+    ("Settle landless families on unused farmland", {10}),
+    ("Senior officials are incompetent and appointments are political", {11}),
+    ("Reform the civil service recruitment process", {11}),
+    ("Is it right to pursue growth that harms future generations", {12}),
+    ("Balancing profit with moral duty in public decisions", {12}),
+    ("Covert agents should monitor extremist networks", {13}),
+    ("Gather secret information about smuggling rings", {13}),
+    ("Traders are hoarding grain and manipulating market prices", {14}),
+    ("Regulate merchants and protect small businesses", {14}),
+    ("Plan long-term expansion while safeguarding what we already have", {15}),
+    ("Secure existing gains and acquire new capabilities", {15}),
+]
+
+
+def evaluate(engine, cutoffs=(1, 3)):
+    """
+    Recall at each cutoff and mean reciprocal rank over RELEVANCE_QUERIES.
+
+    Only doctrines with a positive score count as retrieved.
+
+    Returns:
+        dict: recall@<k> per cutoff and mrr, rounded to 3 decimals
+    """
+    first_hits = []
+    for query, relevant in RELEVANCE_QUERIES:
+        positions, scores = engine.search_positions(query, len(engine))
+        ids = [int(engine.corpus.store.ids()[p]) for p, score in zip(positions, scores) if score > 0]
+        first_hits.append(next((rank for rank, doc_id in enumerate(ids, start=1) if doc_id in relevant), None))
+    n = len(first_hits)
+    metrics = {f"recall@{k}": round(sum(1 for r in first_hits if r is not None and r <= k) / n, 3) for k in cutoffs}
+    metrics["mrr"] = round(sum(1.0 / r for r in first_hits if r is not None) / n, 3)
+    return metrics
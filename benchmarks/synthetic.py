@@ -0,0 +1,78 @@
+"""
+Synthetic corpora and queries for the benchmarks.
+
+Synthetic doctrines reuse the vocabulary and domains of KNOWLEDGE_CORPUS, so
+TF-IDF vocabularies and domain distributions look like the real corpus at
+any size.
+"""
+
+import re
+
+import numpy as np
+
+from chanakya_wisdom import KNOWLEDGE_CORPUS, DoctrineCorpus
+from corpus_store import InMemoryCorpusStore
+
+# The Tab 1 sample problems
+SAMPLE_QUERIES = (
+    "The state is facing a severe deficit in the electricity sector due to power theft and unpaid bills by rural consumers. This is causing daily 8-hour power cuts affecting industries.",
+    "A new viral outbreak has been detected in 3 districts. Current hospital capacity is only 30% of what's needed. There are supply chain issues for medicines.",
+    "Farmers are protesting due to falling crop prices and rising input costs. Many are defaulting on loans. The government faces fiscal constraints.",
+    "The capital city faces acute water shortage. Borewells are drying up. Private tanker mafia is charging exorbitant rates. Elections are in 6 months.",
+)
+
+
+def _vocabulary():
+    keywords = sorted({k.strip() for d in KNOWLEDGE_CORPUS for k in d["keywords"].split(",")})
+    words = sorted({w.lower() for d in KNOWLEDGE_CORPUS for w in re.findall(r"[A-Za-z]+", d["text"])})
+    return np.array(keywords), np.array(words)
+
+
+def synthetic_records(n_doctrines, seed=0):
+    """
+    Corpus records shaped like KNOWLEDGE_CORPUS.
+
+    Args:
+        n_doctrines (int): Number of doctrines
+        seed (int): Random seed
+
+    Returns:
+        list[dict]: Records with id, doctrine, text, keywords, domain, policy_weight
+    """
+    if n_doctrines <= len(KNOWLEDGE_CORPUS):
+        return [dict(d) for d in KNOWLEDGE_CORPUS[:n_doctrines]]
+    rng = np.random.default_rng(seed)
+    keywords, words = _vocabulary()
+    domains = sorted({d["domain"] for d in KNOWLEDGE_CORPUS})
+    keyword_picks = rng.integers(0, len(keywords), size=(n_doctrines, 8))
+    word_picks = rng.integers(0, len(words), size=(n_doctrines, 25))
+    domain_picks = rng.integers(0, len(domains), size=n_doctrines)
+    weights = np.round(rng.uniform(0.7, 1.0, size=n_doctrines), 2)
+    return [
+        {
+            "id": i + 1,
+            "doctrine": f"Synthetic Doctrine {i + 1}",
+            "text": " ".join(words[word_picks[i]]).capitalize() + ".",
+            "keywords": ", ".join(keywords[keyword_picks[i]]),
+            "domain": domains[domain_picks[i]],
+            "policy_weight": float(weights[i]),
+        }
+        for i in range(n_doctrines)
+    ]
+
+
+def synthetic_corpus(n_doctrines, seed=0):
+    """DoctrineCorpus over synthetic_records()."""
+    return DoctrineCorpus(InMemoryCorpusStore(synthetic_records(n_doctrines, seed)))
+
+
+def synthetic_queries(n_queries, seed=1):
+    """Problem statements: the sample problems plus keyword-salad variants."""
+    rng = np.random.default_rng(seed)
+    keywords, words = _vocabulary()
+    queries = list(SAMPLE_QUERIES)
+    while len(queries) < n_queries:
+        picks = np.concatenate([keywords[rng.integers(0, len(keywords), 4)], words[rng.integers(0, len(words), 12)]])
+        rng.shuffle(picks)
+        queries.append(" ".join(picks))
+    return queries[:n_queries]
@@ -11,7 +11,14 @@ Research Context:
 - Application: Public policy decision support systems
 """
 
-import pandas as pd
+import threading
+from functools import cached_property
+from types import MappingProxyType
+
+import numpy as np
+
+from config import CORPUS_CHANGES_PATH, CORPUS_PATH, DOCTRINE_PAGE_SIZE
+from corpus_store import InMemoryCorpusStore, MutableCorpusStore, NpyCorpusStore
 
 # --- THE KNOWLEDGE CORPUS (Arthashastra Dataset) ---
 # This represents the "Knowledge Graph" in research terminology
@@ -140,47 +147,204 @@ KNOWLEDGE_CORPUS = [
     }
 ]
 
+class DoctrineCorpus:
+    """
+    Read-only, indexed view of the knowledge corpus.
+
+    Built by get_corpus() on top of a corpus_store backend, once per store
+    snapshot. The domain list and average policy weight are computed from
+    the numeric columns only, the domain index and id lookup on first use;
+    doctrine text is materialized just for the rows a caller asks for.
+    Callers must not mutate the frames handed out by this object; take a
+    copy first.
+
+    Positions are storage positions. Rows that were deleted or replaced by
+    a newer version (see corpus_store.MutableCorpusStore) keep their
+    position but are left out of every lookup; len() counts current
+    doctrines, len(corpus.store) all positions.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        live = store.live()
+        self.positions = np.arange(len(store)) if live is None else np.flatnonzero(live)
+        self.deleted = np.empty(0, dtype=np.intp) if live is None else np.flatnonzero(~live)
+        codes, names = store.domain_codes()
+        self._codes = np.asarray(codes) if live is None else np.asarray(codes)[self.positions]
+        self._names = names
+        self._present = np.bincount(self._codes, minlength=len(names)) > 0
+        self.domains = tuple(name for name, used in zip(names, self._present) if used)
+        weights = np.asarray(store.policy_weights())
+        self.avg_policy_weight = float(np.mean(weights[self.positions])) if len(self.positions) else 0.0
+        self._domain_frames = {}
+
+    def __len__(self):
+        return len(self.positions)
+
+    @cached_property
+    def domain_rows(self):
+        """Domain -> positions, via one stable sort of the code column."""
+        order = np.argsort(self._codes, kind='stable')
+        bounds = np.searchsorted(self._codes[order], np.arange(len(self._names) + 1))
+        return MappingProxyType({
+            self._names[code]: self.positions[order[bounds[code]:bounds[code + 1]]]
+            for code in range(len(self._names)) if self._present[code]
+        })
+
+    @cached_property
+    def _id_index(self):
+        # Id -> position via binary search over the sorted id column
+        ids = np.asarray(self.store.ids())[self.positions]
+        order = np.argsort(ids, kind='stable')
+        return ids[order], self.positions[order]
+
+    @cached_property
+    def df(self):
+        """The full corpus as a DataFrame (materializes every row)."""
+        return self.store.rows(self.positions)
+
+    def row(self, position):
+        """Doctrine row at a storage position."""
+        return self.store.row(position)
+
+    def domain_positions(self, domain=None):
+        """Positions of one domain's doctrines (every doctrine for None)."""
+        if domain is None:
+            return self.positions
+        return self.domain_rows.get(domain, np.empty(0, dtype=np.intp))
+
+    def by_domain(self, domain):
+        """Doctrines of one domain (empty frame for unknown domains)."""
+        frame = self._domain_frames.get(domain)
+        if frame is None:
+            frame = self.store.rows(self.domain_positions(domain))
+            self._domain_frames[domain] = frame
+        return frame
+
+    def page(self, page, page_size, domain=None):
+        """Doctrines on one page of the (domain's) list; only those rows are materialized."""
+        start = page * page_size
+        return self.store.rows(self.domain_positions(domain)[start:start + page_size])
+
+    def by_id(self, doc_id):
+        """Doctrine row for a corpus id."""
+        sorted_ids, positions = self._id_index
+        slot = np.searchsorted(sorted_ids, doc_id)
+        if slot == len(sorted_ids) or sorted_ids[slot] != doc_id:
+            raise KeyError(doc_id)
+        return self.row(positions[slot])
+
+
+_store = None
+_corpus = None
+_corpus_lock = threading.Lock()
+
+
+def get_corpus_store():
+    """
+    Returns the process-wide corpus store, creating it on first use.
+    
+    A MutableCorpusStore over the memory-mapped NpyCorpusStore when
+    CHANAKYA_CORPUS_PATH is set, otherwise over the built-in
+    KNOWLEDGE_CORPUS; doctrines are added, updated and deleted through its
+    append(), update() and delete() methods, logged to
+    CHANAKYA_CORPUS_CHANGES_PATH.
+    
+    Returns:
+        MutableCorpusStore: Shared store
+    """
+    global _store
+    if _store is None:
+        with _corpus_lock:
+            if _store is None:
+                base = NpyCorpusStore(CORPUS_PATH) if CORPUS_PATH else InMemoryCorpusStore(KNOWLEDGE_CORPUS)
+                _store = MutableCorpusStore(base, CORPUS_CHANGES_PATH or None)
+    return _store
+
+
+def get_corpus():
+    """
+    Returns the indexed corpus at the store's latest version.
+    
+    The object is shared until the next write to the store. A caller that
+    keeps it (e.g. for the rest of an analysis) keeps a consistent view:
+    later writes produce a new DoctrineCorpus instead of changing this one.
+    
+    Returns:
+        DoctrineCorpus: Cached, read-only corpus object
+    """
+    global _corpus
+    store = get_corpus_store()
+    corpus = _corpus
+    if corpus is None or corpus.store.version != store.version:
+        with _corpus_lock:
+            snapshot = store.snapshot()
+            if _corpus is None or _corpus.store is not snapshot:
+                _corpus = DoctrineCorpus(snapshot)
+            corpus = _corpus
+    return corpus
+
 def get_corpus_df():
     """
     Returns the knowledge corpus as a Pandas DataFrame.
     
+    The frame is shared by every caller and must be treated as read-only.
+    
     Returns:
         pd.DataFrame: Structured dataset with doctrines, keywords, and metadata
     """
-    return pd.DataFrame(KNOWLEDGE_CORPUS)
+    return get_corpus().df
 
 def get_doctrines_by_domain(domain=None):
     """
     Filter doctrines by governance domain.
     
+    Without a domain this is the whole corpus (see get_corpus_df); listings
+    should page through it with get_doctrine_page instead.
+    
     Args:
         domain (str): Specific domain to filter (e.g., "Economic Policy")
     
     Returns:
         pd.DataFrame: Filtered doctrines
     """
-    df = get_corpus_df()
     if domain:
-        return df[df['domain'] == domain]
-    return df
+        return get_corpus().by_domain(domain)
+    return get_corpus_df()
+
+def get_doctrine_page(domain=None, page=0, page_size=DOCTRINE_PAGE_SIZE):
+    """
+    One page of doctrines, optionally of a single domain.
+    
+    Only the doctrines on the page are loaded, so listing cost does not
+    grow with the corpus.
+    
+    Args:
+        domain (str): Specific domain to filter, or None for all doctrines
+        page (int): Zero-based page number
+        page_size (int): Doctrines per page
+    
+    Returns:
+        pd.DataFrame: Doctrines on the page (empty past the last page)
+    """
+    return get_corpus().page(page, page_size, domain)
 
 def get_all_domains():
     """Returns list of all unique governance domains."""
-    return get_corpus_df()['domain'].unique().tolist()
+    return list(get_corpus().domains)
 
 # --- SYSTEM PROMPT (Academic-Grade Prompt Engineering) ---
-SYSTEM_PROMPT = """
+# Static instructions, sent unchanged as the system message of every analysis
+# so that the shared prefix can be cached; the retrieved doctrine and the
+# problem follow in the user message (RETRIEVED_CONTEXT_TEMPLATE)
+SYSTEM_INSTRUCTIONS = """
 You are 'Chanakya-GPT', a specialized Decision Support System (DSS) for Governance and Public Policy Analysis.
 
 **System Architecture:**
 - Framework: Neuro-Symbolic AI combining LLM reasoning with Arthashastra doctrines
 - Mode: Multi-Criteria Decision Analysis (MCDA) with explainable outputs
 - Constraint: All recommendations must cite specific Sanskrit principles
-
-**Retrieved Knowledge Context:**
-Doctrine Retrieved via RAG: "{retrieved_context}"
-Domain: {domain}
-Policy Weight: {weight}
+- Input: The user message gives the doctrines retrieved via RAG (each with a citation id such as [D3]), the problem and the policy parameters
 
 **Analysis Framework - Saptanga Model:**
 Evaluate impact on the seven limbs of state:
@@ -201,7 +365,7 @@ Evaluate impact on the seven limbs of state:
 
 ### 2. Doctrinal Framework Application
 - Primary doctrine: [Retrieved via RAG]
-- Secondary relevant principles
+- Secondary relevant principles (other retrieved doctrines, cited by id)
 - Historical precedent (if applicable)
 
 ### 3. Multi-Criteria Policy Evaluation
@@ -242,8 +406,21 @@ Apply Sama-Dana-Bheda-Danda framework:
 - Provide quantitative scores where possible
 - Maintain formal, research-paper tone
 - Cite specific verses/principles from Arthashastra
+- Cite retrieved doctrines by their citation id, e.g. [D3]
 """
 
+# Per-request part of the prompt, at the start of the user message: the
+# packed doctrines (DOCTRINE_CONTEXT_TEMPLATE each), most relevant first
+RETRIEVED_CONTEXT_TEMPLATE = """**Retrieved Knowledge Context:**
+Doctrines Retrieved via RAG (most relevant first):
+{retrieved_context}"""
+DOCTRINE_CONTEXT_TEMPLATE = """[{citation}] {doctrine} | Domain: {domain} | Policy Weight: {weight}
+"{text}"
+"""
+
+# Single-message form of the full prompt (instructions followed by the context)
+SYSTEM_PROMPT = SYSTEM_INSTRUCTIONS + "\n" + RETRIEVED_CONTEXT_TEMPLATE
+
 # Alternative prompt for quick policy briefs
 BRIEF_SYSTEM_PROMPT = """
 You are Chanakya-GPT. Analyze the following governance problem using this doctrine:
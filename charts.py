@@ -0,0 +1,249 @@
+"""
+Chart Builders
+==============
+Plotly figure builders for the Chanakya DSS dashboards. Every builder is
+memoized with figure_cache.memoize_figure, so reruns with unchanged inputs
+reuse the serialized figure; the undecorated builder is available as
+`<builder>.__wrapped__` (used by the benchmarks to time a cold build).
+"""
+
+import plotly.graph_objects as go
+
+from chanakya_wisdom import MCDA_CRITERIA
+from figure_cache import memoize_figure
+from saptanga import LIMB_LABELS
+
+# Columns of the editable policy option table (criteria in MCDA_CRITERIA order)
+OPTION_COLUMNS = ["Option", "Welfare", "Economic", "Law & Order", "Political", "Implementation"]
+
+
+@memoize_figure
+def generate_radar_chart(welfare, economic, law_order, political, implementation):
+    """
+    Generates Multi-Criteria Decision Analysis (MCDA) Radar Chart.
+    
+    Research Context: Visualization of policy trade-offs across Chanakyan dimensions.
+    """
+    categories = [
+        'Welfare<br>(Prajasukhe)', 
+        'Economic<br>(Kosha)', 
+        'Law & Order<br>(Danda)', 
+        'Political<br>(Mitra)',
+        'Implementation<br>Feasibility'
+    ]
+    
+    values = [welfare, economic, law_order, political, implementation]
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatterpolar(
+        r=values,
+        theta=categories,
+        fill='toself',
+        name='Policy Profile',
+        line_color='#667eea',
+        fillcolor='rgba(102, 126, 234, 0.3)'
+    ))
+    
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 10],
+                tickfont=dict(size=10)
+            )
+        ),
+        showlegend=False,
+        title={
+            'text': "Multi-Criteria Policy Impact Matrix",
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 16, 'family': 'Merriweather'}
+        },
+        height=400
+    )
+    
+    return fig
+
+
+@memoize_figure
+def generate_heatmap(df_corpus, similarity_scores, score_name="TF-IDF Cosine Similarity"):
+    """
+    Generate heatmap showing relevance scores across all doctrines.
+
+    score_name names the retrieval engine's score in the title.
+    """
+    # Create dataframe with doctrine names and scores
+    doctrine_names = [doc.split('(')[0].strip()[:20] for doc in df_corpus['doctrine'].tolist()]
+    
+    fig = go.Figure(data=go.Heatmap(
+        z=[similarity_scores],
+        x=doctrine_names,
+        y=['Relevance'],
+        colorscale='YlOrRd',
+        text=[[f'{score:.3f}' for score in similarity_scores]],
+        texttemplate='%{text}',
+        textfont={"size": 10},
+        colorbar=dict(title="Similarity<br>Score")
+    ))
+    
+    fig.update_layout(
+        title=f"Doctrinal Relevance Heatmap ({score_name})",
+        xaxis_title="Arthashastra Doctrines",
+        height=250,
+        margin=dict(l=50, r=50, t=50, b=100)
+    )
+    
+    fig.update_xaxes(tickangle=-45)
+    
+    return fig
+
+
+@memoize_figure
+def generate_saptanga_analysis(limb_scores):
+    """
+    Generate bar chart for Saptanga (Seven Limbs) impact analysis.
+    
+    Limb scores come from saptanga.saptanga_impact (MCDA parameters plus
+    the doctrinal emphasis of the retrieval).
+    """
+    scores = [float(s) for s in limb_scores]
+    
+    colors = ['#667eea' if s >= 7 else '#ffc107' if s >= 5 else '#dc3545' for s in scores]
+    
+    fig = go.Figure(data=[
+        go.Bar(x=list(LIMB_LABELS), y=scores, marker_color=colors, text=[f'{s:.1f}' for s in scores], textposition='auto')
+    ])
+    
+    fig.update_layout(
+        title="Saptanga Impact Assessment (Seven Limbs of State)",
+        yaxis_title="Impact Score",
+        yaxis_range=[0, 10],
+        height=350,
+        showlegend=False
+    )
+    
+    return fig
+
+
+@memoize_figure
+def generate_mcda_breakdown(scores):
+    """
+    Generate grouped bar chart of raw vs weighted MCDA criterion scores.
+    """
+    criteria_names = [v['name'] for v in MCDA_CRITERIA.values()]
+    criteria_weights = [v['weight'] for v in MCDA_CRITERIA.values()]
+    weighted_scores = [s * w for s, w in zip(scores, criteria_weights)]
+    
+    fig = go.Figure(data=[
+        go.Bar(name='Raw Score', x=criteria_names, y=scores, marker_color='lightblue'),
+        go.Bar(name='Weighted Score', x=criteria_names, y=weighted_scores, marker_color='darkblue')
+    ])
+    
+    fig.update_layout(
+        title="Multi-Criteria Decision Analysis (MCDA) Breakdown",
+        yaxis_title="Score",
+        barmode='group',
+        height=400
+    )
+    
+    return fig
+
+
+@memoize_figure
+def generate_pareto_chart(options_df, layers):
+    """
+    Parallel-coordinates view of policy options coloured by dominance layer.
+    
+    Research Context: Exposes the trade-offs hidden by the single GEI; lines in
+    the brightest colour form the Pareto frontier (non-dominated options).
+    """
+    max_layer = max(int(layers.max()), 1)
+    
+    fig = go.Figure(data=go.Parcoords(
+        line=dict(
+            color=layers,
+            colorscale=[[0, '#667eea'], [1, '#3a3f4b']],
+            cmin=0,
+            cmax=max_layer,
+            showscale=True,
+            colorbar=dict(title="Layer")
+        ),
+        dimensions=[
+            dict(label=column, values=options_df[column], range=[0, 10])
+            for column in OPTION_COLUMNS[1:]
+        ]
+    ))
+    
+    fig.update_layout(
+        title={
+            'text': "Pareto Frontier & Dominance Layers",
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 16, 'family': 'Merriweather'}
+        },
+        height=400
+    )
+    
+    return fig
+
+
+@memoize_figure
+def generate_reversal_heatmap(option_names, reversal_probabilities):
+    """
+    Heatmap of pairwise rank-reversal probabilities from the weight-sensitivity analysis.
+    
+    Cell (row i, column j) is the probability that option j outranks option i
+    although i ranks higher under the configured weights.
+    """
+    fig = go.Figure(data=go.Heatmap(
+        z=reversal_probabilities,
+        x=option_names,
+        y=option_names,
+        colorscale='YlOrRd',
+        zmin=0,
+        zmax=0.5,
+        text=[[f'{p:.1%}' if p else '' for p in row] for row in reversal_probabilities],
+        texttemplate='%{text}',
+        colorbar=dict(title="P(reversal)")
+    ))
+    
+    fig.update_layout(
+        title="Rank-Reversal Probability (row outranked by column)",
+        height=350,
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
+    
+    return fig
+
+
+@memoize_figure
+def generate_trace_waterfall(spans):
+    """
+    Waterfall of the pipeline stages of one analysis.
+    
+    Each span (tracing.Span) is a bar from its start to its end, in
+    milliseconds since the analysis began; repeated stages share a row.
+    """
+    names = list(dict.fromkeys(span.name for span in spans))
+    
+    fig = go.Figure(data=go.Bar(
+        y=[span.name for span in spans],
+        x=[span.duration_ms for span in spans],
+        base=[span.start_ms for span in spans],
+        orientation='h',
+        marker_color='#667eea',
+        text=[f'{span.duration_ms:.1f} ms' for span in spans],
+        textposition='auto',
+        hovertemplate='%{y}: %{base:.1f} ms + %{x:.1f} ms<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title="Pipeline Stage Waterfall",
+        xaxis_title="Milliseconds since analysis start",
+        height=max(250, 40 * len(names) + 100),
+        showlegend=False
+    )
+    fig.update_yaxes(categoryorder='array', categoryarray=names, autorange='reversed')
+    
+    return fig
@@ -0,0 +1,71 @@
+"""
+Runtime Configuration
+=====================
+Deployment settings for Chanakya DSS, read once from environment variables.
+Every setting has a default that reproduces the out-of-the-box behaviour, so
+a plain `streamlit run app.py` needs no configuration at all.
+"""
+
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# --- KNOWLEDGE CORPUS ---
+# Directory written by `python corpus_store.py export <dir>`; when unset the
+# built-in KNOWLEDGE_CORPUS literal is used.
+CORPUS_PATH = os.environ.get("CHANAKYA_CORPUS_PATH") or None
+# JSONL log of doctrines added, updated or deleted at runtime (replayed on
+# startup); set to an empty string to keep such changes in memory only
+CORPUS_CHANGES_PATH = os.environ.get("CHANAKYA_CORPUS_CHANGES_PATH",
+                                     str(BASE_DIR / ".chanakya_cache" / "corpus_changes.jsonl"))
+# Doctrines listed per page in the Knowledge Base tab
+DOCTRINE_PAGE_SIZE = int(os.environ.get("CHANAKYA_DOCTRINE_PAGE_SIZE", 20))
+
+# --- RETRIEVAL ---
+# Engine behind rag_retrieval: tfidf, inverted, hybrid, lsa or incremental
+# (see rag_engine.ENGINES)
+RAG_ENGINE = os.environ.get("CHANAKYA_RAG_ENGINE", "tfidf")
+# Dimensions of the LSA engine's latent space (capped by the corpus size)
+LSA_COMPONENTS = int(os.environ.get("CHANAKYA_LSA_COMPONENTS", 128))
+# Directory for the LSA engine's memory-mapped index; empty keeps it in memory only
+LSA_INDEX_PATH = os.environ.get("CHANAKYA_LSA_INDEX_PATH", str(BASE_DIR / ".chanakya_cache" / "lsa_index"))
+# Segments of one size tier that the incremental engine merges into one
+INCREMENTAL_MERGE_FANOUT = int(os.environ.get("CHANAKYA_INCREMENTAL_MERGE_FANOUT", 8))
+
+# --- LLM INFERENCE ---
+# Stream completions into the Policy Analysis tab as they are generated
+STREAM_RESPONSES = os.environ.get("CHANAKYA_STREAM_RESPONSES", "1") != "0"
+LLM_TIMEOUT = float(os.environ.get("CHANAKYA_LLM_TIMEOUT", 60))
+LLM_POOL_SIZE = int(os.environ.get("CHANAKYA_LLM_POOL_SIZE", 20))
+LLM_MAX_RETRIES = int(os.environ.get("CHANAKYA_LLM_MAX_RETRIES", 4))
+LLM_BACKOFF_BASE = float(os.environ.get("CHANAKYA_LLM_BACKOFF_BASE", 0.5))
+LLM_BACKOFF_CAP = float(os.environ.get("CHANAKYA_LLM_BACKOFF_CAP", 8))
+# Consecutive failures before the circuit opens, and seconds before a trial call
+LLM_BREAKER_THRESHOLD = int(os.environ.get("CHANAKYA_LLM_BREAKER_THRESHOLD", 5))
+LLM_BREAKER_RESET = float(os.environ.get("CHANAKYA_LLM_BREAKER_RESET", 30))
+
+# --- PROMPT ---
+# Token caps (estimated, see prompt_builder.count_tokens) of the problem
+# statement and of the packed doctrine context in the analysis prompt
+PROMPT_PROBLEM_TOKENS = int(os.environ.get("CHANAKYA_PROMPT_PROBLEM_TOKENS", 1024))
+PROMPT_CONTEXT_TOKENS = int(os.environ.get("CHANAKYA_PROMPT_CONTEXT_TOKENS", 512))
+# Ranked retrieval results the context packer chooses from
+PROMPT_CONTEXT_CANDIDATES = int(os.environ.get("CHANAKYA_PROMPT_CONTEXT_CANDIDATES", 20))
+
+# --- LLM RESPONSE CACHE ---
+# SQLite file for cached completions; set to an empty string to disable
+LLM_CACHE_PATH = os.environ.get("CHANAKYA_LLM_CACHE_PATH", str(BASE_DIR / ".chanakya_cache" / "llm_cache.sqlite3"))
+LLM_CACHE_TTL = float(os.environ.get("CHANAKYA_LLM_CACHE_TTL", 7 * 24 * 3600))
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("CHANAKYA_LLM_CACHE_MAX_ENTRIES", 1000))
+LLM_CACHE_MAX_BYTES = int(os.environ.get("CHANAKYA_LLM_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# --- FIGURE CACHE ---
+# Serialized Plotly figures kept in memory (LRU); 0 disables memoization
+FIGURE_CACHE_SIZE = int(os.environ.get("CHANAKYA_FIGURE_CACHE_SIZE", 256))
+
+# --- TRACING ---
+# JSONL file receiving one line of stage timings per analysis; empty disables
+TRACE_LOG_PATH = os.environ.get("CHANAKYA_TRACE_LOG_PATH", str(BASE_DIR / ".chanakya_cache" / "traces.jsonl"))
+# Most recent traces summarized in the Analytics Dashboard percentiles
+TRACE_LOG_WINDOW = int(os.environ.get("CHANAKYA_TRACE_LOG_WINDOW", 5000))
@@ -0,0 +1,489 @@
+"""
+Corpus Storage Backends
+=======================
+Storage layer behind chanakya_wisdom.get_corpus(). A backend exposes the
+doctrine columns without forcing the whole corpus into Python objects:
+numeric columns are plain NumPy arrays, text columns are read lazily, and
+only the rows a caller asks for are materialized as pandas objects.
+
+Backends:
+- InMemoryCorpusStore: the built-in KNOWLEDGE_CORPUS list of dicts
+- NpyCorpusStore: columnar directory of memory-mapped .npy files, suitable
+  for the full Arthashastra (all 15 books, sutras and commentaries)
+
+Writes:
+- MutableCorpusStore layers append/update/delete over a read-only backend.
+  Rows are never changed in place: an update appends the new version and
+  tombstones the old row, so positions stay stable and every write
+  publishes a new immutable CorpusSnapshot
+- Writes can be logged to a JSONL changes file and are replayed on startup
+
+On-disk layout (NpyCorpusStore):
+    id.npy                 int64   doctrine ids
+    policy_weight.npy      float64 policy weights
+    domain_codes.npy       int32   index into domains.json
+    domains.json                   domain names, in first-appearance order
+    <col>.bytes.npy        uint8   UTF-8 text of every row, concatenated
+    <col>.offsets.npy      int64   row boundaries into <col>.bytes.npy (n + 1)
+for each text column in TEXT_COLUMNS.
+
+Usage:
+    python corpus_store.py export <dir> [records.jsonl]
+"""
+
+import json
+import sys
+import threading
+from itertools import chain, islice
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ("id", "doctrine", "text", "keywords", "domain", "policy_weight")
+TEXT_COLUMNS = ("doctrine", "text", "keywords")
+
+
+class CorpusStore:
+    """
+    Interface implemented by every corpus backend.
+
+    Positions are 0-based row numbers in storage order; they are the
+    positions used by the retrieval index.
+    """
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def ids(self):
+        """np.ndarray of doctrine ids, in storage order."""
+        raise NotImplementedError
+
+    def policy_weights(self):
+        """np.ndarray of policy weights, in storage order."""
+        raise NotImplementedError
+
+    def domain_codes(self):
+        """Tuple (codes, names): per-row index into the list of domain names."""
+        raise NotImplementedError
+
+    def iter_text(self, column):
+        """Lazily yield one text column (doctrine, text or keywords) row by row."""
+        raise NotImplementedError
+
+    def rows(self, positions):
+        """Materialize the given positions as a DataFrame indexed by position."""
+        raise NotImplementedError
+
+    def row(self, position):
+        """Materialize a single position as a Series."""
+        return self.rows([position]).iloc[0]
+
+    def live(self):
+        """Boolean mask of current rows (not deleted or replaced), or None when every row is current."""
+        return None
+
+    def iter_current_text(self, column):
+        """iter_text() with deleted and replaced rows yielded as empty strings (positions unchanged)."""
+        live = self.live()
+        if live is None:
+            return self.iter_text(column)
+        return (text if current else "" for text, current in zip(self.iter_text(column), live))
+
+
+class InMemoryCorpusStore(CorpusStore):
+    """Backend over an in-memory list of doctrine dicts."""
+
+    def __init__(self, records):
+        self._df = pd.DataFrame(list(records), columns=list(COLUMNS))
+        codes, names = pd.factorize(self._df['domain'])
+        self._codes = codes.astype(np.int32)
+        self._names = names.tolist()
+
+    def __len__(self):
+        return len(self._df)
+
+    def ids(self):
+        return self._df['id'].to_numpy()
+
+    def policy_weights(self):
+        return self._df['policy_weight'].to_numpy(dtype=np.float64)
+
+    def domain_codes(self):
+        return self._codes, self._names
+
+    def iter_text(self, column):
+        return iter(self._df[column].tolist())
+
+    def rows(self, positions):
+        return self._df.iloc[np.asarray(positions, dtype=np.intp)]
+
+
+class NpyCorpusStore(CorpusStore):
+    """
+    Backend over a directory written by write_npy_corpus().
+
+    Every array is opened with mmap_mode='r', so opening the store costs
+    the same regardless of corpus size; text is decoded only for the rows
+    that are requested.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._ids = self._load("id")
+        self._weights = self._load("policy_weight")
+        self._codes = self._load("domain_codes")
+        self._names = json.loads((self.directory / "domains.json").read_text(encoding="utf-8"))
+        self._text = {
+            column: (self._load(f"{column}.bytes"), self._load(f"{column}.offsets"))
+            for column in TEXT_COLUMNS
+        }
+
+    def _load(self, name):
+        return np.load(self.directory / f"{name}.npy", mmap_mode="r")
+
+    def _decode(self, column, position):
+        blob, offsets = self._text[column]
+        return blob[offsets[position]:offsets[position + 1]].tobytes().decode("utf-8")
+
+    def __len__(self):
+        return len(self._ids)
+
+    def ids(self):
+        return self._ids
+
+    def policy_weights(self):
+        return self._weights
+
+    def domain_codes(self):
+        return self._codes, self._names
+
+    def iter_text(self, column):
+        return (self._decode(column, position) for position in range(len(self)))
+
+    def rows(self, positions):
+        positions = np.asarray(positions, dtype=np.intp)
+        data = {
+            "id": np.asarray(self._ids[positions]),
+            "doctrine": [self._decode("doctrine", p) for p in positions],
+            "text": [self._decode("text", p) for p in positions],
+            "keywords": [self._decode("keywords", p) for p in positions],
+            "domain": [self._names[c] for c in self._codes[positions]],
+            "policy_weight": np.asarray(self._weights[positions]),
+        }
+        return pd.DataFrame(data, index=positions, columns=list(COLUMNS))
+
+
+def _normalize_record(record):
+    missing = [column for column in COLUMNS if column not in record]
+    if missing:
+        raise ValueError(f"Doctrine record is missing {', '.join(missing)}")
+    normalized = {column: record[column] for column in COLUMNS}
+    normalized["id"] = int(normalized["id"])
+    normalized["policy_weight"] = float(normalized["policy_weight"])
+    return normalized
+
+
+class CorpusSnapshot(CorpusStore):
+    """
+    Read-only view of a MutableCorpusStore at one version.
+
+    Holds the row count, the tombstones and views of the column buffers as
+    they were when it was taken; later writes only touch rows past its end
+    (or a new tombstone mask), so the snapshot never changes.
+    """
+
+    def __init__(self, base, tail, ids, weights, codes, names, live, version):
+        self.base = base
+        self.version = version
+        self._tail = tail
+        self._ids = ids
+        self._weights = weights
+        self._codes = codes
+        self._names = names
+        self._live = live
+
+    def __len__(self):
+        return len(self._ids)
+
+    def ids(self):
+        return self._ids
+
+    def policy_weights(self):
+        return self._weights
+
+    def domain_codes(self):
+        return self._codes, self._names
+
+    def iter_text(self, column):
+        tail = islice(self._tail, len(self) - len(self.base))
+        return chain(self.base.iter_text(column), (record[column] for record in tail))
+
+    def rows(self, positions):
+        positions = np.asarray(positions, dtype=np.intp)
+        in_base = positions < len(self.base)
+        if in_base.all():
+            return self.base.rows(positions)
+        appended = positions[~in_base]
+        tail = pd.DataFrame([self._tail[p - len(self.base)] for p in appended], index=appended, columns=list(COLUMNS))
+        if not in_base.any():
+            return tail
+        frame = pd.concat([self.base.rows(positions[in_base]), tail])
+        # Back to the requested order
+        return frame.iloc[np.argsort(np.concatenate([np.flatnonzero(in_base), np.flatnonzero(~in_base)]), kind='stable')]
+
+    def live(self):
+        return self._live
+
+
+class MutableCorpusStore:
+    """
+    Append-only doctrine store with update and delete, over a read-only backend.
+
+    - append(record) adds a row; update(doc_id, **fields) appends the new
+      version of a doctrine and tombstones its current row; delete(doc_id)
+      tombstones it. Rows are never rewritten, so positions are stable
+      across versions
+    - snapshot() returns the current CorpusSnapshot; readers holding an
+      older snapshot (a session mid-analysis, a retrieval index) keep a
+      consistent view while writers continue
+    - With changes_path set, each write is appended to a JSONL file
+      ({"op": "put", "record": ...} or {"op": "delete", "id": ...}) and
+      the file is replayed when the store is opened
+
+    Numeric columns live in growable buffers (capacity doubling), so an
+    append is amortized O(1) and a snapshot takes views, not copies.
+
+    Args:
+        base (CorpusStore): Initial rows (InMemoryCorpusStore, NpyCorpusStore)
+        changes_path (str | Path): Optional changes log
+    """
+
+    def __init__(self, base, changes_path=None):
+        self.base = base
+        self._lock = threading.Lock()
+        self._size = len(base)
+        capacity = max(self._size * 2, 64)
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._weights = np.empty(capacity, dtype=np.float64)
+        self._codes = np.empty(capacity, dtype=np.int32)
+        self._ids[:self._size] = base.ids()
+        self._weights[:self._size] = base.policy_weights()
+        codes, names = base.domain_codes()
+        self._codes[:self._size] = codes
+        self._names = list(names)
+        self._domain_lookup = {name: code for code, name in enumerate(self._names)}
+        self._tail = []
+        self._live = None  # all rows current until the first tombstone
+        self._positions = None  # id -> current position, built on the first write
+        self.version = 0
+        self._snapshot = None
+
+        self.changes_path = Path(changes_path) if changes_path else None
+        if self.changes_path is not None and self.changes_path.exists():
+            self._replay()
+
+    def __len__(self):
+        return self._size
+
+    def _current_positions(self):
+        if self._positions is None:
+            ids = self._ids[:self._size].tolist()
+            live = self._live
+            self._positions = {doc_id: p for p, doc_id in enumerate(ids) if live is None or live[p]}
+        return self._positions
+
+    def _tombstone(self, position):
+        if self._live is None:
+            self._live = np.ones(len(self._ids), dtype=bool)
+        self._live[position] = False
+
+    def _grow(self):
+        capacity = len(self._ids) * 2
+        for name in ("_ids", "_weights", "_codes"):
+            buffer = getattr(self, name)
+            grown = np.empty(capacity, dtype=buffer.dtype)
+            grown[:self._size] = buffer[:self._size]
+            setattr(self, name, grown)
+        if self._live is not None:
+            self._live = np.concatenate([self._live, np.ones(capacity - len(self._live), dtype=bool)])
+
+    def _put(self, record):
+        positions = self._current_positions()
+        previous = positions.get(record["id"])
+        if previous is not None:
+            self._tombstone(previous)
+        if self._size == len(self._ids):
+            self._grow()
+        position = self._size
+        code = self._domain_lookup.get(record["domain"])
+        if code is None:
+            code = self._domain_lookup[record["domain"]] = len(self._names)
+            self._names.append(record["domain"])
+        self._ids[position] = record["id"]
+        self._weights[position] = record["policy_weight"]
+        self._codes[position] = code
+        self._tail.append(record)
+        self._size += 1
+        positions[record["id"]] = position
+        self.version += 1
+        return position
+
+    def _delete(self, doc_id):
+        self._tombstone(self._current_positions().pop(doc_id))
+        self.version += 1
+
+    def _log(self, change):
+        if self.changes_path is None:
+            return
+        self.changes_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.changes_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(change, ensure_ascii=False) + "\n")
+
+    def _replay(self):
+        with open(self.changes_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    change = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a write cut short
+                if change.get("op") == "put":
+                    self._put(_normalize_record(change["record"]))
+                elif change.get("op") == "delete" and change.get("id") in self._current_positions():
+                    self._delete(change["id"])
+
+    def append(self, record):
+        """
+        Add a new doctrine.
+
+        Args:
+            record (dict): Fields of KNOWLEDGE_CORPUS (id, doctrine, text,
+                keywords, domain, policy_weight); the id must be new
+
+        Returns:
+            int: Storage position of the row
+        """
+        record = _normalize_record(record)
+        with self._lock:
+            if record["id"] in self._current_positions():
+                raise ValueError(f"Doctrine {record['id']} already exists; use update()")
+            self._log({"op": "put", "record": record})
+            return self._put(record)
+
+    def update(self, doc_id, **fields):
+        """
+        Replace fields of an existing doctrine (stored as a new row version).
+
+        Returns:
+            int: Storage position of the new version
+        """
+        unknown = set(fields) - set(COLUMNS[1:])
+        if unknown:
+            raise ValueError(f"Cannot update {', '.join(sorted(unknown))}")
+        with self._lock:
+            position = self._current_positions().get(doc_id)
+            if position is None:
+                raise KeyError(doc_id)
+            record = _normalize_record({**self._record(position), **fields})
+            self._log({"op": "put", "record": record})
+            return self._put(record)
+
+    def delete(self, doc_id):
+        """Remove a doctrine from later snapshots."""
+        with self._lock:
+            if doc_id not in self._current_positions():
+                raise KeyError(doc_id)
+            self._log({"op": "delete", "id": doc_id})
+            self._delete(doc_id)
+
+    def _record(self, position):
+        if position >= len(self.base):
+            return self._tail[position - len(self.base)]
+        row = self.base.row(position)
+        return {column: row[column].item() if hasattr(row[column], "item") else row[column] for column in COLUMNS}
+
+    def snapshot(self):
+        """
+        The store at its current version (cached until the next write).
+
+        Returns:
+            CorpusSnapshot: Immutable view
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self.version:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != self.version:
+                size = self._size
+                live = None if self._live is None else self._live[:size].copy()
+                self._snapshot = CorpusSnapshot(
+                    self.base, self._tail, self._ids[:size], self._weights[:size], self._codes[:size],
+                    tuple(self._names), live, self.version,
+                )
+            return self._snapshot
+
+
+def write_npy_corpus(records, directory):
+    """
+    Write doctrine records in the columnar layout read by NpyCorpusStore.
+
+    Args:
+        records (iterable): Dicts with the KNOWLEDGE_CORPUS fields
+        directory (str | Path): Target directory (created if missing)
+
+    Returns:
+        int: Number of rows written
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    ids, weights, codes = [], [], []
+    domain_lookup = {}
+    blobs = {column: bytearray() for column in TEXT_COLUMNS}
+    offsets = {column: [0] for column in TEXT_COLUMNS}
+
+    for record in records:
+        ids.append(record["id"])
+        weights.append(record["policy_weight"])
+        codes.append(domain_lookup.setdefault(record["domain"], len(domain_lookup)))
+        for column in TEXT_COLUMNS:
+            blobs[column] += record[column].encode("utf-8")
+            offsets[column].append(len(blobs[column]))
+
+    np.save(directory / "id.npy", np.asarray(ids, dtype=np.int64))
+    np.save(directory / "policy_weight.npy", np.asarray(weights, dtype=np.float64))
+    np.save(directory / "domain_codes.npy", np.asarray(codes, dtype=np.int32))
+    (directory / "domains.json").write_text(json.dumps(list(domain_lookup), ensure_ascii=False), encoding="utf-8")
+    for column in TEXT_COLUMNS:
+        np.save(directory / f"{column}.bytes.npy", np.frombuffer(bytes(blobs[column]), dtype=np.uint8))
+        np.save(directory / f"{column}.offsets.npy", np.asarray(offsets[column], dtype=np.int64))
+    return len(ids)
+
+
+def _read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv=None):
+    """Command-line entry point: export a corpus to the .npy layout."""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) not in (2, 3) or argv[0] != "export":
+        print(__doc__.split("Usage:")[1].strip())
+        return 2
+
+    if len(argv) == 3:
+        records = _read_jsonl(argv[2])
+    else:
+        from chanakya_wisdom import KNOWLEDGE_CORPUS
+        records = KNOWLEDGE_CORPUS
+
+    count = write_npy_corpus(records, argv[1])
+    print(f"✅ Wrote {count} doctrines to {argv[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
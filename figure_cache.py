@@ -0,0 +1,154 @@
+"""
+Figure Cache
+============
+Memoization for the Plotly figure builders in app.py. Building a go.Figure
+validates every property through plotly's validators, which costs several
+milliseconds per chart per rerun; most reruns redraw charts whose inputs
+have not changed.
+
+A builder decorated with @memoize_figure is keyed on its name, its
+arguments (numpy arrays and pandas objects are hashed by content) and the
+active plotly template. The cache stores the serialized figure JSON in a
+bounded, process-wide LRU; a hit rebuilds the figure from JSON without
+re-validating it, so every caller still gets its own Figure object.
+"""
+
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from config import FIGURE_CACHE_SIZE
+
+
+def _update_digest(digest, value):
+    if isinstance(value, np.ndarray):
+        digest.update(f"ndarray{value.dtype}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (pd.DataFrame, pd.Series)):
+        digest.update(f"{type(value).__name__}{value.shape}".encode())
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr(list(value.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"[")
+        for item in value:
+            _update_digest(digest, item)
+            digest.update(b",")
+        digest.update(b"]")
+    elif isinstance(value, dict):
+        digest.update(b"{")
+        for key in sorted(value, key=repr):
+            _update_digest(digest, key)
+            digest.update(b":")
+            _update_digest(digest, value[key])
+            digest.update(b",")
+        digest.update(b"}")
+    else:
+        digest.update(repr(value).encode())
+
+
+def figure_key(*parts):
+    """
+    Content hash of a figure's inputs.
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    _update_digest(digest, parts)
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """
+    Bounded LRU of serialized figures.
+
+    Args:
+        maxsize (int): Maximum number of figures kept
+    """
+
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Look up a figure.
+
+        Returns:
+            str | None: Figure JSON, or None on a miss
+        """
+        with self._lock:
+            spec = self._entries.get(key)
+            if spec is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return spec
+
+    def put(self, key, spec):
+        """Store figure JSON, dropping the least recently used entries over maxsize."""
+        with self._lock:
+            self._entries[key] = spec
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Cache counters.
+
+        Returns:
+            dict: hits, misses and entries currently stored
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+_cache = FigureCache()
+
+
+def get_figure_cache():
+    """Returns the process-wide figure cache."""
+    return _cache
+
+
+def memoize_figure(builder):
+    """
+    Decorator: reuse the figure built for identical inputs.
+
+    Args:
+        builder (callable): Function returning a go.Figure
+
+    Returns:
+        callable: Memoized builder (returns a fresh go.Figure per call)
+    """
+    @functools.wraps(builder)
+    def wrapper(*args, **kwargs):
+        if _cache.maxsize <= 0:
+            return builder(*args, **kwargs)
+        key = figure_key(builder.__qualname__, pio.templates.default, args, kwargs)
+        spec = _cache.get(key)
+        if spec is None:
+            fig = builder(*args, **kwargs)
+            _cache.put(key, pio.to_json(fig, validate=False))
+            return fig
+        return go.Figure(json.loads(spec), _validate=False)
+
+    return wrapper
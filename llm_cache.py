@@ -0,0 +1,197 @@
+"""
+LLM Completion Cache
+====================
+Content-addressed, disk-backed cache for chat completions. The key is a
+SHA-256 over the fully rendered messages (whitespace-normalized, so the same
+problem pasted with different spacing hits the same entry), the model name
+and the sampling settings. Entries live in a single SQLite file shared by
+every session in the process.
+
+Each entry can also hold the structured records parsed from the response
+(JSON), so a cache hit does not have to re-parse the completion.
+
+Eviction:
+- TTL: entries older than ttl_seconds are treated as misses and removed
+- LRU: when the entry count or total size exceeds its cap, the least
+  recently read entries are dropped first
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from config import LLM_CACHE_MAX_BYTES, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_PATH, LLM_CACHE_TTL
+
+
+def _normalize(text):
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def make_cache_key(messages, model, **sampling):
+    """
+    Content address of a completion request.
+
+    Args:
+        messages (list): Chat messages ({"role", "content"} dicts)
+        model (str): Model name
+        **sampling: Sampling settings (temperature, top_p, max_tokens, ...)
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    payload = {
+        "messages": [{"role": m["role"], "content": _normalize(m["content"])} for m in messages],
+        "model": model,
+        "sampling": sampling,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """
+    SQLite-backed completion store with TTL and LRU eviction.
+
+    Hit and miss counters are kept per process and reported by stats().
+    """
+
+    def __init__(self, path, ttl_seconds=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES,
+                 max_bytes=LLM_CACHE_MAX_BYTES):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL,"
+            " records TEXT)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(completions)")}
+        if "records" not in columns:
+            self._conn.execute("ALTER TABLE completions ADD COLUMN records TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_completions_accessed ON completions (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key):
+        """
+        Look up a completion.
+
+        Returns:
+            str | None: Cached response text, or None on a miss
+        """
+        entry = self.get_with_records(key)
+        return None if entry is None else entry[0]
+
+    def get_with_records(self, key):
+        """
+        Look up a completion and its parsed records.
+
+        Returns:
+            tuple | None: (response text, records or None), or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at, records FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0], (json.loads(row[2]) if row[2] is not None else None)
+
+    def put(self, key, response, model, records=None):
+        """
+        Store a completion and evict expired / least recently used entries.
+
+        Args:
+            key (str): Cache key (see make_cache_key)
+            response (str): Completion text
+            model (str): Model name
+            records (list): Optional JSON-serializable records parsed from the response
+        """
+        now = time.time()
+        encoded = json.dumps(records, ensure_ascii=False) if records is not None else None
+        size = len(response.encode("utf-8")) + (len(encoded.encode("utf-8")) if encoded else 0)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, model, response, size, created_at, accessed_at, records)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now, encoded),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        self._conn.execute("DELETE FROM completions WHERE created_at < ?", (now - self.ttl_seconds,))
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Walk from least recently read, dropping until both caps hold
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM completions ORDER BY accessed_at"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM completions WHERE key = ?", doomed)
+
+    def clear(self):
+        """Remove every entry (counters are kept)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+            self._conn.commit()
+
+    def stats(self):
+        """
+        Cache counters for the status panel.
+
+        Returns:
+            dict: hits, misses, entries and bytes currently stored
+        """
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": total}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_completion_cache():
+    """
+    Returns the process-wide completion cache, or None when disabled.
+
+    The cache is disabled by setting CHANAKYA_LLM_CACHE_PATH to an empty string.
+    """
+    global _cache
+    if not LLM_CACHE_PATH:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CompletionCache(LLM_CACHE_PATH)
+    return _cache
@@ -0,0 +1,298 @@
+"""
+LLM Client Manager
+==================
+One Groq client per process (per API key) instead of one per button press.
+
+- Connection pooling: the sync and async clients share keep-alive httpx pools,
+  so TLS handshakes are paid once per connection, not once per analysis
+- Retries: 429 and 5xx responses, timeouts and connection errors are retried
+  with full-jitter exponential backoff
+- Circuit breaker: after repeated failures the breaker opens and calls fail
+  immediately with CircuitOpenError until the reset timeout has passed; one
+  trial call then decides whether it closes again
+
+The Groq SDK and httpx are imported when the first client is built, so
+importing this module (e.g. for the sidebar status panel) stays cheap.
+
+Time spent sleeping between retries and time spent with the breaker open are
+accumulated in stats() for the sidebar status panel.
+"""
+
+import asyncio
+import random
+import threading
+import time
+
+from config import (
+    LLM_BACKOFF_BASE, LLM_BACKOFF_CAP, LLM_BREAKER_RESET, LLM_BREAKER_THRESHOLD,
+    LLM_MAX_RETRIES, LLM_POOL_SIZE, LLM_TIMEOUT,
+)
+
+RETRYABLE_STATUS = {408, 409, 429}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the LLM while the circuit breaker is open."""
+
+    def __init__(self, retry_in):
+        super().__init__(f"LLM service temporarily unavailable (circuit open, retry in {retry_in:.0f}s)")
+        self.retry_in = retry_in
+
+
+def is_retryable(error):
+    """True for rate limits, server errors, timeouts and connection failures."""
+    import groq
+    if isinstance(error, groq.APIConnectionError):
+        return True
+    if isinstance(error, groq.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS or error.status_code >= 500
+    return False
+
+
+def backoff_delay(attempt, base=LLM_BACKOFF_BASE, cap=LLM_BACKOFF_CAP):
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures; open ->
+    half-open after `reset_timeout` seconds; a half-open trial call closes
+    the breaker on success and re-opens it on failure.
+
+    Exactly one trial call is let through while half-open; other callers
+    are rejected with CircuitOpenError until it finishes. A trial that ends
+    without a verdict (non-retryable error, cancellation) calls
+    record_abort() so the next caller can try.
+    """
+
+    def __init__(self, failure_threshold=LLM_BREAKER_THRESHOLD, reset_timeout=LLM_BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.open_seconds = 0.0
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpenError if calls are currently blocked."""
+        with self._lock:
+            if self.state == "open":
+                elapsed = time.monotonic() - self.opened_at
+                if elapsed < self.reset_timeout:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.reset_timeout - elapsed)
+                self.state = "half-open"
+            if self.state == "half-open":
+                if self._trial_in_flight:
+                    self.rejected += 1
+                    raise CircuitOpenError(0.0)
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._trial_in_flight = False
+            self._close_open_period()
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._trial_in_flight = False
+            self.failures += 1
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                self._close_open_period()
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def record_abort(self):
+        """A call ended without telling whether the service is healthy."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _close_open_period(self):
+        if self.opened_at is not None:
+            self.open_seconds += time.monotonic() - self.opened_at
+            self.opened_at = None
+
+    def total_open_seconds(self):
+        """Accumulated open time, including the current open period."""
+        with self._lock:
+            current = time.monotonic() - self.opened_at if self.opened_at is not None else 0.0
+            return self.open_seconds + current
+
+
+class LLMClientManager:
+    """
+    Shared Groq clients with retries and a circuit breaker.
+
+    The SDK's own retries are disabled (max_retries=0) so that every retry
+    goes through this class and is counted.
+    """
+
+    def __init__(self, api_key, client=None, async_client=None, max_retries=LLM_MAX_RETRIES):
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.breaker = CircuitBreaker()
+        self.requests = 0
+        self.retries = 0
+        self.retry_seconds = 0.0
+        self._client = client
+        self._async_client = async_client
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Sync Groq client over a keep-alive connection pool."""
+        if self._client is None:
+            import httpx
+            from groq import Groq
+            with self._lock:
+                if self._client is None:
+                    self._client = Groq(
+                        api_key=self.api_key,
+                        max_retries=0,
+                        http_client=httpx.Client(timeout=LLM_TIMEOUT, limits=_pool_limits()),
+                    )
+        return self._client
+
+    @property
+    def async_client(self):
+        """Async Groq client over a keep-alive connection pool (one event loop)."""
+        if self._async_client is None:
+            import httpx
+            from groq import AsyncGroq
+            with self._lock:
+                if self._async_client is None:
+                    self._async_client = AsyncGroq(
+                        api_key=self.api_key,
+                        max_retries=0,
+                        http_client=httpx.AsyncClient(timeout=LLM_TIMEOUT, limits=_pool_limits()),
+                    )
+        return self._async_client
+
+    def _count(self, retry_delay=None):
+        with self._lock:
+            if retry_delay is None:
+                self.requests += 1
+            else:
+                self.retries += 1
+                self.retry_seconds += retry_delay
+
+    def create(self, **params):
+        """
+        chat.completions.create with retries and circuit breaking.
+
+        With stream=True the stream object is returned once the response
+        headers arrive; errors after that point are not retried.
+        """
+        self._count()
+        for attempt in range(self.max_retries + 1):
+            self.breaker.before_call()
+            try:
+                result = self.client.chat.completions.create(**params)
+            except Exception as e:
+                if not is_retryable(e):
+                    self.breaker.record_abort()
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+                self._count(delay)
+                time.sleep(delay)
+            except BaseException:
+                self.breaker.record_abort()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+
+    async def acreate(self, **params):
+        """Async counterpart of create()."""
+        self._count()
+        for attempt in range(self.max_retries + 1):
+            self.breaker.before_call()
+            try:
+                result = await self.async_client.chat.completions.create(**params)
+            except Exception as e:
+                if not is_retryable(e):
+                    self.breaker.record_abort()
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+                self._count(delay)
+                await asyncio.sleep(delay)
+            except BaseException:
+                self.breaker.record_abort()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+
+    def stats(self):
+        """
+        Counters for the status panel.
+
+        Returns:
+            dict: requests, retries, retry_seconds, breaker state, open_seconds
+                  and calls rejected while open
+        """
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "retry_seconds": self.retry_seconds,
+            "breaker_state": self.breaker.state,
+            "open_seconds": self.breaker.total_open_seconds(),
+            "rejected": self.breaker.rejected,
+        }
+
+
+def _pool_limits():
+    import httpx
+    return httpx.Limits(
+        max_connections=LLM_POOL_SIZE,
+        max_keepalive_connections=LLM_POOL_SIZE,
+        keepalive_expiry=60.0,
+    )
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_llm_client(api_key):
+    """
+    Returns the process-wide client manager for an API key.
+
+    Args:
+        api_key (str): Groq API key
+
+    Returns:
+        LLMClientManager: Shared manager (created on first use)
+    """
+    manager = _managers.get(api_key)
+    if manager is None:
+        with _managers_lock:
+            manager = _managers.get(api_key)
+            if manager is None:
+                manager = _managers[api_key] = LLMClientManager(api_key)
+    return manager
+
+
+def get_llm_stats():
+    """Counters of every manager in the process, summed for display."""
+    totals = {"requests": 0, "retries": 0, "retry_seconds": 0.0, "open_seconds": 0.0, "rejected": 0}
+    states = []
+    for manager in list(_managers.values()):
+        stats = manager.stats()
+        for key in totals:
+            totals[key] += stats[key]
+        states.append(stats["breaker_state"])
+    totals["breaker_state"] = "open" if "open" in states else ("half-open" if "half-open" in states else "closed")
+    return totals
@@ -0,0 +1,327 @@
+"""
+Vectorized MCDA Scoring Engine
+==============================
+Scores whole grids of policy options at once. The criterion weights of an
+MCDA_CRITERIA-style dict are compiled once into a read-only weight vector,
+and the Governance Effectiveness Index (GEI) of N options is computed as one
+matrix-vector product over an (N x criteria) array.
+
+Exactness:
+- The product is accumulated criterion by criterion, left to right, which is
+  the same sequence of float operations as calculate_policy_score; a BLAS
+  dot product may sum in a different order and change the last bit
+- Rounding follows Python's round(x, 2) (correctly rounded, half-even), so
+  results are identical to calculate_policy_score, not merely close
+
+Weight Sensitivity:
+- weight_sensitivity() draws weight vectors from a Dirichlet distribution
+  centred on the configured weights and re-scores every option for every
+  draw in one (samples x criteria) @ (criteria x options) product
+- It reports GEI confidence intervals, rank probabilities and pairwise
+  rank-reversal probabilities
+
+Pareto Analysis:
+- non_dominated_sort() splits options into dominance layers over the raw
+  criterion scores (layer 0 is the Pareto frontier) using the efficient
+  non-dominated sort with binary search (ENS-BS) instead of the O(n^2)
+  all-pairs comparison
+"""
+
+import time
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from chanakya_wisdom import MCDA_CRITERIA
+
+# Positional argument names of calculate_policy_score, accepted as DataFrame
+# columns for the default criteria set
+ARGUMENT_NAMES = ("welfare", "economic", "law_order", "political", "implementation")
+
+
+def round_scores(values, decimals=2):
+    """
+    Vectorized equivalent of Python's round(x, decimals).
+
+    np.round scales by 10**decimals before rounding, which can land on the
+    wrong side of a .5 boundary; the few values that sit within float error
+    of a boundary are re-rounded with the built-in round().
+
+    Args:
+        values (np.ndarray): Values to round
+        decimals (int): Number of decimal places
+
+    Returns:
+        np.ndarray: Rounded values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, decimals)
+    scaled = values * 10.0 ** decimals
+    fraction = scaled - np.floor(scaled)
+    ambiguous = np.flatnonzero(np.abs(fraction - 0.5) < 1e-6)
+    if len(ambiguous):
+        flat = rounded.reshape(-1)
+        source = values.reshape(-1)
+        flat[ambiguous] = [round(float(source[i]), decimals) for i in ambiguous]
+    return rounded
+
+
+class MCDAEngine:
+    """
+    Compiled MCDA criteria set.
+
+    Args:
+        criteria (dict): Criterion key -> {"weight": float, ...}, in scoring
+            order (defaults to MCDA_CRITERIA)
+    """
+
+    def __init__(self, criteria=MCDA_CRITERIA):
+        self.criteria = tuple(criteria)
+        self.names = tuple(c.get("name", key) for key, c in criteria.items())
+        self.weights = np.array([c["weight"] for c in criteria.values()], dtype=np.float64)
+        self.weights.flags.writeable = False
+        self._aliases = ARGUMENT_NAMES if criteria is MCDA_CRITERIA else ()
+
+    def __len__(self):
+        return len(self.criteria)
+
+    def as_matrix(self, options):
+        """
+        Coerce options to a float64 (N x criteria) array.
+
+        DataFrames are matched by column name (criterion keys, or the
+        calculate_policy_score argument names for the default criteria);
+        anything else is taken positionally.
+        """
+        if isinstance(options, pd.DataFrame):
+            for columns in (self.criteria, self._aliases):
+                if columns and all(c in options.columns for c in columns):
+                    return options[list(columns)].to_numpy(dtype=np.float64)
+            options = options.to_numpy(dtype=np.float64)
+        matrix = np.atleast_2d(np.asarray(options, dtype=np.float64))
+        if matrix.shape[1] != len(self):
+            raise ValueError(f"Expected {len(self)} criterion scores per option, got {matrix.shape[1]}")
+        return matrix
+
+    def raw_scores(self, options, weights=None):
+        """
+        Unrounded weighted sums.
+
+        Args:
+            options: (N x criteria) array-like or DataFrame
+            weights (np.ndarray): Optional override, either one weight
+                vector or an (N x criteria) array of per-row weights
+
+        Returns:
+            np.ndarray: Weighted score per option
+        """
+        matrix = self.as_matrix(options)
+        weights = self.weights if weights is None else np.asarray(weights, dtype=np.float64)
+        if weights.shape[-1] != len(self):
+            raise ValueError(f"Expected {len(self)} weights, got {weights.shape[-1]}")
+        # Criterion-by-criterion accumulation: same operation order as calculate_policy_score
+        total = matrix[:, 0] * weights[..., 0]
+        for j in range(1, len(self)):
+            total = total + matrix[:, j] * weights[..., j]
+        return total
+
+    def score(self, options, weights=None):
+        """
+        Governance Effectiveness Index for every option, rounded to 2 decimals.
+
+        Args:
+            options: (N x criteria) array-like or DataFrame
+            weights (np.ndarray): Optional weight vector or per-row weights
+
+        Returns:
+            np.ndarray | pd.Series: GEI per option (a Series aligned to the
+                input index when options is a DataFrame)
+        """
+        gei = round_scores(self.raw_scores(options, weights))
+        if isinstance(options, pd.DataFrame):
+            return pd.Series(gei, index=options.index, name="gei")
+        return gei
+
+    def score_one(self, scores):
+        """GEI of a single option as a Python float."""
+        return float(self.score([scores])[0])
+
+
+# Engine for the configured MCDA_CRITERIA, compiled once per process
+MCDA_ENGINE = MCDAEngine()
+
+
+# Up to this many options, ranks are counted from the pairwise comparisons
+# (already needed for reversals) instead of a per-sample argsort
+PAIRWISE_RANK_LIMIT = 16
+
+
+class SensitivityResult(NamedTuple):
+    """Monte Carlo weight-sensitivity summary for N options."""
+    base_scores: np.ndarray       # (N,) GEI under the configured weights
+    mean_scores: np.ndarray       # (N,) mean GEI over the sampled weights
+    ci_low: np.ndarray            # (N,) lower confidence bound of the GEI
+    ci_high: np.ndarray           # (N,) upper confidence bound of the GEI
+    rank_probabilities: np.ndarray  # (N, N) P(option i finishes at rank r)
+    reversal_probabilities: np.ndarray  # (N, N) P(j beats i) where i beats j at base weights, else 0
+    ranking_change_probability: float  # P(the full ranking differs from the base ranking)
+    n_samples: int
+    elapsed_ms: float
+
+
+def sample_weights(base_weights, n_samples, concentration=100.0, seed=0):
+    """
+    Draw weight vectors from Dirichlet(concentration * normalized base_weights).
+
+    The draws average to the normalized base weights; a larger concentration
+    keeps them closer. Samples are rescaled to the total of base_weights.
+    Draws with a fixed seed are cached (they do not depend on the options),
+    so repeated analyses skip the sampling cost.
+
+    Returns:
+        np.ndarray: Read-only (n_samples x criteria) float32 weights
+    """
+    return _sample_weights(tuple(float(w) for w in base_weights), int(n_samples), float(concentration), seed)
+
+
+@lru_cache(maxsize=8)
+def _sample_weights(base_weights, n_samples, concentration, seed):
+    base = np.asarray(base_weights, dtype=np.float64)
+    total = base.sum()
+    rng = np.random.default_rng(seed)
+    alpha = (concentration * base / total).astype(np.float32)
+    gammas = rng.standard_gamma(alpha, size=(n_samples, len(alpha)), dtype=np.float32)
+    weights = gammas * np.float32(total) / gammas.sum(axis=1, keepdims=True)
+    weights.flags.writeable = False
+    return weights
+
+
+def weight_sensitivity(options, n_samples=200_000, concentration=100.0, confidence=0.95,
+                       seed=0, engine=MCDA_ENGINE):
+    """
+    Robustness of the option ranking to the MCDA weights.
+
+    Sampled scores are computed in float32 with every option's samples kept
+    contiguous, so percentiles are one sort per option and pairwise
+    comparisons stream through memory; base_scores stay exact.
+
+    Args:
+        options: (N x criteria) array-like or DataFrame of option scores
+        n_samples (int): Number of sampled weight vectors
+        concentration (float): Dirichlet concentration around the configured weights
+        confidence (float): Width of the GEI confidence interval
+        seed (int): Random seed (None for fresh, uncached draws)
+        engine (MCDAEngine): Criteria set to perturb
+
+    Returns:
+        SensitivityResult: Confidence intervals and rank statistics
+    """
+    started = time.perf_counter()
+    matrix = engine.as_matrix(options)
+    n_options = len(matrix)
+    base = engine.score(matrix)
+
+    weights = sample_weights(engine.weights, n_samples, concentration, seed)
+    scores = matrix.astype(np.float32) @ weights.T  # (options x samples)
+
+    sorted_scores = np.sort(scores, axis=1)
+    tail = (1.0 - confidence) / 2.0
+    low = int(np.floor(tail * (n_samples - 1)))
+    high = int(np.ceil((1.0 - tail) * (n_samples - 1)))
+
+    # Walk every pair in base-ranking order: a "flip" is a sample where the
+    # lower-ranked option beats the higher-ranked one
+    base_order = np.argsort(-engine.raw_scores(matrix), kind='stable')
+    pairwise_ranks = n_options <= PAIRWISE_RANK_LIMIT
+    ranks = np.zeros((n_options, n_samples), dtype=np.int16) if pairwise_ranks else None
+    reversal = np.zeros((n_options, n_options))
+    changed = np.zeros(n_samples, dtype=bool)
+    for a in range(n_options):
+        for b in range(a + 1, n_options):
+            winner, loser = base_order[a], base_order[b]
+            flip = scores[loser] > scores[winner]
+            reversal[winner, loser] = np.count_nonzero(flip) / n_samples
+            changed |= flip
+            if pairwise_ranks:
+                ranks[winner] += flip
+                ranks[loser] += ~flip
+
+    rank_probabilities = np.empty((n_options, n_options))
+    if pairwise_ranks:
+        for option in range(n_options):
+            rank_probabilities[option] = np.bincount(ranks[option], minlength=n_options) / n_samples
+    else:
+        order = np.argsort(-np.ascontiguousarray(scores.T), axis=1)
+        for rank in range(n_options):
+            rank_probabilities[:, rank] = np.bincount(order[:, rank], minlength=n_options) / n_samples
+
+    return SensitivityResult(
+        base_scores=base,
+        mean_scores=scores.mean(axis=1, dtype=np.float64),
+        ci_low=sorted_scores[:, low].astype(np.float64),
+        ci_high=sorted_scores[:, high].astype(np.float64),
+        rank_probabilities=rank_probabilities,
+        reversal_probabilities=reversal,
+        ranking_change_probability=float(np.mean(changed)),
+        n_samples=n_samples,
+        elapsed_ms=(time.perf_counter() - started) * 1000.0,
+    )
+
+
+def non_dominated_sort(options, engine=MCDA_ENGINE):
+    """
+    Dominance layers of the options (all criteria maximized).
+
+    Options are processed in lexicographically descending order, so an
+    option can only be dominated by options already placed. Each one is
+    assigned, by binary search over the existing layers, to the first layer
+    none of whose members dominates it; the check against a layer is a
+    single vectorized comparison.
+
+    Args:
+        options: (N x criteria) array-like or DataFrame of option scores
+        engine (MCDAEngine): Criteria set defining the columns
+
+    Returns:
+        np.ndarray: Layer number per option (0 = Pareto frontier)
+    """
+    matrix = engine.as_matrix(options)
+    if len(matrix) == 0:
+        return np.empty(0, dtype=np.intp)
+    # Identical options always share a layer: sort the distinct profiles only
+    matrix, inverse = np.unique(matrix, axis=0, return_inverse=True)
+    n_options = len(matrix)
+    layers = np.empty(n_options, dtype=np.intp)
+
+    order = np.lexsort(-matrix.T[::-1])
+    fronts = []  # per layer: [members array, count]
+
+    def dominated_by(front, point):
+        members = front[0][:front[1]]
+        return bool(np.any(np.all(members >= point, axis=1) & np.any(members > point, axis=1)))
+
+    for index in order:
+        point = matrix[index]
+        low, high = 0, len(fronts)
+        while low < high:
+            mid = (low + high) // 2
+            if dominated_by(fronts[mid], point):
+                low = mid + 1
+            else:
+                high = mid
+        if low == len(fronts):
+            fronts.append([np.empty((16, matrix.shape[1])), 0])
+        front = fronts[low]
+        if front[1] == len(front[0]):
+            front[0] = np.concatenate([front[0], np.empty_like(front[0])])
+        front[0][front[1]] = point
+        front[1] += 1
+        layers[index] = low
+    return layers[inverse.ravel()]
+
+
+def pareto_frontier(options, engine=MCDA_ENGINE):
+    """Positions of the non-dominated options."""
+    return np.flatnonzero(non_dominated_sort(options, engine) == 0)
@@ -0,0 +1,323 @@
+"""
+Analysis Pipeline
+=================
+The Policy Analysis steps (RAG retrieval -> prompt construction -> LLM
+inference -> report) as plain functions, shared by the Streamlit app and by
+the headless batch runner (batch_run.py). Prompts are assembled by
+prompt_builder (static system message, budgeted user message).
+
+Batch mode:
+- Retrieval for every case runs through rag_retrieval_batch; the ranked
+  candidates of each case are packed into its prompt, and the Saptanga
+  impact of all cases is computed in one vectorized pass
+- LLM calls go through the shared async Groq client, bounded by a semaphore
+- Each report is written as soon as its completion arrives, and a summary
+  line (including the LLM's options ranked by GEI) is appended to
+  index.jsonl in the output directory
+"""
+
+import asyncio
+import csv
+import json
+import re
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from chanakya_wisdom import calculate_policy_score, get_corpus
+from config import PROMPT_CONTEXT_CANDIDATES
+from llm_cache import get_completion_cache, make_cache_key
+from prompt_builder import build_analysis_prompt
+from response_parser import options_from_records, options_to_records, parse_policy_options, rank_policy_options
+from saptanga import LIMBS, saptanga_impact
+
+# --- LLM SETTINGS ---
+MODEL_NAME = "llama-3.3-70b-versatile"
+SAMPLING_PARAMS = {"temperature": 0.4, "max_tokens": 2048, "top_p": 0.8}
+
+# Matches per case whose similarity feeds the Saptanga doctrinal emphasis
+SAPTANGA_TOP_K = 5
+
+# MCDA parameters in calculate_policy_score order, with the Tab 1 slider defaults
+PARAMETER_DEFAULTS = {
+    "welfare": 7,
+    "economic": 6,
+    "law_order": 6,
+    "political": 5,
+    "implementation": 7,
+}
+
+
+class AnalysisCase(NamedTuple):
+    """One problem statement with its MCDA parameter row."""
+    case_id: str
+    problem: str
+    scores: tuple
+
+
+def build_completion_params(prompt):
+    """Chat completion arguments (messages, model, sampling) for a prompt_builder.AnalysisPrompt."""
+    return dict(
+        messages=prompt.messages,
+        model=MODEL_NAME,
+        **SAMPLING_PARAMS,
+    )
+
+
+def format_saptanga_section(limb_scores):
+    """Markdown list of the seven limb impact scores (see saptanga.saptanga_impact)."""
+    lines = [f"- {limb}: {float(score):.1f}/10" for limb, score in zip(LIMBS, limb_scores)]
+    return "## Saptanga Impact Assessment\n" + "\n".join(lines) + "\n\n"
+
+
+def format_citations_section(citations):
+    """Markdown list of the doctrines packed into the prompt, by citation id."""
+    lines = [f"- **[{citation}]** {doctrine['doctrine']} ({doctrine['domain']})" for citation, doctrine in citations]
+    return "## Cited Doctrines\n" + "\n".join(lines) + "\n\n"
+
+
+def format_full_report(problem, doctrine, scores, gei, result, timestamp, limb_scores=None, citations=None):
+    """
+    Render the "Download Full Report" markdown document.
+
+    Args:
+        problem (str): Governance problem statement
+        doctrine (Mapping): Retrieved doctrine row
+        scores (sequence): The five MCDA parameters
+        gei (float): Governance Effectiveness Index
+        result (str): Generated policy analysis
+        timestamp (datetime): Generation time
+        limb_scores (sequence): Optional Saptanga impact scores, in LIMBS order
+        citations (list): Optional (citation id, doctrine row) pairs given to the LLM
+
+    Returns:
+        str: Markdown report
+    """
+    saptanga = format_saptanga_section(limb_scores) if limb_scores is not None else ""
+    cited = format_citations_section(citations) if citations else ""
+    return f"""# Chanakyan Policy Analysis Report
+
+**Generated:** {timestamp.strftime('%Y-%m-%d %H:%M:%S')}
+
+## Problem Statement
+{problem}
+
+## Retrieved Doctrine
+**{doctrine['doctrine']}**
+
+{doctrine['text']}
+
+**Domain:** {doctrine['domain']}
+
+{cited}## Policy Parameters
+- Welfare Impact: {scores[0]}/10
+- Economic Viability: {scores[1]}/10
+- Law & Order: {scores[2]}/10
+- Political Stability: {scores[3]}/10
+- Implementation Feasibility: {scores[4]}/10
+
+**Governance Effectiveness Index:** {gei}/10
+
+{saptanga}## Analysis
+
+{result}
+
+---
+*Generated by Chanakya DSS | RV College of Engineering*
+"""
+
+
+# --- INPUT ---
+
+def _number(value):
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def _case_from_record(record, line_number):
+    problem = (record.get("problem") or "").strip()
+    if not problem:
+        raise ValueError(f"Row {line_number}: 'problem' is empty")
+    scores = tuple(
+        _number(record[name]) if record.get(name) not in (None, "") else default
+        for name, default in PARAMETER_DEFAULTS.items()
+    )
+    case_id = str(record.get("id") or record.get("case_id") or line_number)
+    return AnalysisCase(case_id, problem, scores)
+
+
+def read_cases(path):
+    """
+    Load analysis cases from a CSV or JSONL file.
+
+    Each row needs a 'problem' column; 'id' and the MCDA parameters
+    (welfare, economic, law_order, political, implementation) are optional
+    and default to the Tab 1 slider defaults. Ids (the row number when
+    missing) must be unique.
+
+    Args:
+        path (str | Path): .csv or .jsonl file
+
+    Returns:
+        list[AnalysisCase]: Cases in file order
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            records = list(csv.DictReader(f))
+        else:
+            records = [json.loads(line) for line in f if line.strip()]
+    cases = [_case_from_record(record, n) for n, record in enumerate(records, start=1)]
+    first_rows = {}
+    for n, case in enumerate(cases, start=1):
+        first = first_rows.setdefault(case.case_id, n)
+        if first != n:
+            raise ValueError(f"Row {n}: duplicate id '{case.case_id}' (also row {first})")
+    return cases
+
+
+# --- BATCH EXECUTION ---
+
+def _report_filenames(cases):
+    """
+    Report file name per case: the sanitized case id, with the case's
+    ordinal appended when ids collide after sanitizing or differ only in
+    letter case (case-insensitive file systems).
+    """
+    stems = [re.sub(r'[^A-Za-z0-9_.-]+', '_', case.case_id) for case in cases]
+    counts = Counter(stem.lower() for stem in stems)
+    filenames, taken = [], set()
+    for ordinal, stem in enumerate(stems, start=1):
+        name = stem if counts[stem.lower()] == 1 else f"{stem}-{ordinal}"
+        while name.lower() in taken:
+            name = f"{name}-{ordinal}"
+        taken.add(name.lower())
+        filenames.append(name + ".md")
+    return filenames
+
+
+async def analyze_case(client, prompt, semaphore):
+    """
+    Run LLM inference for one case, consulting the completion cache first.
+
+    Args:
+        client (LLMClientManager): Shared client
+        prompt (AnalysisPrompt): Messages built by build_analysis_prompt
+        semaphore (asyncio.Semaphore): Bound on concurrent requests
+
+    Returns:
+        tuple: (result text, parsed PolicyOption list, cache hit flag)
+    """
+    params = build_completion_params(prompt)
+
+    cache = get_completion_cache()
+    key = make_cache_key(**params)
+    if cache is not None:
+        cached = cache.get_with_records(key)
+        if cached is not None:
+            result, records = cached
+            if records is not None:
+                return result, options_from_records(records), True
+            options = parse_policy_options(result)
+            cache.put(key, result, params['model'], records=options_to_records(options))
+            return result, options, True
+
+    async with semaphore:
+        completion = await client.acreate(**params)
+    result = completion.choices[0].message.content
+    options = parse_policy_options(result)
+    if cache is not None:
+        cache.put(key, result, params['model'], records=options_to_records(options))
+    return result, options, False
+
+
+async def run_batch(cases, output_dir, client, concurrency=8, progress=None):
+    """
+    Analyze many cases with at most `concurrency` LLM calls in flight.
+
+    Reports are written to output_dir/<case id>.md as each call finishes
+    (see _report_filenames for ids that map to the same file), and one JSON
+    summary line per case is appended to output_dir/index.jsonl.
+    Failed cases are recorded with their error and do not stop the batch.
+
+    Args:
+        cases (list[AnalysisCase]): Cases to analyze
+        output_dir (str | Path): Report directory (created if missing)
+        client (LLMClientManager): Shared client (see llm_client.get_llm_client)
+        concurrency (int): Maximum simultaneous LLM requests
+        progress (callable): Optional callback(summary dict) per finished case
+
+    Returns:
+        dict: Counts of completed, cached and failed cases
+    """
+    # Retrieval (scikit-learn, scipy) is imported on first use: the app imports
+    # this module for the prompt builders and should not pay for it at startup
+    from scipy import sparse
+    from rag_engine import rag_retrieval_batch
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    semaphore = asyncio.Semaphore(concurrency)
+    candidates, rows, positions, similarities = [], [], [], []
+    top_k = max(SAPTANGA_TOP_K, PROMPT_CONTEXT_CANDIDATES)
+    for row, matches in enumerate(rag_retrieval_batch((c.problem for c in cases), top_k=top_k)):
+        candidates.append(matches)
+        for match in matches[:SAPTANGA_TOP_K]:
+            rows.append(row)
+            positions.append(match.doctrine.name)  # corpus rows are indexed by storage position
+            similarities.append(match.score)
+    # Saptanga scores for every case in one pass, from the top matches' similarity
+    similarity = sparse.csr_matrix((similarities, (rows, positions)), shape=(len(cases), len(get_corpus().store)))
+    limb_scores = saptanga_impact(np.array([c.scores for c in cases], dtype=np.float64).reshape(-1, 5), similarity)
+
+    async def process(case, matches, limbs, filename):
+        # Any failure (prompt, LLM, report file, ranking) is recorded for this case only
+        try:
+            return await analyze_and_report(case, matches, limbs, filename)
+        except Exception as e:
+            return {"id": case.case_id, "status": "error", "error": str(e)}
+
+    async def analyze_and_report(case, matches, limbs, filename):
+        doctrine = matches[0].doctrine
+        gei = calculate_policy_score(*case.scores)
+        prompt = build_analysis_prompt(case.problem, matches, case.scores, gei)
+        citations = [(entry.citation, entry.doctrine) for entry in prompt.context.entries]
+        result, options, cached = await analyze_case(client, prompt, semaphore)
+        report = format_full_report(case.problem, doctrine, case.scores, gei, result, datetime.now(), limbs,
+                                    citations)
+        report_path = output_dir / filename
+        report_path.write_text(report, encoding="utf-8")
+        ranked = rank_policy_options(options, case.scores[2], case.scores[3])
+        return {
+            "id": case.case_id,
+            "status": "ok",
+            "cached": cached,
+            "doctrine": doctrine['doctrine'],
+            "citations": [citation for citation, _ in citations],
+            "gei": gei,
+            "report": report_path.name,
+            "options": ranked[["Option", "GEI", "Risk", "Timeline"]].to_dict(orient="records"),
+            "saptanga": dict(zip(LIMBS, np.round(limbs, 2).tolist())),
+        }
+
+    totals = {"completed": 0, "cached": 0, "failed": 0}
+    tasks = [
+        asyncio.ensure_future(process(case, matches, limbs, filename))
+        for case, matches, limbs, filename in zip(cases, candidates, limb_scores, _report_filenames(cases))
+    ]
+    with open(output_dir / "index.jsonl", "a", encoding="utf-8") as index:
+        for finished in asyncio.as_completed(tasks):
+            summary = await finished
+            index.write(json.dumps(summary, ensure_ascii=False) + "\n")
+            index.flush()
+            if summary["status"] == "ok":
+                totals["completed"] += 1
+                totals["cached"] += summary["cached"]
+            else:
+                totals["failed"] += 1
+            if progress is not None:
+                progress(summary)
+    return totals
@@ -0,0 +1,260 @@
+"""
+Prompt Builder
+==============
+Assembles the chat messages of a Policy Analysis under a token budget.
+
+Layout:
+- System message: SYSTEM_INSTRUCTIONS, byte-identical for every request, so
+  a provider-side or local prefix cache can reuse its processing
+- User message: the packed doctrine context (RETRIEVED_CONTEXT_TEMPLATE),
+  the problem statement and the policy parameters
+
+Token counting:
+- No model tokenizer is bundled, so count_tokens() estimates the count of a
+  BPE tokenizer locally from a regex split: short words are one token, long
+  words one per ~5 letters, digits in groups of three, punctuation runs in
+  pairs and non-Latin script one per character
+- The estimate is deliberately on the high side (about 10-30% above
+  Llama 3 / cl100k counts for English), so text that fits the budget also
+  fits the model
+
+Context packing:
+- pack_context() fills the context budget from the ranked retrieval
+  results: the best match always goes in, then the other candidates by
+  relevance score per token, at most one doctrine per domain
+- Each packed doctrine carries a citation id ([D<doctrine id>]) that the
+  analysis is asked to cite
+- Work is proportional to the retrieved candidates
+  (CHANAKYA_PROMPT_CONTEXT_CANDIDATES), not to the corpus size
+
+Budget:
+- The problem statement and the packed context are each capped
+  (CHANAKYA_PROMPT_PROBLEM_TOKENS, CHANAKYA_PROMPT_CONTEXT_TOKENS); text
+  over its cap is cut at a sentence or word boundary and marked with " [...]"
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+from chanakya_wisdom import DOCTRINE_CONTEXT_TEMPLATE, RETRIEVED_CONTEXT_TEMPLATE, SYSTEM_INSTRUCTIONS
+from config import PROMPT_CONTEXT_TOKENS, PROMPT_PROBLEM_TOKENS
+
+TOKEN_PATTERN = re.compile(
+    r'(?P<word>[A-Za-z]+)'
+    r'|(?P<digits>\d+)'
+    r'|(?P<script>[^\x00-\x7f]+)'
+    r'|(?P<newline>\s*\n\s*)'
+    r'|(?P<punct>[^\sA-Za-z\d]+)'
+)
+# Letters per token in long words, digits per token
+WORD_CHARS = 5
+DIGIT_CHARS = 3
+# Marker appended to text cut to fit its budget
+TRUNCATION_MARKER = " [...]"
+# Per-message overhead of the chat template (role header and separators)
+MESSAGE_OVERHEAD = 4
+
+
+def _token_cost(match):
+    kind, text = match.lastgroup, match.group()
+    if kind == "word":
+        return math.ceil(len(text) / WORD_CHARS)
+    if kind == "digits":
+        return math.ceil(len(text) / DIGIT_CHARS)
+    if kind == "script":
+        return len(text)
+    if kind == "newline":
+        return 1
+    return math.ceil(len(text) / 2)
+
+
+def count_tokens(text):
+    """
+    Estimated token count of a text (see module docstring).
+
+    Args:
+        text (str): Any text
+
+    Returns:
+        int: Estimated number of tokens
+    """
+    return sum(_token_cost(match) for match in TOKEN_PATTERN.finditer(text))
+
+
+@lru_cache(maxsize=4096)
+def _cached_count(text):
+    return count_tokens(text)
+
+
+def count_message_tokens(messages):
+    """Estimated input tokens of a list of chat messages, including template overhead."""
+    # Only the (static) system message is worth memoizing
+    return sum(
+        (_cached_count if m["role"] == "system" else count_tokens)(m["content"]) + MESSAGE_OVERHEAD
+        for m in messages
+    )
+
+
+def truncate_to_tokens(text, max_tokens):
+    """
+    Cut text to at most max_tokens (estimated), marker included.
+
+    The cut falls at the end of the last whole sentence that fits when that
+    keeps at least half of the allowance, otherwise at the last whole word.
+
+    Args:
+        text (str): Text to shorten
+        max_tokens (int): Token allowance
+
+    Returns:
+        tuple: (text, truncated flag)
+    """
+    if count_tokens(text) <= max_tokens:
+        return text, False
+    allowance = max_tokens - count_tokens(TRUNCATION_MARKER)
+    used = 0
+    end = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        used += _token_cost(match)
+        if used > allowance:
+            break
+        end = match.end()
+    kept = text[:end]
+    sentence_end = max(kept.rfind(". "), kept.rfind(".\n"), kept.rfind("? "), kept.rfind("! "))
+    if sentence_end >= 0 and count_tokens(kept[:sentence_end + 1]) >= allowance / 2:
+        kept = kept[:sentence_end + 1]
+    return kept.rstrip() + TRUNCATION_MARKER, True
+
+
+def citation_id(doctrine):
+    """Citation id of a doctrine row in the prompt and the report, e.g. "D3"."""
+    return f"D{doctrine['id']}"
+
+
+def render_doctrine(doctrine, text=None):
+    """One doctrine entry of the prompt context (DOCTRINE_CONTEXT_TEMPLATE)."""
+    return DOCTRINE_CONTEXT_TEMPLATE.format(
+        citation=citation_id(doctrine),
+        doctrine=doctrine['doctrine'],
+        domain=doctrine['domain'],
+        weight=doctrine['policy_weight'],
+        text=doctrine['text'] if text is None else text,
+    )
+
+
+class ContextEntry(NamedTuple):
+    """One doctrine selected for the prompt."""
+    citation: str
+    doctrine: object  # corpus row (Mapping)
+    score: float
+    text: str  # rendered entry
+    tokens: int
+
+
+class PackedContext(NamedTuple):
+    """Doctrines selected for the prompt, most relevant first."""
+    entries: tuple
+    tokens: int
+    truncated: bool  # the best match had to be shortened to fit
+
+    def render(self):
+        """The context block of the user message."""
+        return RETRIEVED_CONTEXT_TEMPLATE.format(retrieved_context="".join(e.text for e in self.entries))
+
+
+def pack_context(matches, max_tokens=PROMPT_CONTEXT_TOKENS):
+    """
+    Select retrieved doctrines for the prompt within a token budget.
+
+    The best match is always included (its text shortened when it alone
+    exceeds the budget). The other candidates with a positive score are
+    taken greedily by score per token, skipping any whose domain is
+    already represented or that no longer fit.
+
+    Args:
+        matches (list[DoctrineMatch]): Ranked retrieval results, best first
+        max_tokens (int): Token budget of the whole context block
+
+    Returns:
+        PackedContext: Selected doctrines in relevance order
+    """
+    if not matches:
+        return PackedContext((), 0, False)
+    remaining = max_tokens - _cached_count(RETRIEVED_CONTEXT_TEMPLATE.format(retrieved_context=""))
+
+    best, best_score = matches[0]
+    text = render_doctrine(best)
+    tokens = _cached_count(text)
+    truncated = False
+    if tokens > remaining:
+        allowance = remaining - (tokens - _cached_count(best['text']))
+        text = render_doctrine(best, truncate_to_tokens(best['text'], max(allowance, 1))[0])
+        tokens = count_tokens(text)
+        truncated = True
+    selected = {0: ContextEntry(citation_id(best), best, float(best_score), text, tokens)}
+    domains = {best['domain']}
+    remaining -= tokens
+
+    candidates = []
+    for rank, (doctrine, score) in enumerate(matches[1:], start=1):
+        if score > 0 and doctrine['domain'] not in domains:
+            text = render_doctrine(doctrine)
+            tokens = _cached_count(text)
+            candidates.append((-score / tokens, rank, doctrine, float(score), text, tokens))
+    for _, rank, doctrine, score, text, tokens in sorted(candidates, key=lambda c: (c[0], c[1])):
+        if tokens <= remaining and doctrine['domain'] not in domains:
+            selected[rank] = ContextEntry(citation_id(doctrine), doctrine, score, text, tokens)
+            domains.add(doctrine['domain'])
+            remaining -= tokens
+
+    entries = tuple(selected[rank] for rank in sorted(selected))
+    return PackedContext(entries, max_tokens - remaining, truncated)
+
+
+class AnalysisPrompt(NamedTuple):
+    """Chat messages of one analysis with their token accounting."""
+    messages: list
+    input_tokens: int
+    truncated: tuple  # parts cut to fit the budget: "problem", "context"
+    context: PackedContext
+
+
+def build_analysis_prompt(problem, matches, scores, gei,
+                          problem_tokens=PROMPT_PROBLEM_TOKENS, context_tokens=PROMPT_CONTEXT_TOKENS):
+    """
+    Build the system and user messages of a Policy Analysis.
+
+    Args:
+        problem (str): Governance problem statement
+        matches (list[DoctrineMatch]): Ranked retrieval results, best first
+        scores (sequence): Welfare, economic, law & order, political, implementation
+        gei (float): Governance Effectiveness Index for the scores
+        problem_tokens (int): Token cap of the problem statement
+        context_tokens (int): Token budget of the packed doctrine context
+
+    Returns:
+        AnalysisPrompt: Messages, estimated input tokens, truncated parts
+            and the packed context
+    """
+    welfare, economic, law_order, political, implementation = scores
+    context = pack_context(matches, context_tokens)
+    problem, problem_cut = truncate_to_tokens(problem.strip(), problem_tokens)
+
+    request = context.render()
+    request += f"\n**USER PROBLEM:**\n{problem}\n\n"
+    request += f"**POLICY PARAMETERS:**\n"
+    request += f"- Welfare Priority: {welfare}/10\n"
+    request += f"- Economic Constraint: {economic}/10\n"
+    request += f"- Enforcement Capability: {law_order}/10\n"
+    request += f"- Political Stability: {political}/10\n"
+    request += f"- Implementation Speed: {implementation}/10\n"
+    request += f"- Governance Effectiveness Index (GEI): {gei}/10\n"
+
+    messages = [
+        {"role": "system", "content": SYSTEM_INSTRUCTIONS},
+        {"role": "user", "content": request},
+    ]
+    truncated = tuple(part for part, cut in (("problem", problem_cut), ("context", context.truncated)) if cut)
+    return AnalysisPrompt(messages, count_message_tokens(messages), truncated, context)
@@ -0,0 +1,1007 @@
+"""
+Doctrine Retrieval Engine
+=========================
+This module holds the retrieval index used by the RAG pipeline. The TF-IDF
+vectorizer is fitted once over the doctrine keywords and the resulting
+L2-normalized sparse matrix is kept for the lifetime of the process, so a
+query only has to be transformed and multiplied against the prebuilt matrix.
+
+Research Context:
+- Vectorization: TF-IDF (unigrams + bigrams, 100 features)
+- Similarity: Cosine similarity as a sparse dot product of unit vectors
+- Lifetime: One index per process, shared by every Streamlit session
+- Batch Mode: Query blocks scored with one sparse matrix product each
+
+Engines (CHANAKYA_RAG_ENGINE):
+- tfidf: Sparse matrix product against the full doctrine matrix (reference)
+- inverted: Term postings with MaxScore-style top-k pruning
+- hybrid: BM25 over doctrine text + keywords and the TF-IDF channel,
+  combined by reciprocal-rank fusion
+- lsa: Dense latent semantic (TruncatedSVD) embeddings searched with one
+  matrix-vector product; the index is persisted as memory-mapped .npy files
+- incremental: BM25 over hashed terms in LSM-style segments; doctrines
+  added to the corpus store are indexed on their own instead of
+  rebuilding the index
+
+Corpus changes:
+- Engines are built for one corpus snapshot (engine.corpus) and only ever
+  return its current doctrines; get_retrieval_engine() hands out the
+  engine for the latest snapshot
+- Deleted and replaced rows keep their storage position; the static
+  engines index them as empty documents
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import Counter
+from itertools import islice
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer, TfidfVectorizer
+
+from chanakya_wisdom import get_corpus
+from config import INCREMENTAL_MERGE_FANOUT, LSA_COMPONENTS, LSA_INDEX_PATH, RAG_ENGINE
+
+
+class DoctrineMatch(NamedTuple):
+    """A single ranked retrieval result."""
+    doctrine: pd.Series
+    score: float
+
+
+def top_k_indices(scores, top_k):
+    """
+    Positions of the top_k highest scores, best first.
+
+    Uses partial selection (argpartition) so only the k winners are sorted.
+
+    Args:
+        scores (np.ndarray): Score per doctrine
+        top_k (int): Number of positions to return
+
+    Returns:
+        np.ndarray: Positions ordered by descending score
+    """
+    top_k = min(top_k, len(scores))
+    if top_k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if top_k < len(scores):
+        candidates = np.argpartition(scores, -top_k)[-top_k:]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+def top_k_rows(scores, top_k):
+    """
+    Row-wise version of top_k_indices for a (queries x doctrines) block.
+
+    Args:
+        scores (np.ndarray): 2-D score matrix
+        top_k (int): Number of positions to keep per row
+
+    Returns:
+        tuple: (positions, scores), both shaped (queries, top_k), best first
+    """
+    n_rows, n_docs = scores.shape
+    top_k = min(top_k, n_docs)
+    if top_k <= 0:
+        return np.empty((n_rows, 0), dtype=np.intp), np.empty((n_rows, 0), dtype=scores.dtype)
+    if top_k < n_docs:
+        candidates = np.argpartition(scores, -top_k, axis=1)[:, -top_k:]
+    else:
+        candidates = np.broadcast_to(np.arange(n_docs), (n_rows, n_docs))
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
+
+
+def _chunked(queries, size):
+    """Yield lists of at most size queries from any iterable (list, Series, generator)."""
+    iterator = iter(queries)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class RetrievalEngine:
+    """
+    Common interface of the retrieval engines behind rag_retrieval.
+
+    Subclasses implement similarity(); the remaining methods have generic
+    implementations that an engine may override with a faster path.
+    Scores cover every storage position of the corpus snapshot; rankings
+    only ever contain its current doctrines.
+    """
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    def __len__(self):
+        return len(self.corpus.store)
+
+    def _top_k(self, scores, top_k):
+        """top_k_indices over the current doctrines only."""
+        if len(self.corpus.deleted):
+            scores = scores.copy()
+            scores[self.corpus.deleted] = -np.inf
+        return top_k_indices(scores, min(top_k, len(self.corpus)))
+
+    def _top_k_rows(self, scores, top_k):
+        """top_k_rows over the current doctrines only (scores may be modified)."""
+        if len(self.corpus.deleted):
+            scores[:, self.corpus.deleted] = -np.inf
+        return top_k_rows(scores, min(top_k, len(self.corpus)))
+
+    def similarity(self, query):
+        """
+        Similarity between a query and every doctrine.
+
+        Args:
+            query (str): Governance problem statement
+
+        Returns:
+            np.ndarray: Similarity score per doctrine, in corpus order
+        """
+        raise NotImplementedError
+
+    def search_positions(self, query, top_k):
+        """
+        Top-k corpus positions for one query.
+
+        Args:
+            query (str): Governance problem statement
+            top_k (int): Number of doctrines to return
+
+        Returns:
+            tuple: (positions, scores) arrays, best first
+        """
+        scores = self.similarity(query)
+        positions = self._top_k(scores, top_k)
+        return positions, scores[positions]
+
+    def rank(self, scores, top_k):
+        """
+        Turn a similarity vector into a ranked list of doctrines.
+
+        Args:
+            scores (np.ndarray): Output of similarity()
+            top_k (int): Number of doctrines to return
+
+        Returns:
+            list[DoctrineMatch]: Up to top_k matches, best first
+        """
+        return [DoctrineMatch(self.corpus.row(i), float(scores[i])) for i in self._top_k(scores, top_k)]
+
+    def search(self, query, top_k):
+        """
+        Ranked doctrines for one query.
+
+        Returns:
+            list[DoctrineMatch]: Up to top_k matches, best first
+        """
+        positions, scores = self.search_positions(query, top_k)
+        return [DoctrineMatch(self.corpus.row(i), float(score)) for i, score in zip(positions, scores)]
+
+    def search_batch(self, queries, top_k, chunk_size=1024):
+        """
+        Score many queries, yielding one block of results at a time.
+
+        Args:
+            queries (iterable): Problem statements (list, pd.Series or generator)
+            top_k (int): Number of doctrines to keep per query
+            chunk_size (int): Queries per block
+
+        Yields:
+            tuple: (positions, scores) arrays shaped (block_size, top_k)
+        """
+        for chunk in _chunked(queries, chunk_size):
+            results = [self.search_positions(query, top_k) for query in chunk]
+            yield np.array([r[0] for r in results]), np.array([r[1] for r in results])
+
+
+class DoctrineIndex(RetrievalEngine):
+    """
+    Persistent TF-IDF index over the doctrine corpus.
+
+    The vectorizer normalizes every row to unit L2 length, so the cosine
+    similarity between a query and all doctrines is a single sparse
+    matrix-vector product. This is the reference engine: other engines are
+    checked against its results.
+    """
+
+    def __init__(self, corpus):
+        super().__init__(corpus)
+        self.vectorizer = TfidfVectorizer(
+            max_features=100,
+            stop_words='english',
+            ngram_range=(1, 2)
+        )
+        # Rows are L2-normalized by TfidfVectorizer (norm='l2')
+        self.doctrine_matrix = self.vectorizer.fit_transform(corpus.store.iter_current_text('keywords')).tocsr()
+
+    def similarity(self, query):
+        """Cosine similarity between a query and every doctrine."""
+        query_vector = self.vectorizer.transform([query])
+        return (self.doctrine_matrix @ query_vector.T).toarray().ravel()
+
+    def search_batch(self, queries, top_k, chunk_size=1024, max_block_cells=2 ** 24):
+        """
+        Score many queries against the corpus, one block at a time.
+
+        Each block is vectorized with a single transform() call and scored
+        with a single sparse matrix product. Blocks are sized so the dense
+        (queries x doctrines) score block never exceeds max_block_cells.
+
+        Args:
+            queries (iterable): Problem statements (list, pd.Series or generator)
+            top_k (int): Number of doctrines to keep per query
+            chunk_size (int): Upper bound on queries per block
+            max_block_cells (int): Upper bound on the dense score block size
+
+        Yields:
+            tuple: (positions, scores) arrays shaped (block_size, top_k)
+        """
+        block_size = max(1, min(chunk_size, max_block_cells // max(len(self), 1)))
+        for chunk in _chunked(queries, block_size):
+            query_matrix = self.vectorizer.transform(chunk)
+            scores = (query_matrix @ self.doctrine_matrix.T).toarray()
+            yield self._top_k_rows(scores, top_k)
+
+
+class InvertedIndexEngine(RetrievalEngine):
+    """
+    Term -> postings index over the reference TF-IDF weights.
+
+    Every term keeps its posting list (sorted doctrine positions plus
+    weights already divided by the precomputed document norm) and its
+    maximum weight. A query only touches the postings of its own terms, and
+    top-k search applies MaxScore-style pruning: terms are processed in
+    decreasing order of their score upper bound, and once the remaining
+    terms cannot lift an unseen doctrine above the current k-th score, only
+    the surviving candidates are updated (by binary search into the
+    remaining postings). Scores are kept only for the doctrines that share
+    a term with the query, so a search never allocates per-corpus arrays.
+    Results match DoctrineIndex up to float rounding.
+    """
+
+    def __init__(self, reference):
+        super().__init__(reference.corpus)
+        self.vectorizer = reference.vectorizer
+        matrix = reference.doctrine_matrix
+        # Per-document norms (1.0 for the L2-normalized reference matrix, but
+        # kept explicit so raw weights can be indexed the same way)
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        postings = matrix.multiply(1.0 / norms[:, None]).tocsc()
+        postings.sort_indices()
+        self.doc_norms = norms
+        self._indptr = postings.indptr
+        self._docs = postings.indices
+        self._weights = postings.data
+        self.max_weight = np.zeros(postings.shape[1])
+        nonempty = np.diff(self._indptr) > 0
+        self.max_weight[nonempty] = np.maximum.reduceat(self._weights, self._indptr[:-1][nonempty])
+
+    def _postings(self, term):
+        start, stop = self._indptr[term], self._indptr[term + 1]
+        return self._docs[start:stop], self._weights[start:stop]
+
+    def _query_terms(self, query):
+        query_vector = self.vectorizer.transform([query])
+        return query_vector.indices, query_vector.data
+
+    def similarity(self, query):
+        """Exhaustive term-at-a-time scoring (no pruning)."""
+        scores = np.zeros(len(self))
+        for term, weight in zip(*self._query_terms(query)):
+            docs, weights = self._postings(term)
+            scores[docs] += weight * weights
+        return scores
+
+    def search_positions(self, query, top_k):
+        """Top-k with MaxScore-style early termination."""
+        top_k = min(top_k, len(self.corpus))
+        terms, query_weights = self._query_terms(query)
+        if top_k <= 0 or len(terms) == 0:
+            return super().search_positions(query, top_k)
+
+        upper_bounds = query_weights * self.max_weight[terms]
+        order = np.argsort(-upper_bounds, kind='stable')
+        terms, query_weights = terms[order], query_weights[order]
+        # remaining[i] = best score still obtainable from terms i, i+1, ...
+        remaining = np.concatenate([np.cumsum(upper_bounds[order][::-1])[::-1], [0.0]])
+
+        postings = [self._postings(term) for term in terms]
+        # Pool of every doctrine sharing a term with the query, collected
+        # once. The posting lists are sorted runs, so a stable (merging)
+        # sort of their concatenation is cheap; slots maps each posting to
+        # its doctrine's place in the pool, where scores are accumulated
+        docs = np.concatenate([term_docs for term_docs, _ in postings])
+        order = np.argsort(docs, kind='stable')
+        first = np.diff(docs[order], prepend=-1) != 0
+        pool = docs[order][first]
+        if len(pool) < top_k:
+            # Fewer matching doctrines than k: pad with zero-score positions
+            return super().search_positions(query, top_k)
+        slots = np.empty(len(docs), dtype=np.intp)
+        slots[order] = np.cumsum(first) - 1
+        bounds = np.cumsum([0] + [len(term_docs) for term_docs, _ in postings])
+
+        scores = np.zeros(len(pool))
+        candidates = None
+        for i, ((_, weights), weight) in enumerate(zip(postings, query_weights)):
+            term_slots = slots[bounds[i]:bounds[i + 1]]
+            if candidates is None:
+                scores[term_slots] += weight * weights
+                # Doctrines not reached yet score 0, below any positive threshold
+                threshold = np.partition(scores, -top_k)[-top_k]
+                if remaining[i + 1] < threshold:
+                    # No unseen doctrine can reach the top-k any more
+                    candidates = np.flatnonzero(scores + remaining[i + 1] >= threshold)
+            else:
+                # Both sorted: binary search the candidates in the term's slots
+                found = np.searchsorted(term_slots, candidates)
+                hit = found < len(term_slots)
+                hit[hit] = term_slots[found[hit]] == candidates[hit]
+                scores[candidates[hit]] += weight * weights[found[hit]]
+                threshold = np.partition(scores[candidates], -top_k)[-top_k]
+                candidates = candidates[scores[candidates] + remaining[i + 1] >= threshold]
+
+        if candidates is not None:
+            pool, scores = pool[candidates], scores[candidates]
+        best = top_k_indices(scores, top_k)
+        return pool[best], scores[best]
+
+
+# --- HYBRID RETRIEVAL ---
+BM25_K1 = 1.5
+BM25_B = 0.75
+# Reciprocal-rank fusion constant: larger values flatten the rank discount
+RRF_K = 60
+
+
+class TermPostings:
+    """
+    Term-major view of a (doctrines x terms) weight matrix with positive
+    weights.
+
+    Scoring a query only reads the posting lists of its own terms, so the
+    cost is linear in the postings touched.
+    """
+
+    def __init__(self, matrix):
+        postings = sparse.csc_matrix(matrix, dtype=np.float64)
+        postings.sort_indices()
+        self.n_docs = postings.shape[0]
+        self.indptr = postings.indptr
+        self.docs = postings.indices
+        self.weights = postings.data
+
+    def scores(self, terms, query_weights):
+        """Weighted sum of the query terms' postings (dense score per doctrine)."""
+        scores = np.zeros(self.n_docs)
+        for term, weight in zip(terms, query_weights):
+            start, stop = self.indptr[term], self.indptr[term + 1]
+            scores[self.docs[start:stop]] += weight * self.weights[start:stop]
+        return scores
+
+
+def _query_term_counts(analyzer, vocabulary, query):
+    """Vocabulary ids and counts of a query's terms, tokenized like the index (no sklearn transform)."""
+    counts = Counter(vocabulary[token] for token in analyzer(query) if token in vocabulary)
+    return (np.fromiter(counts.keys(), dtype=np.intp, count=len(counts)),
+            np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))
+
+
+class BM25Index:
+    """
+    Okapi BM25 over doctrine text plus keywords.
+
+    Document lengths, average length and IDF are computed once, and the
+    full BM25 weight of every (term, doctrine) posting is precomputed, so
+    a query is a sum of posting lists.
+
+    Args:
+        corpus (DoctrineCorpus): Corpus to index
+        k1 (float): Term-frequency saturation
+        b (float): Document-length normalization
+    """
+
+    def __init__(self, corpus, k1=BM25_K1, b=BM25_B):
+        store = corpus.store
+        documents = (f"{text} {keywords}"
+                     for text, keywords in zip(store.iter_current_text('text'), store.iter_current_text('keywords')))
+        vectorizer = CountVectorizer(stop_words='english')
+        counts = vectorizer.fit_transform(documents).tocsr().astype(np.float64)
+        n_docs = len(corpus)
+
+        self.doc_lengths = np.asarray(counts.sum(axis=1)).ravel()
+        self.avg_length = float(self.doc_lengths[corpus.positions].mean()) if n_docs else 0.0
+        doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+        self.idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+        length_norm = k1 * (1.0 - b + b * self.doc_lengths / max(self.avg_length, 1e-9))
+        rows = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+        tf = counts.data
+        counts.data = self.idf[counts.indices] * tf * (k1 + 1.0) / (tf + length_norm[rows])
+        self.postings = TermPostings(counts)
+        self._analyzer = vectorizer.build_analyzer()
+        self._vocabulary = vectorizer.vocabulary_
+
+    def scores(self, query):
+        """BM25 score per doctrine (query terms counted once)."""
+        terms, _ = _query_term_counts(self._analyzer, self._vocabulary, query)
+        return self.postings.scores(terms, np.ones(len(terms)))
+
+
+def reciprocal_rank_fusion(channels, n_docs, k=RRF_K):
+    """
+    Fuse several rankings by reciprocal rank.
+
+    A doctrine ranked r in a channel (among that channel's positive scores)
+    gains 1 / (k + r) from it. The sum is rescaled so that rank 1 in every
+    channel scores 1.0; doctrines no channel matched score 0.
+
+    Args:
+        channels (list[np.ndarray]): Score per doctrine, one array per channel
+        n_docs (int): Corpus size
+        k (int): RRF constant
+
+    Returns:
+        np.ndarray: Fused score per doctrine
+    """
+    fused = np.zeros(n_docs)
+    for scores in channels:
+        matched = np.flatnonzero(scores > 0)
+        ranked = matched[np.argsort(-scores[matched], kind='stable')]
+        fused[ranked] += 1.0 / (k + np.arange(1, len(ranked) + 1))
+    return fused * ((k + 1) / max(len(channels), 1))
+
+
+class HybridEngine(RetrievalEngine):
+    """
+    BM25 + TF-IDF retrieval with reciprocal-rank fusion.
+
+    The BM25 channel indexes the full doctrine text and keywords (the
+    reference TF-IDF only sees the 100 strongest keyword features); the
+    TF-IDF channel scores the reference matrix through term postings,
+    with the query weighted by the reference vectorizer's IDF. Queries are
+    tokenized with the vectorizers' analyzers directly, so no per-query
+    sklearn transform is needed.
+    """
+
+    def __init__(self, reference, k1=BM25_K1, b=BM25_B, rrf_k=RRF_K):
+        super().__init__(reference.corpus)
+        self.rrf_k = rrf_k
+        self.bm25 = BM25Index(reference.corpus, k1, b)
+        self.tfidf = TermPostings(reference.doctrine_matrix)
+        self._tfidf_analyzer = reference.vectorizer.build_analyzer()
+        self._tfidf_vocabulary = reference.vectorizer.vocabulary_
+        self._tfidf_idf = reference.vectorizer.idf_
+
+    def channel_scores(self, query):
+        """
+        Per-channel scores of a query.
+
+        Returns:
+            list[np.ndarray]: [BM25 scores, TF-IDF scores]
+        """
+        terms, counts = _query_term_counts(self._tfidf_analyzer, self._tfidf_vocabulary, query)
+        # Unnormalized query vector: the ranking is the same as for cosine similarity
+        tfidf = self.tfidf.scores(terms, counts * self._tfidf_idf[terms])
+        return [self.bm25.scores(query), tfidf]
+
+    def similarity(self, query):
+        """Fused reciprocal-rank score per doctrine (1.0 = first in both channels)."""
+        return reciprocal_rank_fusion(self.channel_scores(query), len(self), self.rrf_k)
+
+
+# --- DENSE (LSA) RETRIEVAL ---
+# Fixed so that a saved index can rebuild the query analyzer
+LSA_VECTORIZER_PARAMS = {"stop_words": "english", "sublinear_tf": True}
+LSA_FILES = ("embeddings", "term_projection", "idf")
+
+
+def lsa_fingerprint(corpus, components):
+    """Content hash identifying the corpus and settings an LSA index was built from."""
+    digest = hashlib.sha256(repr((components, sorted(LSA_VECTORIZER_PARAMS.items()))).encode())
+    digest.update(np.ascontiguousarray(corpus.store.ids(), dtype=np.int64).tobytes())
+    for column in ("text", "keywords"):
+        for value in corpus.store.iter_current_text(column):
+            digest.update(value.encode("utf-8"))
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _is_fingerprint(name):
+    """Whether a file name has the form of an lsa_fingerprint."""
+    return len(name) == 64 and set(name) <= set("0123456789abcdef")
+
+
+class LSAEngine(RetrievalEngine):
+    """
+    Dense retrieval in a latent semantic analysis (LSA) space.
+
+    A TF-IDF matrix over doctrine text plus keywords (full vocabulary,
+    sublinear TF) is projected once onto its top singular vectors with
+    TruncatedSVD. Doctrines that share co-occurring vocabulary end up close
+    together even when a query uses only some of their words.
+
+    Stored arrays (float32, C-contiguous):
+    - embeddings: (doctrines x dims), rows L2-normalized
+    - term_projection: (terms x dims), the SVD components per term
+    A query's TF-IDF weights select rows of term_projection (no sklearn
+    transform); the normalized sum is scored against every doctrine with
+    one BLAS matrix-vector product, and top-k uses argpartition.
+
+    With `directory` set, the index is saved as .npy files plus
+    vocabulary.json and meta.json in a subdirectory named after the corpus
+    fingerprint, and later builds over the same corpus open the arrays
+    with mmap_mode='r' instead of refitting. Saved files are never
+    rewritten: an index for a changed corpus goes to a new subdirectory,
+    so engines (in this or another process) that have the old arrays
+    mapped keep reading them unchanged. A subdirectory that fails to load
+    is replaced, and after each save the indexes of other corpus versions
+    are deleted (a mapped file stays readable until it is closed).
+
+    Args:
+        corpus (DoctrineCorpus): Corpus to index
+        components (int): Latent dimensions (capped by the corpus size)
+        directory (str | Path): Optional index directory
+    """
+
+    def __init__(self, corpus, components=LSA_COMPONENTS, directory=None):
+        super().__init__(corpus)
+        self._analyzer = TfidfVectorizer(**LSA_VECTORIZER_PARAMS).build_analyzer()
+        directory = Path(directory) if directory else None
+        fingerprint = lsa_fingerprint(corpus, components) if directory else None
+        if directory is None or not self._load(directory / fingerprint, fingerprint):
+            self._fit(components)
+            if directory is not None:
+                self._save(directory, fingerprint)
+
+    def _fit(self, components):
+        from sklearn.decomposition import TruncatedSVD
+
+        store = self.corpus.store
+        documents = (f"{text} {keywords}"
+                     for text, keywords in zip(store.iter_current_text('text'), store.iter_current_text('keywords')))
+        vectorizer = TfidfVectorizer(**LSA_VECTORIZER_PARAMS)
+        matrix = vectorizer.fit_transform(documents)
+        # TruncatedSVD needs fewer components than features; more than the
+        # number of doctrines would only add null dimensions
+        n_components = max(1, min(components, matrix.shape[0], matrix.shape[1] - 1))
+        svd = TruncatedSVD(n_components=n_components, algorithm='randomized', random_state=0)
+        embeddings = svd.fit_transform(matrix)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.embeddings = np.ascontiguousarray(embeddings / norms, dtype=np.float32)
+        self.term_projection = np.ascontiguousarray(svd.components_.T, dtype=np.float32)
+        self.idf = vectorizer.idf_.astype(np.float64)
+        self.vocabulary = vectorizer.vocabulary_
+
+    def _save(self, directory, fingerprint):
+        # Written into a private directory and renamed into place, so a
+        # reader never sees a partial index
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / fingerprint
+        staging = Path(tempfile.mkdtemp(prefix=f".{fingerprint}.", dir=directory))
+        try:
+            for name in LSA_FILES:
+                np.save(staging / f"{name}.npy", getattr(self, name))
+            vocabulary = {term: int(index) for term, index in self.vocabulary.items()}
+            (staging / "vocabulary.json").write_text(json.dumps(vocabulary, ensure_ascii=False), encoding="utf-8")
+            (staging / "meta.json").write_text(json.dumps({"fingerprint": fingerprint}), encoding="utf-8")
+            if target.exists():
+                # It failed to load; a directory cannot be renamed over a
+                # non-empty one, so move it aside first
+                stale = directory / f"{staging.name}.stale"
+                try:
+                    os.replace(target, stale)
+                except OSError:
+                    pass
+                shutil.rmtree(stale, ignore_errors=True)
+            os.replace(staging, target)
+        except OSError:
+            # Another process saved the same index first; keep theirs
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        self._prune(directory, fingerprint)
+
+    @staticmethod
+    def _prune(directory, fingerprint):
+        """Delete saved indexes other than `fingerprint`, including files of the old flat layout."""
+        flat_files = {f"{name}.npy" for name in LSA_FILES} | {"vocabulary.json", "meta.json"}
+        for path in directory.iterdir():
+            name = path.name
+            if path.is_dir() and name != fingerprint and (_is_fingerprint(name) or name.endswith(".stale")):
+                shutil.rmtree(path, ignore_errors=True)
+            elif path.is_file() and name in flat_files:
+                try:
+                    path.unlink()
+                except OSError:
+                    # Still mapped on a platform that forbids deleting it
+                    pass
+
+    def _load(self, directory, fingerprint):
+        try:
+            meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+            if meta.get("fingerprint") != fingerprint:
+                return False
+            for name in LSA_FILES:
+                setattr(self, name, np.load(directory / f"{name}.npy", mmap_mode="r"))
+            self.vocabulary = json.loads((directory / "vocabulary.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        return True
+
+    @property
+    def dimensions(self):
+        return self.embeddings.shape[1]
+
+    def embed(self, query):
+        """
+        Unit-length LSA vector of a query (all zeros when no term is known).
+
+        Returns:
+            np.ndarray: float32 (dims,) vector
+        """
+        terms, counts = _query_term_counts(self._analyzer, self.vocabulary, query)
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        if len(terms):
+            weights = ((1.0 + np.log(counts)) * self.idf[terms]).astype(np.float32)
+            vector = weights @ self.term_projection[terms]
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector /= norm
+        return vector
+
+    def similarity(self, query):
+        """Cosine similarity in LSA space between a query and every doctrine."""
+        return (self.embeddings @ self.embed(query)).astype(np.float64)
+
+    def search_batch(self, queries, top_k, chunk_size=1024, max_block_cells=2 ** 24):
+        """Score query blocks with one (doctrines x dims) @ (dims x queries) product each."""
+        block_size = max(1, min(chunk_size, max_block_cells // max(len(self), 1)))
+        for chunk in _chunked(queries, block_size):
+            query_matrix = np.stack([self.embed(query) for query in chunk])
+            yield self._top_k_rows(query_matrix @ self.embeddings.T, top_k)
+
+
+# --- INCREMENTAL RETRIEVAL ---
+# Hashed vocabulary size: new doctrines never require refitting a vocabulary
+HASH_FEATURES = 2 ** 20
+
+
+class Segment:
+    """
+    Immutable term-major postings of a group of doctrines (one LSM segment).
+
+    `terms` holds the segment's sorted hashed term ids; the postings of
+    terms[i] are docs[indptr[i]:indptr[i + 1]] (storage positions, sorted)
+    with their term counts in tf.
+
+    Args:
+        terms, docs, tf (np.ndarray): (term, position, count) triplets, any order
+    """
+
+    def __init__(self, terms, docs, tf):
+        order = np.lexsort((docs, terms))
+        terms = terms[order]
+        self.docs = docs[order]
+        self.tf = tf[order]
+        self.terms, starts = np.unique(terms, return_index=True)
+        self.indptr = np.append(starts, len(terms))
+        self.positions = np.unique(self.docs)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def triplets(self, live):
+        """(term, position, count) arrays of the postings whose doctrine is current."""
+        terms = np.repeat(self.terms, np.diff(self.indptr))
+        keep = live[self.docs]
+        return terms[keep], self.docs[keep], self.tf[keep]
+
+    @classmethod
+    def merge(cls, segments, live):
+        """One segment with the current doctrines of several (tombstoned postings dropped)."""
+        parts = [segment.triplets(live) for segment in segments]
+        return cls(*(np.concatenate([part[i] for part in parts]) for i in range(3)))
+
+
+class IncrementalEngine(RetrievalEngine):
+    """
+    Read-only view of an IncrementalIndex at one corpus snapshot.
+
+    Scores are Okapi BM25 over doctrine text plus keywords, as in
+    BM25Index, from the snapshot's segments and statistics: a query term's
+    document frequency is the number of its postings that belong to
+    current doctrines, and its IDF is computed on the spot.
+    """
+
+    def __init__(self, corpus, segments, doc_lengths, total_length, vectorizer, k1=BM25_K1, b=BM25_B):
+        super().__init__(corpus)
+        self.segments = segments
+        self.doc_lengths = doc_lengths
+        self.avg_length = total_length / len(corpus) if len(corpus) else 0.0
+        self.k1 = k1
+        self.b = b
+        self._vectorizer = vectorizer
+        self._live = corpus.store.live()
+
+    def _postings(self, term):
+        docs, tf = [], []
+        for segment in self.segments:
+            slot = np.searchsorted(segment.terms, term)
+            if slot < len(segment.terms) and segment.terms[slot] == term:
+                start, stop = segment.indptr[slot], segment.indptr[slot + 1]
+                docs.append(segment.docs[start:stop])
+                tf.append(segment.tf[start:stop])
+        if not docs:
+            return None, None
+        docs, tf = np.concatenate(docs), np.concatenate(tf)
+        if self._live is not None:
+            keep = self._live[docs]
+            docs, tf = docs[keep], tf[keep]
+        return docs, tf
+
+    def similarity(self, query):
+        """BM25 score per doctrine (query terms counted once)."""
+        scores = np.zeros(len(self))
+        n_docs = len(self.corpus)
+        avg_length = max(self.avg_length, 1e-9)
+        for term in np.unique(self._vectorizer.transform([query]).indices):
+            docs, tf = self._postings(term)
+            if docs is None or not len(docs):
+                continue
+            idf = np.log1p((n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            length_norm = self.k1 * (1.0 - self.b + self.b * self.doc_lengths[docs] / avg_length)
+            scores[docs] += idf * tf * (self.k1 + 1.0) / (tf + length_norm)
+        return scores
+
+
+class IncrementalIndex:
+    """
+    Incrementally maintained BM25 index, in the style of an LSM tree.
+
+    - Vocabulary: HashingVectorizer (English stop words, raw counts), so a
+      new doctrine is indexed without refitting anything
+    - snapshot(corpus) indexes the rows appended since the previous call
+      into a new segment and takes note of tombstoned rows; existing
+      segments are never modified, so engines handed out earlier keep
+      working on their own segment list
+    - Merging: when `fanout` segments fall in the same size tier (powers of
+      fanout) they are merged into one, and a segment with more tombstoned
+      than current doctrines is rewritten; both drop tombstoned postings
+    - Statistics: document lengths per position and the total length of
+      current doctrines are running values; document frequencies (and so
+      IDF) are evaluated at query time for the query terms only
+
+    Snapshots must be passed in version order (get_retrieval_engine does).
+
+    Args:
+        fanout (int): Segments per size tier before a merge
+        k1 (float): BM25 term-frequency saturation
+        b (float): BM25 document-length normalization
+    """
+
+    def __init__(self, fanout=INCREMENTAL_MERGE_FANOUT, k1=BM25_K1, b=BM25_B):
+        self.fanout = max(fanout, 2)
+        self.k1 = k1
+        self.b = b
+        self._vectorizer = HashingVectorizer(n_features=HASH_FEATURES, stop_words='english',
+                                             alternate_sign=False, norm=None)
+        self._lock = threading.Lock()
+        self._segments = []
+        self._doc_lengths = np.zeros(64)
+        self._indexed = 0
+        self._total_length = 0.0
+        self._live = None
+        self._engine = None
+
+    def snapshot(self, corpus):
+        """
+        Bring the index up to a corpus snapshot and return its engine.
+
+        Args:
+            corpus (DoctrineCorpus): The same or a later snapshot of the
+                store than the previous call
+
+        Returns:
+            IncrementalEngine: Engine for this snapshot
+        """
+        with self._lock:
+            if self._engine is not None and self._engine.corpus is corpus:
+                return self._engine
+            size = len(corpus.store)
+            if size < self._indexed:
+                raise ValueError("Corpus snapshot is older than the incremental index")
+            live = corpus.store.live()
+            live = np.ones(size, dtype=bool) if live is None else live
+            if self._indexed:
+                # Rows tombstoned since the previous snapshot leave the totals
+                previous = np.ones(self._indexed, dtype=bool) if self._live is None else self._live
+                removed = previous & ~live[:self._indexed]
+                self._total_length -= float(self._doc_lengths[:self._indexed][removed].sum())
+            if size > self._indexed:
+                self._add(corpus.store, self._indexed, size, live)
+            self._indexed = size
+            self._live = live
+            self._merge(live)
+            self._engine = IncrementalEngine(corpus, tuple(self._segments), self._doc_lengths[:size],
+                                             self._total_length, self._vectorizer, self.k1, self.b)
+            return self._engine
+
+    def _add(self, store, start, stop, live):
+        if start == 0:
+            documents = (f"{text} {keywords}" for text, keywords in zip(store.iter_text('text'), store.iter_text('keywords')))
+        else:
+            rows = store.rows(np.arange(start, stop))
+            documents = (rows['text'] + " " + rows['keywords']).tolist()
+        counts = self._vectorizer.transform(documents).tocoo()
+        lengths = np.bincount(counts.row, weights=counts.data, minlength=stop - start)
+        if stop > len(self._doc_lengths):
+            # Grown by copying; engines keep views of the previous buffer
+            grown = np.zeros(max(stop, 2 * len(self._doc_lengths)))
+            grown[:start] = self._doc_lengths[:start]
+            self._doc_lengths = grown
+        self._doc_lengths[start:stop] = lengths
+        self._total_length += float(lengths[live[start:stop]].sum())
+        if counts.nnz:
+            self._segments.append(Segment(counts.col.astype(np.int32), counts.row.astype(np.intp) + start,
+                                          counts.data.astype(np.float32)))
+
+    def _tier(self, segment):
+        return int(np.log(max(len(segment), 1)) / np.log(self.fanout))
+
+    def _merge(self, live):
+        segments = []
+        for segment in self._segments:
+            current = np.count_nonzero(live[segment.positions])
+            if current == 0:
+                continue
+            if 2 * current < len(segment):
+                segment = Segment.merge([segment], live)
+            segments.append(segment)
+        while True:
+            tiers = {}
+            for segment in segments:
+                tiers.setdefault(self._tier(segment), []).append(segment)
+            full = next((group for group in tiers.values() if len(group) >= self.fanout), None)
+            if full is None:
+                break
+            segments = [segment for segment in segments if all(segment is not s for s in full)]
+            segments.append(Segment.merge(full, live))
+        self._segments = segments
+
+
+_incremental = None
+_incremental_lock = threading.Lock()
+
+
+def get_incremental_index():
+    """
+    Returns the process-wide IncrementalIndex (see get_retrieval_engine).
+
+    Returns:
+        IncrementalIndex: Shared index
+    """
+    global _incremental
+    if _incremental is None:
+        with _incremental_lock:
+            if _incremental is None:
+                _incremental = IncrementalIndex()
+    return _incremental
+
+
+def _reference_index(corpus):
+    """The shared TF-IDF index for a corpus snapshot (built when missing or stale)."""
+    index = _engines.get('tfidf')
+    if index is None or index.corpus is not corpus:
+        index = _engines['tfidf'] = DoctrineIndex(corpus)
+    return index
+
+
+# --- ENGINE REGISTRY ---
+# Selected with CHANAKYA_RAG_ENGINE (see config.py); each builds the engine
+# for one corpus snapshot
+ENGINES = {
+    'tfidf': DoctrineIndex,
+    'inverted': lambda corpus: InvertedIndexEngine(_reference_index(corpus)),
+    'hybrid': lambda corpus: HybridEngine(_reference_index(corpus)),
+    'lsa': lambda corpus: LSAEngine(corpus, directory=LSA_INDEX_PATH or None),
+    'incremental': lambda corpus: get_incremental_index().snapshot(corpus),
+}
+
+_engines = {}
+_engines_lock = threading.RLock()
+
+
+def get_retrieval_engine(name=None):
+    """
+    Returns the process-wide retrieval engine selected by configuration.
+
+    The engine is shared until the corpus changes; the next call then
+    builds it for the new snapshot, from scratch for the static engines
+    and by indexing only the changes for 'incremental'. A caller that keeps
+    the returned engine (and its .corpus) for an analysis keeps a
+    consistent view while the corpus is being updated.
+
+    Args:
+        name (str): Engine name from ENGINES (defaults to config.RAG_ENGINE)
+
+    Returns:
+        RetrievalEngine: Shared engine instance
+    """
+    name = name or RAG_ENGINE
+    if name not in ENGINES:
+        raise ValueError(f"Unknown retrieval engine '{name}'. Available: {', '.join(ENGINES)}")
+    engine = _engines.get(name)
+    if engine is None or engine.corpus is not get_corpus():
+        with _engines_lock:
+            corpus = get_corpus()
+            engine = _engines.get(name)
+            if engine is None or engine.corpus is not corpus:
+                engine = _engines[name] = ENGINES[name](corpus)
+    return engine
+
+
+def get_doctrine_index():
+    """
+    Returns the process-wide TF-IDF reference index for the current corpus.
+
+    Returns:
+        DoctrineIndex: Shared retrieval index
+    """
+    return get_retrieval_engine('tfidf')
+
+
+def rag_retrieval(query, top_k=2):
+    """
+    Implements TF-IDF Vectorization with Cosine Similarity for semantic retrieval.
+
+    This is the core RAG (Retrieval-Augmented Generation) component.
+    Research Significance: Demonstrates hybrid neuro-symbolic architecture.
+
+    Args:
+        query (str): User's governance problem statement
+        top_k (int): Number of top matches to return
+
+    Returns:
+        list[DoctrineMatch]: (doctrine row, score) pairs, best first
+    """
+    return get_retrieval_engine().search(query, top_k)
+
+
+def rag_retrieval_batch(queries, top_k=2, chunk_size=1024):
+    """
+    Batch counterpart of rag_retrieval for backlogs of problem statements.
+
+    Results are produced lazily in memory-bounded blocks, so a generator
+    of millions of lines can be streamed through without holding every
+    score in memory.
+
+    Args:
+        queries (iterable): Problem statements (list, pd.Series or generator of lines)
+        top_k (int): Number of top matches per query
+        chunk_size (int): Queries vectorized and scored per block
+
+    Yields:
+        list[DoctrineMatch]: Ranked matches for each query, in input order
+    """
+    engine = get_retrieval_engine()
+    for positions, scores in engine.search_batch(queries, top_k, chunk_size=chunk_size):
+        for row_positions, row_scores in zip(positions, scores):
+            yield [DoctrineMatch(engine.corpus.row(i), float(score)) for i, score in zip(row_positions, row_scores)]
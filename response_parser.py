@@ -0,0 +1,195 @@
+"""
+Structured Response Parser
+==========================
+Extracts the per-option evaluation that SYSTEM_PROMPT asks the LLM for
+(section 3, "Multi-Criteria Policy Evaluation") into compact records:
+
+    **Option A: [Name]**
+    - Welfare Impact (Prajasukhe): [Score 1-10]
+    - Economic Viability (Kosha): [Score 1-10]
+    - Implementation Feasibility: [Score 1-10]
+    - Risk Level: [Low/Medium/High]
+
+The parser is incremental: it consumes the completion chunk by chunk (so it
+can sit on the streaming path) and only ever looks at completed lines.
+Options without their own Timeline line inherit the one from the
+"Recommended Strategy" section.
+"""
+
+import re
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+from mcda import MCDA_ENGINE
+
+OPTION_HEADER = re.compile(r'^[\s#*>-]*Option\s+([A-Z0-9]+)\s*[:.\-–—]\s*(.*?)[\s*]*$', re.IGNORECASE)
+SECTION_HEADER = re.compile(r'^\s*#{1,4}\s+')
+SCORE_FIELDS = {
+    "welfare": re.compile(r'welfare[^:\n]*:[\s*]*(\d+(?:\.\d+)?)', re.IGNORECASE),
+    "economic": re.compile(r'economic[^:\n]*:[\s*]*(\d+(?:\.\d+)?)', re.IGNORECASE),
+    "feasibility": re.compile(r'feasibility[^:\n]*:[\s*]*(\d+(?:\.\d+)?)', re.IGNORECASE),
+}
+RISK_FIELD = re.compile(r'risk\s*level[^:\n]*:[\s*]*(low|medium|moderate|high)', re.IGNORECASE)
+TIMELINE_FIELD = re.compile(r'timeline[^:\n]*:[\s*]*(short|medium|long)[\s-]*term', re.IGNORECASE)
+
+
+class PolicyOption(NamedTuple):
+    """Scores the LLM assigned to one policy option."""
+    label: str
+    name: str
+    welfare: Optional[float]
+    economic: Optional[float]
+    feasibility: Optional[float]
+    risk: Optional[str]
+    timeline: Optional[str]
+
+
+class OptionScoreParser:
+    """
+    Incremental extractor of PolicyOption records.
+
+    Call feed() with each chunk as it arrives (or tap() around a chunk
+    iterator) and options() once the text is complete.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._current = None
+        self._completed = []
+        self._timeline = None
+
+    def feed(self, chunk):
+        """
+        Consume a text fragment.
+
+        Returns:
+            list[PolicyOption]: Options whose block finished in this chunk
+        """
+        self._pending += chunk
+        *lines, self._pending = self._pending.split("\n")
+        before = len(self._completed)
+        for line in lines:
+            self._consume(line)
+        return self._completed[before:]
+
+    def tap(self, chunks):
+        """Yield chunks unchanged while feeding them to the parser."""
+        for chunk in chunks:
+            if chunk:
+                self.feed(chunk)
+            yield chunk
+
+    def close(self):
+        """Flush the last partial line and the open option block."""
+        if self._pending:
+            self._consume(self._pending)
+            self._pending = ""
+        self._finish_option()
+
+    def options(self):
+        """
+        All parsed options, with missing timelines taken from the strategy section.
+
+        Returns:
+            list[PolicyOption]: Options in document order
+        """
+        self.close()
+        return [
+            option._replace(timeline=option.timeline or self._timeline)
+            for option in self._completed
+        ]
+
+    def _consume(self, line):
+        header = OPTION_HEADER.match(line)
+        if header:
+            self._finish_option()
+            name = header.group(2).strip(" *[]") or f"Option {header.group(1).upper()}"
+            self._current = {"label": header.group(1).upper(), "name": name}
+            return
+        if SECTION_HEADER.match(line):
+            self._finish_option()
+
+        timeline = TIMELINE_FIELD.search(line)
+        if timeline:
+            value = timeline.group(1).capitalize() + "-term"
+            if self._current is not None:
+                self._current["timeline"] = value
+            else:
+                self._timeline = self._timeline or value
+        if self._current is None:
+            return
+
+        for field, pattern in SCORE_FIELDS.items():
+            match = pattern.search(line)
+            if match and field not in self._current:
+                self._current[field] = min(float(match.group(1)), 10.0)
+        risk = RISK_FIELD.search(line)
+        if risk:
+            level = risk.group(1).capitalize()
+            self._current["risk"] = "Medium" if level == "Moderate" else level
+
+    def _finish_option(self):
+        if self._current is not None:
+            self._completed.append(PolicyOption(
+                label=self._current["label"],
+                name=self._current["name"],
+                welfare=self._current.get("welfare"),
+                economic=self._current.get("economic"),
+                feasibility=self._current.get("feasibility"),
+                risk=self._current.get("risk"),
+                timeline=self._current.get("timeline"),
+            ))
+            self._current = None
+
+
+def parse_policy_options(text):
+    """Parse a complete response in one call."""
+    parser = OptionScoreParser()
+    parser.feed(text)
+    return parser.options()
+
+
+def options_to_records(options):
+    """JSON-serializable form of PolicyOption records (for the completion cache)."""
+    return [option._asdict() for option in options]
+
+
+def options_from_records(records):
+    """Inverse of options_to_records."""
+    return [PolicyOption(**record) for record in records]
+
+
+def rank_policy_options(options, law_order, political):
+    """
+    Score and rank the LLM's options with the MCDA engine.
+
+    The response scores welfare, economic viability and feasibility only;
+    law & order and political stability are taken from the analysis
+    parameters. Options missing a score are left out.
+
+    Args:
+        options (list[PolicyOption]): Parsed options
+        law_order (float): Enforcement capability parameter
+        political (float): Political stability parameter
+
+    Returns:
+        pd.DataFrame: One row per scored option, best GEI first
+    """
+    scored = [o for o in options if None not in (o.welfare, o.economic, o.feasibility)]
+    table = pd.DataFrame({
+        "Option": [f"{o.label}: {o.name}" for o in scored],
+        "Welfare": [o.welfare for o in scored],
+        "Economic": [o.economic for o in scored],
+        "Law & Order": [float(law_order)] * len(scored),
+        "Political": [float(political)] * len(scored),
+        "Implementation": [o.feasibility for o in scored],
+        "Risk": pd.Series([o.risk for o in scored], dtype=object),
+        "Timeline": pd.Series([o.timeline for o in scored], dtype=object),
+    })
+    if not scored:
+        table["GEI"] = pd.Series(dtype=float)
+        return table
+    criteria = table[["Welfare", "Economic", "Law & Order", "Political", "Implementation"]]
+    table["GEI"] = MCDA_ENGINE.score(criteria.to_numpy())
+    return table.sort_values("GEI", ascending=False, kind="stable").reset_index(drop=True)
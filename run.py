@@ -7,13 +7,33 @@ Run this instead of manually typing commands.
 
 Usage:
     python run.py
+    python run.py --profile-imports [--budget-ms 800] [--top 25]
 """
 
+import argparse
 import subprocess
 import sys
 import os
 from pathlib import Path
 
+# Import time app.py may add on top of Streamlit itself before
+# --profile-imports reports a regression
+STARTUP_BUDGET_MS = 800
+
+# Runs in a child interpreter under -X importtime: Streamlit and the AppTest
+# harness are warmed up on an empty script first, so everything logged after
+# the marker line is imported by app.py itself
+_PROFILE_SCRIPT = """
+import sys, tempfile
+from streamlit.testing.v1 import AppTest
+with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as empty:
+    empty.write("import streamlit as st\\nst.write('')\\n")
+AppTest.from_file(empty.name).run()
+print("{marker}", file=sys.stderr, flush=True)
+AppTest.from_file("app.py", default_timeout=120).run()
+"""
+_PROFILE_MARKER = "--- chanakya app imports ---"
+
 def check_python_version():
     """Check if Python version is 3.9 or higher."""
     version = sys.version_info
@@ -109,8 +129,78 @@ def launch_app():
         print(f"❌ Failed to launch app: {e}")
         return False
 
+def parse_import_times(stderr):
+    """
+    Per-module import times from -X importtime output after the marker line.
+
+    Returns:
+        list[tuple]: (module, self µs, cumulative µs, nesting depth) in import order
+    """
+    lines = stderr.splitlines()
+    if _PROFILE_MARKER in lines:
+        lines = lines[lines.index(_PROFILE_MARKER) + 1:]
+    modules = []
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # column header
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+def profile_imports(budget_ms=STARTUP_BUDGET_MS, top=25):
+    """
+    Cold-start import report for app.py.
+    
+    Runs one script execution of app.py in a fresh interpreter with
+    -X importtime and prints the slowest modules imported on its behalf
+    (cumulative time of each top-level import), plus the total against the
+    startup budget.
+    
+    Returns:
+        bool: True when the total is within budget
+    """
+    print("\n⏱️  Profiling app.py cold-start imports...")
+    script = _PROFILE_SCRIPT.format(marker=_PROFILE_MARKER)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True, text=True, cwd=Path(__file__).resolve().parent
+    )
+    if completed.returncode != 0:
+        print(f"❌ Profiling run failed:\n{completed.stderr[-2000:]}")
+        return False
+    
+    modules = parse_import_times(completed.stderr)
+    roots = [m for m in modules if m[3] == 0]
+    total_ms = sum(m[2] for m in roots) / 1000
+    
+    print(f"{'Module':<40} {'Cumulative':>12} {'Self':>10}")
+    print("-" * 64)
+    for name, self_us, cumulative_us, _ in sorted(roots, key=lambda m: -m[2])[:top]:
+        print(f"{name:<40} {cumulative_us / 1000:>9.1f} ms {self_us / 1000:>7.1f} ms")
+    print("-" * 64)
+    print(f"{len(modules)} modules imported by app.py in {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    
+    if total_ms > budget_ms:
+        print(f"❌ Cold-start import budget exceeded by {total_ms - budget_ms:.1f} ms")
+        return False
+    print("✅ Within cold-start import budget")
+    return True
+
 def main():
     """Main execution flow."""
+    parser = argparse.ArgumentParser(description="Set up and launch Chanakya DSS.")
+    parser.add_argument("--profile-imports", action="store_true",
+                        help="Report app.py cold-start import times instead of launching")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help=f"Import time budget for --profile-imports (default: {STARTUP_BUDGET_MS})")
+    parser.add_argument("--top", type=int, default=25, help="Modules to list in the report (default: 25)")
+    args = parser.parse_args()
+    if args.profile_imports:
+        sys.exit(0 if profile_imports(args.budget_ms, args.top) else 1)
+    
     print("=" * 60)
     print("Chanakya Decision Intelligence System - Quick Launch")
     print("=" * 60)
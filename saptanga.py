@@ -0,0 +1,147 @@
+"""
+Saptanga Impact Engine
+======================
+Deterministic impact scores for the seven limbs of state (Saptanga) from
+the MCDA parameters and the doctrine similarity vector of a retrieval.
+
+Model:
+- Base impact: each limb is a fixed weighted average of the five MCDA
+  parameters (PARAMETER_LIMB_MATRIX, columns sum to 1), so base scores stay
+  on the 1-10 parameter scale
+- Doctrinal emphasis: every doctrine carries a limb affinity vector from its
+  domain (DOMAIN_LIMB_AFFINITY) scaled by its policy_weight; the similarity-
+  weighted mean of these vectors says which limbs the retrieved doctrines
+  speak to (0-1 per limb)
+- Impact = base + DOCTRINE_INFLUENCE * emphasis * (10 - base): emphasized
+  limbs move toward 10 in proportion to their remaining headroom
+
+Both steps are matrix products, so one analysis and a batch of thousands
+(parameters (M x 5), similarity (M x doctrines), dense or scipy sparse) go
+through the same code.
+
+Similarity columns are corpus storage positions. Positions only grow as
+doctrines are added, so a similarity vector scored against an earlier
+corpus snapshot lines up with the first rows of the current limb matrix.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from chanakya_wisdom import get_corpus
+
+LIMBS = ("Swami", "Amatya", "Janapada", "Durga", "Kosha", "Danda", "Mitra")
+LIMB_LABELS = (
+    "Swami\n(Leadership)", "Amatya\n(Ministers)", "Janapada\n(Territory)",
+    "Durga\n(Fortification)", "Kosha\n(Treasury)", "Danda\n(Force)", "Mitra\n(Allies)",
+)
+
+# Rows: welfare, economic, law_order, political, implementation
+# (calculate_policy_score order); columns: LIMBS. Each column sums to 1.
+PARAMETER_LIMB_MATRIX = np.array([
+    #  Swami Amatya Janapada Durga Kosha Danda Mitra
+    [0.00, 0.00, 0.70, 0.00, 0.00, 0.00, 0.40],  # welfare
+    [0.00, 0.20, 0.30, 0.20, 0.80, 0.00, 0.00],  # economic
+    [0.20, 0.00, 0.00, 0.40, 0.00, 0.80, 0.00],  # law_order
+    [0.50, 0.20, 0.00, 0.00, 0.00, 0.20, 0.60],  # political
+    [0.30, 0.60, 0.00, 0.40, 0.20, 0.00, 0.00],  # implementation
+])
+PARAMETER_LIMB_MATRIX.flags.writeable = False
+
+# Limbs each governance domain bears on (0-1); domains not listed (e.g. in a
+# custom corpus) contribute no emphasis
+DOMAIN_LIMB_AFFINITY = {
+    "Analysis & Planning":      (0.8, 0.6, 0.0, 0.0, 0.0, 0.0, 0.0),
+    "Economic Policy":          (0.0, 0.3, 0.2, 0.0, 1.0, 0.0, 0.0),
+    "Social Welfare":           (0.3, 0.0, 1.0, 0.0, 0.0, 0.0, 0.3),
+    "Law & Order":              (0.3, 0.0, 0.0, 0.2, 0.0, 1.0, 0.0),
+    "Foreign Affairs":          (0.3, 0.0, 0.0, 0.3, 0.0, 0.3, 1.0),
+    "Infrastructure":           (0.0, 0.2, 0.3, 1.0, 0.0, 0.0, 0.0),
+    "Strategic Methods":        (0.6, 0.0, 0.0, 0.0, 0.0, 0.5, 0.6),
+    "Governance Structure":     (0.7, 0.7, 0.4, 0.4, 0.4, 0.4, 0.4),
+    "Crisis Management":        (0.5, 0.4, 0.8, 0.6, 0.0, 0.0, 0.0),
+    "Agriculture & Resources":  (0.0, 0.0, 1.0, 0.0, 0.4, 0.0, 0.0),
+    "Administrative Reform":    (0.3, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+    "Ethical Governance":       (1.0, 0.3, 0.4, 0.0, 0.0, 0.0, 0.0),
+    "Intelligence & Security":  (0.4, 0.0, 0.0, 0.6, 0.0, 0.8, 0.0),
+    "Economic Regulation":      (0.0, 0.4, 0.3, 0.0, 0.8, 0.0, 0.0),
+    "Strategic Development":    (0.5, 0.0, 0.4, 0.5, 0.3, 0.0, 0.0),
+}
+
+# Share of a limb's headroom (10 - base) that full doctrinal emphasis adds
+DOCTRINE_INFLUENCE = 0.3
+
+
+def doctrine_limb_matrix(corpus=None):
+    """
+    Per-doctrine limb emphasis for a corpus snapshot.
+
+    Built from the numeric columns only: one affinity row per domain code,
+    gathered by code and scaled by policy_weight.
+
+    Args:
+        corpus (DoctrineCorpus): Defaults to the current get_corpus()
+
+    Returns:
+        np.ndarray: Read-only (storage positions x 7) matrix
+    """
+    return _limb_matrix(get_corpus() if corpus is None else corpus)
+
+
+@lru_cache(maxsize=4)
+def _limb_matrix(corpus):
+    store = corpus.store
+    codes, names = store.domain_codes()
+    affinity = np.array([DOMAIN_LIMB_AFFINITY.get(name, (0.0,) * len(LIMBS)) for name in names],
+                        dtype=np.float64).reshape(len(names), len(LIMBS))
+    matrix = affinity[codes] * np.asarray(store.policy_weights(), dtype=np.float64)[:, None]
+    matrix.flags.writeable = False
+    return matrix
+
+
+def doctrinal_emphasis(similarity):
+    """
+    Similarity-weighted mean limb emphasis of the corpus.
+
+    Args:
+        similarity: (doctrines,) or (M x doctrines) scores, dense or scipy sparse
+
+    Returns:
+        np.ndarray: (7,) or (M x 7) emphasis in [0, 1]; zero where the
+            similarity row is all zero
+    """
+    single = not hasattr(similarity, "tocsr") and np.ndim(similarity) == 1
+    limbs = doctrine_limb_matrix()[:np.shape(similarity)[-1]]
+    # Only positive similarity counts as evidence for a limb
+    if hasattr(similarity, "tocsr"):
+        similarity = similarity.tocsr().maximum(0)
+        totals = np.asarray(similarity.sum(axis=1)).ravel()
+        weighted = np.asarray(similarity @ limbs)
+    else:
+        similarity = np.maximum(np.atleast_2d(np.asarray(similarity, dtype=np.float64)), 0.0)
+        totals = similarity.sum(axis=1)
+        weighted = similarity @ limbs
+    emphasis = np.divide(weighted, totals[:, None], out=np.zeros_like(weighted), where=totals[:, None] > 0)
+    return emphasis[0] if single else emphasis
+
+
+def saptanga_impact(parameters, similarity=None):
+    """
+    Impact score (0-10) for each of the seven limbs.
+
+    Args:
+        parameters: (5,) or (M x 5) MCDA parameters in calculate_policy_score order
+        similarity: Optional (doctrines,) or (M x doctrines) doctrine
+            similarity, dense or scipy sparse; None for parameters only
+
+    Returns:
+        np.ndarray: (7,) or (M x 7) limb scores in LIMBS order
+    """
+    parameters = np.asarray(parameters, dtype=np.float64)
+    base = parameters @ PARAMETER_LIMB_MATRIX
+    if similarity is None:
+        return base
+    emphasis = doctrinal_emphasis(similarity)
+    if base.ndim == 1 and emphasis.ndim == 2:
+        base = np.broadcast_to(base, emphasis.shape)
+    return base + DOCTRINE_INFLUENCE * emphasis * (10.0 - base)
@@ -0,0 +1,218 @@
+"""
+Pipeline Tracing
+================
+Wall-clock spans around the stages of one Policy Analysis, for the timing
+waterfall in the Analytics Dashboard and for latency percentiles across
+sessions.
+
+Stages (Tab 1):
+- corpus_load: doctrine corpus (first analysis in a process only)
+- vectorization: fitting the doctrine vectors of the retrieval engine
+  (first analysis in a process only)
+- similarity: query vectorization, scoring and ranking
+- prompt: prompt rendering and completion cache lookup
+- llm_ttft / llm_total: request start to first token and to last token
+- response_parsing: option extraction and MCDA ranking
+- figure_generation: chart building on the first render of the results
+
+A finished trace is appended as one JSON line to the trace log
+(CHANAKYA_TRACE_LOG_PATH), which is shared by every session writing to the
+same file; stage_percentiles() summarizes it.
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from config import TRACE_LOG_PATH, TRACE_LOG_WINDOW
+
+
+class Span(NamedTuple):
+    """One timed stage, relative to the start of its trace."""
+    name: str
+    start_ms: float
+    duration_ms: float
+
+
+class Trace:
+    """
+    Spans of one analysis.
+
+    A trace stays open across reruns (the figures of an analysis are built
+    on the rerun that displays it) until finish() is called.
+    """
+
+    def __init__(self, **attributes):
+        self.trace_id = uuid.uuid4().hex
+        self.timestamp = datetime.now()
+        self.attributes = attributes
+        self.spans = []
+        self.finished = False
+        self._origin = time.perf_counter()
+
+    def _offset_ms(self, instant):
+        return (instant - self._origin) * 1000.0
+
+    def add(self, name, started, ended):
+        """Record a span between two time.perf_counter() readings."""
+        self.spans.append(Span(name, self._offset_ms(started), (ended - started) * 1000.0))
+
+    @contextmanager
+    def span(self, name):
+        """Time the body of a with-block as one span."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, started, time.perf_counter())
+
+    def stream(self, chunks, started=None, first="llm_ttft", total="llm_total"):
+        """
+        Yield chunks unchanged while timing the stream.
+
+        Both spans start at `started` (the time.perf_counter() reading taken
+        before the request was sent; defaults to the first next() call);
+        `first` ends at the first non-empty chunk and `total` when the
+        stream is exhausted.
+        """
+        started = time.perf_counter() if started is None else started
+        seen_first = False
+        try:
+            for chunk in chunks:
+                if chunk and not seen_first:
+                    self.add(first, started, time.perf_counter())
+                    seen_first = True
+                yield chunk
+        finally:
+            self.add(total, started, time.perf_counter())
+
+    def stage_totals(self):
+        """Milliseconds per stage name (repeated spans are summed)."""
+        totals = {}
+        for span in self.spans:
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        return totals
+
+    def to_record(self):
+        """JSON-serializable form for the trace log."""
+        return {
+            "trace_id": self.trace_id,
+            "timestamp": self.timestamp.isoformat(timespec="seconds"),
+            **self.attributes,
+            "stages": {name: round(ms, 3) for name, ms in self.stage_totals().items()},
+            "spans": [[s.name, round(s.start_ms, 3), round(s.duration_ms, 3)] for s in self.spans],
+        }
+
+    def finish(self, log=None):
+        """
+        Close the trace and append it to the log (once).
+
+        Args:
+            log (TraceLog): Destination; None records nothing
+        """
+        if self.finished:
+            return
+        self.finished = True
+        if log is not None:
+            log.append(self)
+
+
+class TraceLog:
+    """
+    Append-only JSONL file of finished traces.
+
+    Each trace is written with a single write() on a file opened in append
+    mode, so concurrent writers do not interleave lines.
+    """
+
+    def __init__(self, path, window=TRACE_LOG_WINDOW):
+        self.path = Path(path)
+        self.window = window
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._snapshot = (None, [])
+
+    def append(self, trace):
+        line = json.dumps(trace.to_record(), ensure_ascii=False) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def records(self):
+        """
+        The most recent traces (at most `window`), oldest first.
+
+        The parsed tail is reused until the file changes, so dashboard
+        reruns do not re-read the log. Lines that do not parse (e.g. a
+        write cut short) are skipped.
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return []
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if self._snapshot[0] == version:
+                return self._snapshot[1]
+            with open(self.path, encoding="utf-8") as f:
+                lines = deque(f, maxlen=self.window)
+            records = []
+            for line in lines:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+            self._snapshot = (version, records)
+        return records
+
+
+def stage_percentiles(records, percentiles=(50, 95)):
+    """
+    Latency percentiles per stage across traces.
+
+    Args:
+        records (list[dict]): Trace log records (TraceLog.records)
+        percentiles (tuple): Percentiles to report
+
+    Returns:
+        pd.DataFrame: Stage, Traces and one "p<N> (ms)" column per percentile,
+            in first-seen stage order
+    """
+    samples = {}
+    for record in records:
+        for stage, ms in record.get("stages", {}).items():
+            samples.setdefault(stage, []).append(ms)
+    columns = ["Stage", "Traces"] + [f"p{p} (ms)" for p in percentiles]
+    rows = [
+        [stage, len(values), *np.percentile(values, percentiles).round(1)]
+        for stage, values in samples.items()
+    ]
+    return pd.DataFrame(rows, columns=columns)
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_trace_log():
+    """
+    Returns the process-wide trace log, or None when disabled.
+
+    The log is disabled by setting CHANAKYA_TRACE_LOG_PATH to an empty string.
+    """
+    global _log
+    if not TRACE_LOG_PATH:
+        return None
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = TraceLog(TRACE_LOG_PATH)
+    return _log